@@ -0,0 +1,31 @@
+"""add per-user data version
+
+Revision ID: 0003_add_user_data_version
+Revises: 0002_add_cycle_totals
+Create Date: 2026-01-03 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0003_add_user_data_version"
+down_revision = "0002_add_cycle_totals"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column(
+            "data_version",
+            sa.BigInteger(),
+            server_default=sa.text("0"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "data_version")
@@ -0,0 +1,37 @@
+"""backfill day summaries as running rollups
+
+Revision ID: 0004_backfill_day_summaries
+Revises: 0003_add_user_data_version
+Create Date: 2026-01-04 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0004_backfill_day_summaries"
+down_revision = "0003_add_user_data_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        INSERT INTO day_summaries (id, username, day_date, timer_id, total_seconds)
+        SELECT
+            gen_random_uuid(),
+            username,
+            day_date,
+            timer_id,
+            COALESCE(SUM(duration_seconds), 0)
+        FROM sessions
+        WHERE end_at IS NOT NULL
+        GROUP BY username, day_date, timer_id
+        ON CONFLICT (username, day_date, timer_id)
+        DO UPDATE SET total_seconds = EXCLUDED.total_seconds
+        """
+    )
+
+
+def downgrade() -> None:
+    pass
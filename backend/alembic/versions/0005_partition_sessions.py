@@ -0,0 +1,206 @@
+"""partition sessions monthly by day_date
+
+Revision ID: 0005_partition_sessions
+Revises: 0004_backfill_day_summaries
+Create Date: 2026-01-05 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0005_partition_sessions"
+down_revision = "0004_backfill_day_summaries"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+SESSION_COLUMNS = (
+    "id, username, timer_id, start_at, end_at, duration_seconds, "
+    "client_tz, day_date, day_of_week, created_at"
+)
+
+
+def _session_columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("timer_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("start_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("end_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("duration_seconds", sa.Integer(), nullable=True),
+        sa.Column("client_tz", sa.String(), nullable=False),
+        sa.Column("day_date", sa.Date(), nullable=False),
+        sa.Column("day_of_week", sa.SmallInteger(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.CheckConstraint(
+            "end_at IS NULL OR end_at >= start_at",
+            name="ck_sessions_end_after_start",
+        ),
+        sa.CheckConstraint(
+            "duration_seconds IS NULL OR duration_seconds >= 0",
+            name="ck_sessions_duration_nonnegative",
+        ),
+        sa.ForeignKeyConstraint(
+            ["username"],
+            ["users.username"],
+            ondelete="CASCADE",
+            name="fk_sessions_username_users",
+        ),
+        sa.ForeignKeyConstraint(
+            ["timer_id"],
+            ["timers.id"],
+            ondelete="CASCADE",
+            name="fk_sessions_timer_id_timers",
+        ),
+    ]
+
+
+def _create_session_indexes() -> None:
+    op.create_index(
+        "ix_sessions_username_day_date",
+        "sessions",
+        ["username", "day_date"],
+    )
+    op.create_index(
+        "ix_sessions_username_timer_day_date",
+        "sessions",
+        ["username", "timer_id", "day_date"],
+    )
+    op.create_index(
+        "ix_sessions_username_start_at",
+        "sessions",
+        ["username", "start_at"],
+    )
+
+
+def _retire_old_sessions_table() -> None:
+    op.drop_index("ix_sessions_username_start_at", table_name="sessions")
+    op.drop_index("ix_sessions_username_timer_day_date", table_name="sessions")
+    op.drop_index("ix_sessions_username_day_date", table_name="sessions")
+    op.rename_table("sessions", "sessions_old")
+    op.execute("ALTER TABLE sessions_old RENAME CONSTRAINT pk_sessions TO pk_sessions_old")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "active_sessions",
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("session_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("day_date", sa.Date(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["username"],
+            ["users.username"],
+            ondelete="CASCADE",
+            name="fk_active_sessions_username_users",
+        ),
+        sa.PrimaryKeyConstraint("username", name="pk_active_sessions"),
+    )
+
+    op.drop_index("ux_sessions_one_active_per_user", table_name="sessions")
+    _retire_old_sessions_table()
+
+    op.create_table(
+        "sessions",
+        *_session_columns(),
+        sa.PrimaryKeyConstraint("id", "day_date", name="pk_sessions"),
+        postgresql_partition_by="RANGE (day_date)",
+    )
+    _create_session_indexes()
+    op.execute("CREATE TABLE sessions_default PARTITION OF sessions DEFAULT")
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            month date;
+            last_month date := date_trunc('month', now())::date
+                + interval '{MONTHS_AHEAD} months';
+        BEGIN
+            month := COALESCE(
+                (SELECT date_trunc('month', min(day_date))::date FROM sessions_old),
+                date_trunc('month', now())::date
+            );
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF sessions FOR VALUES FROM (%L) TO (%L)',
+                    'sessions_p' || to_char(month, 'YYYY_MM'),
+                    month,
+                    (month + interval '1 month')::date
+                );
+                month := (month + interval '1 month')::date;
+            END LOOP;
+        END;
+        $$
+        """
+    )
+
+    op.execute(
+        f"INSERT INTO sessions ({SESSION_COLUMNS}) "
+        f"SELECT {SESSION_COLUMNS} FROM sessions_old"
+    )
+    op.execute(
+        """
+        INSERT INTO active_sessions (username, session_id, day_date)
+        SELECT username, id, day_date FROM sessions WHERE end_at IS NULL
+        """
+    )
+    op.drop_table("sessions_old")
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION sessions_track_active() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.end_at IS NULL THEN
+                DELETE FROM active_sessions
+                WHERE username = OLD.username AND session_id = OLD.id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.end_at IS NULL THEN
+                INSERT INTO active_sessions (username, session_id, day_date)
+                VALUES (NEW.username, NEW.id, NEW.day_date);
+            END IF;
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_sessions_track_active
+        AFTER INSERT OR UPDATE OF end_at OR DELETE ON sessions
+        FOR EACH ROW EXECUTE FUNCTION sessions_track_active()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER trg_sessions_track_active ON sessions")
+    op.execute("DROP FUNCTION sessions_track_active()")
+    _retire_old_sessions_table()
+
+    op.create_table(
+        "sessions",
+        *_session_columns(),
+        sa.PrimaryKeyConstraint("id", name="pk_sessions"),
+    )
+    _create_session_indexes()
+    op.create_index(
+        "ux_sessions_one_active_per_user",
+        "sessions",
+        ["username"],
+        unique=True,
+        postgresql_where=sa.text("end_at IS NULL"),
+    )
+    op.execute(
+        f"INSERT INTO sessions ({SESSION_COLUMNS}) "
+        f"SELECT {SESSION_COLUMNS} FROM sessions_old"
+    )
+    op.drop_table("sessions_old")
+    op.drop_table("active_sessions")
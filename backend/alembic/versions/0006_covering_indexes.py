@@ -0,0 +1,47 @@
+"""cover aggregate columns in the username/day indexes
+
+Revision ID: 0006_covering_indexes
+Revises: 0005_partition_sessions
+Create Date: 2026-01-06 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0006_covering_indexes"
+down_revision = "0005_partition_sessions"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    (
+        "ix_sessions_username_day_date",
+        "sessions",
+        ["username", "day_date"],
+        ["timer_id", "duration_seconds", "end_at"],
+    ),
+    (
+        "ix_day_summaries_username_day_date",
+        "day_summaries",
+        ["username", "day_date"],
+        ["timer_id", "total_seconds"],
+    ),
+    (
+        "ix_day_summaries_username_timer_day_date",
+        "day_summaries",
+        ["username", "timer_id", "day_date"],
+        ["total_seconds"],
+    ),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns, include in INDEXES:
+        op.drop_index(name, table_name=table)
+        op.create_index(name, table, columns, postgresql_include=include)
+
+
+def downgrade() -> None:
+    for name, table, columns, _ in INDEXES:
+        op.drop_index(name, table_name=table)
+        op.create_index(name, table, columns)
@@ -0,0 +1,90 @@
+"""append-only ledger for timer cycle totals
+
+Revision ID: 0007_cycle_total_ledger
+Revises: 0006_covering_indexes
+Create Date: 2026-01-07 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0007_cycle_total_ledger"
+down_revision = "0006_covering_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "timers", "cycle_total_seconds", new_column_name="cycle_base_seconds"
+    )
+    op.add_column(
+        "timers",
+        sa.Column(
+            "cycle_epoch", sa.Integer(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+    op.add_column(
+        "users",
+        sa.Column(
+            "cycle_epoch", sa.Integer(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+    op.create_table(
+        "cycle_total_entries",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("timer_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("epoch", sa.Integer(), nullable=False),
+        sa.Column("seconds", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["timer_id"],
+            ["timers.id"],
+            name="fk_cycle_total_entries_timer_id_timers",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name="pk_cycle_total_entries"),
+    )
+    op.create_index(
+        "ix_cycle_total_entries_timer_id_epoch",
+        "cycle_total_entries",
+        ["timer_id", "epoch"],
+        postgresql_include=["seconds"],
+    )
+
+
+def downgrade() -> None:
+    # Fold pending entries back so no time is lost.
+    op.execute(
+        """
+        UPDATE timers
+        SET cycle_base_seconds = CASE
+                WHEN timers.cycle_epoch = users.cycle_epoch
+                    THEN timers.cycle_base_seconds
+                ELSE 0
+            END + COALESCE((
+                SELECT SUM(entries.seconds)
+                FROM cycle_total_entries AS entries
+                WHERE entries.timer_id = timers.id
+                  AND entries.epoch = users.cycle_epoch
+            ), 0)
+        FROM users
+        WHERE users.username = timers.username
+        """
+    )
+    op.drop_index(
+        "ix_cycle_total_entries_timer_id_epoch", table_name="cycle_total_entries"
+    )
+    op.drop_table("cycle_total_entries")
+    op.drop_column("users", "cycle_epoch")
+    op.drop_column("timers", "cycle_epoch")
+    op.alter_column(
+        "timers", "cycle_base_seconds", new_column_name="cycle_total_seconds"
+    )
@@ -0,0 +1,25 @@
+"""track the latest day each user has ended
+
+Revision ID: 0008_user_finalized_through
+Revises: 0007_cycle_total_ledger
+Create Date: 2026-01-08 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0008_user_finalized_through"
+down_revision = "0007_cycle_total_ledger"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Left NULL: day_summaries also holds days that were never ended (see 0004),
+    # so there is no record to backfill from. The next end-day sets it.
+    op.add_column("users", sa.Column("finalized_through", sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "finalized_through")
@@ -0,0 +1,46 @@
+"""record applied offline sync events by client event id
+
+Revision ID: 0009_sync_events
+Revises: 0008_user_finalized_through
+Create Date: 2026-01-09 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0009_sync_events"
+down_revision = "0008_user_finalized_through"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sync_events",
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("event_type", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("detail", sa.String(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["username"],
+            ["users.username"],
+            name="fk_sync_events_username_users",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("username", "id", name="pk_sync_events"),
+    )
+    op.create_index("ix_sync_events_created_at", "sync_events", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sync_events_created_at", table_name="sync_events")
+    op.drop_table("sync_events")
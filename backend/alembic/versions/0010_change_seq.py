@@ -0,0 +1,82 @@
+"""stamp timers, sessions and ledger rows with a change sequence
+
+Revision ID: 0010_change_seq
+Revises: 0009_sync_events
+Create Date: 2026-01-10 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0010_change_seq"
+down_revision = "0009_sync_events"
+branch_labels = None
+depends_on = None
+
+# Existing rows keep 0, which every client's first high-water mark is above.
+# New rows take the writing transaction's id from the column default; updates
+# restamp through the trigger.
+STAMPED_TABLES = (
+    ("timers", "username"),
+    ("sessions", "username"),
+    ("cycle_total_entries", "timer_id"),
+)
+UPDATED_TABLES = ("timers", "sessions")
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION stamp_change_seq() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.change_seq := pg_current_xact_id()::text::bigint;
+            RETURN NEW;
+        END;
+        $$
+        """
+    )
+    for table, owner_column in STAMPED_TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                "change_seq",
+                sa.BigInteger(),
+                server_default=sa.text("0"),
+                nullable=False,
+            ),
+        )
+        # Set separately so adding the column does not rewrite the table.
+        op.alter_column(
+            table,
+            "change_seq",
+            server_default=sa.text("pg_current_xact_id()::text::bigint"),
+        )
+        op.create_index(
+            f"ix_{table}_{owner_column}_change_seq", table, [owner_column, "change_seq"]
+        )
+    for table in UPDATED_TABLES:
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_change_seq BEFORE UPDATE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION stamp_change_seq()"
+        )
+    op.add_column(
+        "users",
+        sa.Column(
+            "cycle_epoch_seq",
+            sa.BigInteger(),
+            server_default=sa.text("0"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "cycle_epoch_seq")
+    for table in UPDATED_TABLES:
+        op.execute(f"DROP TRIGGER trg_{table}_change_seq ON {table}")
+    for table, owner_column in STAMPED_TABLES:
+        op.drop_index(f"ix_{table}_{owner_column}_change_seq", table_name=table)
+        op.drop_column(table, "change_seq")
+    op.execute("DROP FUNCTION stamp_change_seq()")
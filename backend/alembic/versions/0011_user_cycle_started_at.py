@@ -0,0 +1,29 @@
+"""record when each user's current cycle started
+
+Revision ID: 0011_user_cycle_started_at
+Revises: 0010_change_seq
+Create Date: 2026-01-11 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0011_user_cycle_started_at"
+down_revision = "0010_change_seq"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("cycle_started_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    # The start of a cycle that was already reset is unknown, so imported
+    # history stays out of it; users who never reset keep NULL (all time).
+    op.execute("UPDATE users SET cycle_started_at = now() WHERE cycle_epoch > 0")
+
+
+def downgrade() -> None:
+    op.drop_column("users", "cycle_started_at")
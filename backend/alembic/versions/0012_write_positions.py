@@ -0,0 +1,40 @@
+"""track each user's last committed WAL position for replica reads
+
+Revision ID: 0012_write_positions
+Revises: 0011_user_cycle_started_at
+Create Date: 2026-01-12 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0012_write_positions"
+down_revision = "0011_user_cycle_started_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "write_positions",
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("lsn", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+        sa.Column(
+            "writes_in_flight",
+            sa.Integer(),
+            server_default=sa.text("0"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("username", name="pk_write_positions"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("write_positions")
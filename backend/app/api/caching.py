@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Hashable
+
+from fastapi import Request, Response
+
+from app import memo
+from app.api.encoding import dump_json
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def data_version_etag(version: int) -> str:
+    return f'"v{version}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = {
+        candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")
+    }
+    return "*" in candidates or etag in candidates
+
+
+def not_modified(request: Request, response: Response, version: int) -> Response | None:
+    etag = data_version_etag(version)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(
+            status_code=304,
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+        )
+    return None
+
+
+def memo_lookup(username: str, key: Hashable) -> tuple[bytes | None, int]:
+    generation = memo.response_memo.generation(username)
+    return memo.response_memo.get(username, key), generation
+
+
+def memo_store(
+    username: str,
+    key: Hashable,
+    generation: int,
+    first_day: date,
+    last_day: date,
+    finalized_through: date | None,
+    payload: Any,
+) -> bytes:
+    content = dump_json(payload)
+    memo.response_memo.set(
+        username,
+        key,
+        content,
+        first_day,
+        last_day,
+        memo.ttl_seconds(last_day, finalized_through),
+        generation,
+    )
+    return content
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from fastapi import Depends, Query, Request, Response
+from sqlalchemy.orm import Session
+
+from app.api.caching import not_modified
+from app.api.encoding import json_response, session_rows
+from app.api.routing import RouterPair
+from app.db import get_db
+from app.schemas.changes import ChangesResponse
+from app.schemas.timer import TimerOut
+from app.services import changes as changes_service
+from app.services import versions as versions_service
+from app.services.changes import ChangeSet
+
+routes = RouterPair(tags=["sync"])
+router = routes.router
+async_router = routes.async_router
+
+# More changed sessions than this and the client is told to reload instead.
+CHANGES_SESSION_LIMIT = 1000
+
+
+def _changes_response(
+    since: int | None, changes: ChangeSet, response: Response
+) -> Response:
+    return json_response(
+        {
+            "since": since,
+            "next": changes.next_seq,
+            "reset": changes.reset,
+            "timers": [
+                TimerOut.model_validate(timer).model_dump() for timer in changes.timers
+            ],
+            "sessions": session_rows(changes.sessions),
+        },
+        response,
+    )
+
+
+@routes.get("/changes")
+def list_changes(
+    request: Request,
+    response: Response,
+    since: int | None = Query(None, ge=0),
+    db: Session = Depends(get_db),
+) -> ChangesResponse:
+    if since is None:
+        next_seq = changes_service.high_water(db)
+        return _changes_response(None, ChangeSet(next_seq), response)
+    username = request.state.username
+    version = versions_service.get_data_version(db, username)
+    cached = not_modified(request, response, version)
+    if cached is not None:
+        return cached
+    changes = changes_service.changes_since(
+        db, username, since, CHANGES_SESSION_LIMIT
+    )
+    return _changes_response(since, changes, response)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import date
+
+from fastapi import Depends, Query, Request, Response
+from sqlalchemy.orm import Session
+
+from app.api.caching import not_modified
+from app.api.routing import RouterPair
+from app.api.stats_responses import (
+    average_windows_response,
+    day_stats_response,
+    validate_windows,
+    week_stats_response,
+)
+from app.db import begin_snapshot, get_db
+from app.schemas.dashboard import DashboardResponse
+from app.schemas.session import DaySchedule, SessionOut
+from app.schemas.timer import TimerOut
+from app.services import dashboard as dashboard_service
+from app.services import versions as versions_service
+from app.services.dashboard import Dashboard
+
+routes = RouterPair(tags=["dashboard"])
+router = routes.router
+async_router = routes.async_router
+
+DEFAULT_AVERAGE_WINDOWS = [7, 14, 30, 90]
+
+
+def _dashboard_response(
+    dashboard: Dashboard, day_date: date, week_start: date, end_date: date
+) -> DashboardResponse:
+    return DashboardResponse(
+        timers=[TimerOut.model_validate(timer) for timer in dashboard.timers],
+        active_session=SessionOut.model_validate(dashboard.active_session)
+        if dashboard.active_session
+        else None,
+        day_stats=day_stats_response(day_date, dashboard.day_totals),
+        week_stats=week_stats_response(week_start, dashboard.week_totals),
+        averages=average_windows_response(end_date, dashboard.average_windows),
+        schedule_day=DaySchedule(
+            day_date=day_date,
+            sessions=[
+                SessionOut.model_validate(session)
+                for session in dashboard.day_sessions
+            ],
+        ),
+    )
+
+
+@routes.get("/dashboard")
+def get_dashboard(
+    request: Request,
+    response: Response,
+    day_date: date = Query(...),
+    week_start: date = Query(...),
+    end_date: date | None = Query(None),
+    days: list[int] = Query(DEFAULT_AVERAGE_WINDOWS),
+    db: Session = Depends(get_db),
+) -> DashboardResponse:
+    username = request.state.username
+    windows = validate_windows(days)
+    end_date = end_date or day_date
+    begin_snapshot(db)
+    version = versions_service.get_data_version(db, username)
+    cached = not_modified(request, response, version)
+    if cached is not None:
+        return cached
+    dashboard = dashboard_service.load_dashboard(
+        db, username, day_date, week_start, windows, end_date
+    )
+    return _dashboard_response(dashboard, day_date, week_start, end_date)
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi import Response
+from sqlalchemy import Row
+
+JSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def dump_json(payload: Any) -> bytes:
+    return orjson.dumps(payload, option=JSON_OPTIONS)
+
+
+def json_response(payload: Any, response: Response | None = None) -> Response:
+    return encoded_json_response(dump_json(payload), response)
+
+
+def encoded_json_response(content: bytes, response: Response | None = None) -> Response:
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers=dict(response.headers) if response is not None else None,
+    )
+
+
+def session_rows(rows: list[Row]) -> list[dict[str, Any]]:
+    return [row._asdict() for row in rows]
+
+
+def ndjson_line(row: Row) -> bytes:
+    return orjson.dumps(row._asdict(), option=JSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
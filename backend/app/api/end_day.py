@@ -1,17 +1,36 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from datetime import date
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
+from app.api.routing import RouterPair
 from app.db import get_db
 from app.schemas.stats import EndDayRequest, EndDayResponse, TimerTotal
 from app.services import sessions as sessions_service
 from app.services import stats as stats_service
 
-router = APIRouter(tags=["stats"])
+routes = RouterPair(tags=["stats"])
+router = routes.router
+async_router = routes.async_router
+
 
+def _end_day_response(
+    day_date: date, totals: list[tuple[UUID, int]]
+) -> EndDayResponse:
+    return EndDayResponse(
+        ended_day_date=day_date,
+        finalized=True,
+        totals=[
+            TimerTotal(timer_id=timer_id, total_seconds=total_seconds)
+            for timer_id, total_seconds in totals
+        ],
+    )
 
-@router.post("/end-day")
+
+@routes.post("/end-day")
 def end_day(
     payload: EndDayRequest, request: Request, db: Session = Depends(get_db)
 ) -> EndDayResponse:
@@ -26,14 +45,9 @@ def end_day(
             raise HTTPException(status_code=400, detail="Invalid client_tz")
         raise
 
-    totals = stats_service.compute_day_totals(db, username, payload.day_date)
+    totals = stats_service.compute_session_day_totals(
+        db, username, payload.day_date
+    )
     stats_service.upsert_day_summaries(db, username, payload.day_date, totals)
 
-    return EndDayResponse(
-        ended_day_date=payload.day_date,
-        finalized=True,
-        totals=[
-            TimerTotal(timer_id=timer_id, total_seconds=total_seconds)
-            for timer_id, total_seconds in totals
-        ],
-    )
+    return _end_day_response(payload.day_date, totals)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from typing import AsyncIterator, Literal
+
+from fastapi import Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.api.routing import RouterPair, iterate_db
+from app.db import get_db
+from app.services import exports as exports_service
+from app.services.exports import ExportFormat
+
+routes = RouterPair(tags=["export"])
+router = routes.router
+async_router = routes.async_router
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _export_response(
+    chunks: AsyncIterator[bytes], fmt: ExportFormat, gzip: bool
+) -> StreamingResponse:
+    filename = f"focusarc-export.{fmt}"
+    media_type = EXPORT_MEDIA_TYPES[fmt]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+        },
+    )
+
+
+@routes.get("/export")
+async def export_data(
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    gzip: bool = False,
+    db: Session | AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    username = request.state.username
+    chunks = iterate_db(db, exports_service.iter_export, username, format, gzip)
+    return _export_response(chunks, format, gzip)
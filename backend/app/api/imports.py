@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.api.routing import RouterPair
+from app.db import get_db
+from app.schemas.session import SessionImportResponse
+from app.services import async_imports as async_imports_service
+from app.services import imports as imports_service
+from app.services.imports import ImportFormat, ImportResult, InvalidImportRow
+from app.settings import get_settings
+
+settings = get_settings()
+
+routes = RouterPair(tags=["sessions"])
+router = routes.router
+async_router = routes.async_router
+
+IMPORT_CONTENT_TYPES: dict[str, ImportFormat] = {
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "text/csv": "csv",
+}
+
+IMPORT_ERRORS = {
+    "invalid_encoding": "Import must be UTF-8",
+    "invalid_row": "Invalid row",
+    "invalid_datetime": "Invalid start_at or end_at",
+    "invalid_time_range": "end_at is before start_at",
+    "invalid_duration": "Invalid duration_seconds",
+    "invalid_timezone": "Invalid client_tz",
+    "timer_not_found": "Timer not found",
+}
+
+
+async def _read_import_body(request: Request) -> tuple[bytes, ImportFormat]:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    fmt = IMPORT_CONTENT_TYPES.get(content_type.lower())
+    if fmt is None:
+        raise HTTPException(
+            status_code=415, detail="Import must be application/x-ndjson or text/csv"
+        )
+
+    chunks = bytearray()
+    async for chunk in request.stream():
+        chunks.extend(chunk)
+        if len(chunks) > settings.session_import_max_bytes:
+            raise HTTPException(status_code=413, detail="Import is too large")
+    return bytes(chunks), fmt
+
+
+def _import_error(exc: InvalidImportRow) -> HTTPException:
+    detail = IMPORT_ERRORS.get(exc.code, "Invalid row")
+    if exc.line:
+        detail = f"Line {exc.line}: {detail}"
+    return HTTPException(status_code=400, detail=detail)
+
+
+def _import_response(result: ImportResult) -> SessionImportResponse:
+    return SessionImportResponse(
+        received=result.received,
+        imported=result.imported,
+        skipped=result.skipped,
+    )
+
+
+@routes.post("/sessions/import")
+async def import_sessions(
+    request: Request, db: Session | AsyncSession = Depends(get_db)
+) -> SessionImportResponse:
+    username = request.state.username
+    body, fmt = await _read_import_body(request)
+    try:
+        # COPY goes through the driver connection, which differs per engine.
+        if isinstance(db, AsyncSession):
+            result = await async_imports_service.import_sessions(
+                db, username, body, fmt
+            )
+        else:
+            result = await run_in_threadpool(
+                imports_service.import_sessions, db, username, body, fmt
+            )
+    except InvalidImportRow as exc:
+        raise _import_error(exc)
+    return _import_response(result)
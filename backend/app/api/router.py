@@ -1,19 +1,30 @@
-from fastapi import APIRouter, Depends, Request
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 
-from app.auth import get_username
-from app.api.end_day import router as end_day_router
-from app.api.stats import router as stats_router
-from app.api.sessions import router as sessions_router
-from app.api.timers import router as timers_router
-from app.api.totals import router as totals_router
+from app import metrics
+from app.auth import get_username, get_username_async
+from app.api import (
+    changes,
+    dashboard,
+    end_day,
+    exports,
+    imports,
+    sessions,
+    stats,
+    sync,
+    timers,
+    totals,
+)
+from app.api.routing import RouterPair
 from app.db import get_db
 from app.models.session import Session as SessionModel
+from app.services import sessions as sessions_service
+from app.settings import get_settings
+
+settings = get_settings()
 
-router = APIRouter()
 public_router = APIRouter()
-api_router = APIRouter(dependencies=[Depends(get_username)])
+me_routes = RouterPair()
 
 
 @public_router.get("/health")
@@ -21,6 +32,11 @@ def health_check() -> dict:
     return {"status": "ok"}
 
 
+@public_router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics() -> Response:
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 def _session_to_dict(session: SessionModel) -> dict:
     return {
         "id": str(session.id),
@@ -34,25 +50,49 @@ def _session_to_dict(session: SessionModel) -> dict:
     }
 
 
-@api_router.get("/me")
+@me_routes.get("/me")
 def get_me(request: Request, db: Session = Depends(get_db)) -> dict:
     username = request.state.username
-    active_session = db.execute(
-        select(SessionModel).where(
-            SessionModel.username == username,
-            SessionModel.end_at.is_(None),
-        )
-    ).scalars().first()
+    active_session = sessions_service.get_active_session(db, username)
     return {
         "username": username,
         "active_session": _session_to_dict(active_session) if active_session else None,
     }
 
 
-api_router.include_router(timers_router)
-api_router.include_router(sessions_router)
-api_router.include_router(end_day_router)
-api_router.include_router(stats_router)
-api_router.include_router(totals_router)
-router.include_router(public_router)
-router.include_router(api_router)
+
+def build_router(db_mode: str) -> APIRouter:
+    if db_mode == "async":
+        api_router = APIRouter(dependencies=[Depends(get_username_async)])
+        api_router.include_router(me_routes.async_router)
+        api_router.include_router(timers.async_router)
+        api_router.include_router(sessions.async_router)
+        api_router.include_router(imports.async_router)
+        api_router.include_router(exports.async_router)
+        api_router.include_router(end_day.async_router)
+        api_router.include_router(stats.async_router)
+        api_router.include_router(totals.async_router)
+        api_router.include_router(dashboard.async_router)
+        api_router.include_router(sync.async_router)
+        api_router.include_router(changes.async_router)
+    else:
+        api_router = APIRouter(dependencies=[Depends(get_username)])
+        api_router.include_router(me_routes.router)
+        api_router.include_router(timers.router)
+        api_router.include_router(sessions.router)
+        api_router.include_router(imports.router)
+        api_router.include_router(exports.router)
+        api_router.include_router(end_day.router)
+        api_router.include_router(stats.router)
+        api_router.include_router(totals.router)
+        api_router.include_router(dashboard.router)
+        api_router.include_router(sync.router)
+        api_router.include_router(changes.router)
+
+    router = APIRouter()
+    router.include_router(public_router)
+    router.include_router(api_router)
+    return router
+
+
+router = build_router(settings.db_mode)
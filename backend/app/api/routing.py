@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import inspect
+from typing import Any, AsyncIterator, Callable, Iterator, TypeVar
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from app.db import get_async_db, get_async_read_db, get_db, get_read_db
+
+T = TypeVar("T")
+Endpoint = Callable[..., Any]
+
+ASYNC_DEPENDENCIES = {get_db: get_async_db, get_read_db: get_async_read_db}
+
+_DONE = object()
+
+
+async def run_db(db: Session | AsyncSession, fn: Callable[..., T], *args: Any) -> T:
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args)
+    return await run_in_threadpool(fn, db, *args)
+
+
+async def iterate_db(
+    db: Session | AsyncSession, fn: Callable[..., Iterator[T]], *args: Any
+) -> AsyncIterator[T]:
+    # Drives a sync generator over the session, one run_sync call per item on
+    # the async engine, and closes the session once the stream ends.
+    if isinstance(db, AsyncSession):
+        items = await db.run_sync(fn, *args)
+
+        def step(_: Session) -> Any:
+            return next(items, _DONE)
+
+        try:
+            while (item := await db.run_sync(step)) is not _DONE:
+                yield item
+        finally:
+            await db.run_sync(lambda _: items.close())
+            await db.close()
+        return
+
+    items = fn(db, *args)
+    try:
+        async for item in iterate_in_threadpool(items):
+            yield item
+    finally:
+        await run_in_threadpool(items.close)
+        await run_in_threadpool(db.close)
+
+
+def async_endpoint(endpoint: Endpoint) -> Endpoint:
+    signature = inspect.signature(endpoint, eval_str=True)
+    parameters = []
+    for parameter in signature.parameters.values():
+        if parameter.name == "db":
+            dependency = ASYNC_DEPENDENCIES[parameter.default.dependency]
+            parameter = parameter.replace(
+                annotation=AsyncSession, default=Depends(dependency)
+            )
+        parameters.append(parameter)
+
+    if inspect.iscoroutinefunction(endpoint):
+
+        async def wrapper(**kwargs: Any) -> Any:
+            return await endpoint(**kwargs)
+
+    else:
+
+        async def wrapper(**kwargs: Any) -> Any:
+            db = kwargs.pop("db")
+            return await db.run_sync(lambda session: endpoint(db=session, **kwargs))
+
+    # No __wrapped__: FastAPI would unwrap it and treat the route as sync.
+    wrapper.__signature__ = signature.replace(parameters=parameters)
+    wrapper.__name__ = endpoint.__name__
+    wrapper.__qualname__ = endpoint.__qualname__
+    wrapper.__module__ = endpoint.__module__
+    wrapper.__doc__ = endpoint.__doc__
+    return wrapper
+
+
+class RouterPair:
+    """Registers each endpoint on a sync router and an async router.
+
+    Sync endpoints run on the async engine inside a single ``run_sync`` call.
+    Async endpoints are shared as they are and reach the session through
+    ``run_db`` and ``iterate_db``.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        self.router = APIRouter(**kwargs)
+        self.async_router = APIRouter(**kwargs)
+
+    def api_route(
+        self, path: str, *, methods: list[str], **kwargs: Any
+    ) -> Callable[[Endpoint], Endpoint]:
+        def decorator(endpoint: Endpoint) -> Endpoint:
+            self.router.add_api_route(path, endpoint, methods=methods, **kwargs)
+            self.async_router.add_api_route(
+                path, async_endpoint(endpoint), methods=methods, **kwargs
+            )
+            return endpoint
+
+        return decorator
+
+    def get(self, path: str, **kwargs: Any) -> Callable[[Endpoint], Endpoint]:
+        return self.api_route(path, methods=["GET"], **kwargs)
+
+    def post(self, path: str, **kwargs: Any) -> Callable[[Endpoint], Endpoint]:
+        return self.api_route(path, methods=["POST"], **kwargs)
+
+    def patch(self, path: str, **kwargs: Any) -> Callable[[Endpoint], Endpoint]:
+        return self.api_route(path, methods=["PATCH"], **kwargs)
+
+    def delete(self, path: str, **kwargs: Any) -> Callable[[Endpoint], Endpoint]:
+        return self.api_route(path, methods=["DELETE"], **kwargs)
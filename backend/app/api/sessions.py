@@ -1,12 +1,29 @@
 from __future__ import annotations
 
-from datetime import date, timedelta
+import asyncio
+import base64
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import AsyncIterator, Awaitable, Callable, Iterator, Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.api.caching import memo_lookup, memo_store, not_modified
+from app.api.encoding import (
+    encoded_json_response,
+    json_response,
+    ndjson_line,
+    session_rows,
+)
+from app.api.routing import RouterPair, iterate_db, run_db
+from app.db import get_db, get_read_db
+from app.events import active_session_events
+from app.models.session import Session as SessionModel
 from app.schemas.session import (
     ActiveSessionResponse,
     DaySchedule,
@@ -17,14 +34,146 @@ from app.schemas.session import (
     StopTimerRequest,
     StopTimerResponse,
     WeekSchedule,
-    WeekScheduleDay,
 )
 from app.services import sessions as sessions_service
+from app.services import versions as versions_service
+from app.settings import get_settings
+
+settings = get_settings()
+
+routes = RouterPair(tags=["sessions"])
+router = routes.router
+async_router = routes.async_router
+
+STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+SESSION_PAGE_MAX = 1000
+SESSION_STREAM_BATCH = 1000
+
+
+def _start_timer_error(exc: Exception) -> HTTPException | None:
+    if isinstance(exc, LookupError) and str(exc) == "timer_not_found":
+        return HTTPException(status_code=404, detail="Timer not found")
+    if isinstance(exc, ValueError) and str(exc) == "invalid_timezone":
+        return HTTPException(status_code=400, detail="Invalid client_tz")
+    return None
+
+
+def _start_timer_response(
+    stopped_session: SessionModel | None, active_session: SessionModel
+) -> StartTimerResponse:
+    return StartTimerResponse(
+        stopped_session=SessionOut.model_validate(stopped_session)
+        if stopped_session
+        else None,
+        active_session=SessionOut.model_validate(active_session),
+    )
 
-router = APIRouter(tags=["sessions"])
 
+def _week_schedule(week_start: date, rows: list[Row]) -> dict:
+    days_map: dict[date, list[dict]] = {
+        week_start + timedelta(days=offset): [] for offset in range(7)
+    }
+    for row in rows:
+        days_map[row.day_date].append(row._asdict())
+
+    return {
+        "week_start": week_start,
+        "days": [
+            {"day_date": day, "sessions": days_map[day]}
+            for day in sorted(days_map.keys())
+        ],
+    }
+
+
+def _encode_cursor(row: Row) -> str:
+    raw = f"{row.start_at.isoformat()}|{row.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str | None) -> tuple[datetime, UUID] | None:
+    if cursor is None:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        start_at, session_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(start_at), UUID(session_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def _session_page(
+    db: Session,
+    request: Request,
+    response: Response,
+    username: str,
+    query: tuple,
+    limit: int | None,
+) -> Response:
+    version = versions_service.get_data_version(db, username)
+    cached = not_modified(request, response, version)
+    if cached is not None:
+        return cached
+    rows = sessions_service.list_session_rows(
+        db, username, *query, limit + 1 if limit is not None else None
+    )
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1])
+    return json_response(
+        {"sessions": session_rows(rows), "next_cursor": next_cursor}, response
+    )
+
+
+def _session_lines(db: Session, username: str, query: tuple) -> Iterator[bytes]:
+    rows = sessions_service.iter_session_rows(
+        db, username, *query, batch_size=SESSION_STREAM_BATCH
+    )
+    while batch := list(islice(rows, SESSION_STREAM_BATCH)):
+        yield b"".join(ndjson_line(row) for row in batch)
+
+
+def _active_session_event(active: SessionModel | None) -> str:
+    payload = ActiveSessionResponse(
+        active_session=SessionOut.model_validate(active) if active else None
+    )
+    return f"event: active_session\ndata: {payload.model_dump_json()}\n\n"
 
-@router.get("/active-session")
+
+def _load_active_session_event(db: Session, username: str) -> str:
+    try:
+        return _active_session_event(
+            sessions_service.get_active_session(db, username)
+        )
+    finally:
+        db.close()
+
+
+async def _active_session_stream(
+    request: Request,
+    username: str,
+    load_event: Callable[[], Awaitable[str]],
+) -> AsyncIterator[str]:
+    waker = active_session_events.subscribe(username)
+    try:
+        while True:
+            waker.clear()
+            yield await load_event()
+            while not waker.is_set():
+                try:
+                    await asyncio.wait_for(
+                        waker.wait(),
+                        timeout=settings.active_session_stream_heartbeat_seconds,
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keep-alive\n\n"
+    finally:
+        active_session_events.unsubscribe(username, waker)
+
+
+@routes.get("/active-session")
 def get_active_session(
     request: Request, db: Session = Depends(get_db)
 ) -> ActiveSessionResponse:
@@ -35,7 +184,23 @@ def get_active_session(
     )
 
 
-@router.post("/timers/{timer_id}/start")
+@routes.get("/active-session/stream")
+async def stream_active_session(
+    request: Request, db: Session | AsyncSession = Depends(get_db)
+) -> StreamingResponse:
+    username = request.state.username
+
+    async def load_event() -> str:
+        return await run_db(db, _load_active_session_event, username)
+
+    return StreamingResponse(
+        _active_session_stream(request, username, load_event),
+        media_type="text/event-stream",
+        headers=STREAM_HEADERS,
+    )
+
+
+@routes.post("/timers/{timer_id}/start")
 def start_timer(
     timer_id: UUID,
     payload: StartTimerRequest,
@@ -51,24 +216,16 @@ def start_timer(
             payload.client_tz,
             payload.stopped_adjustment_seconds,
         )
-    except LookupError as exc:
-        if str(exc) == "timer_not_found":
-            raise HTTPException(status_code=404, detail="Timer not found")
-        raise
-    except ValueError as exc:
-        if str(exc) == "invalid_timezone":
-            raise HTTPException(status_code=400, detail="Invalid client_tz")
+    except (LookupError, ValueError) as exc:
+        error = _start_timer_error(exc)
+        if error is not None:
+            raise error
         raise
 
-    return StartTimerResponse(
-        stopped_session=SessionOut.model_validate(stopped_session)
-        if stopped_session
-        else None,
-        active_session=SessionOut.model_validate(active_session),
-    )
+    return _start_timer_response(stopped_session, active_session)
 
 
-@router.post("/stop")
+@routes.post("/stop")
 def stop_timer(
     request: Request,
     db: Session = Depends(get_db),
@@ -86,59 +243,80 @@ def stop_timer(
     )
 
 
-@router.get("/sessions")
-def list_sessions(
+@routes.get("/sessions")
+async def list_sessions(
     request: Request,
+    response: Response,
     from_date: date = Query(..., alias="from"),
     to_date: date = Query(..., alias="to"),
     timer_id: UUID | None = None,
-    db: Session = Depends(get_db),
+    limit: int | None = Query(None, ge=1, le=SESSION_PAGE_MAX),
+    cursor: str | None = None,
+    format: Literal["json", "ndjson"] = "json",
+    db: Session | AsyncSession = Depends(get_read_db),
 ) -> SessionList:
     if from_date > to_date:
         raise HTTPException(status_code=400, detail="Invalid date range")
+    query = (from_date, to_date, timer_id, _decode_cursor(cursor))
     username = request.state.username
-    sessions = sessions_service.list_sessions(
-        db, username, from_date, to_date, timer_id
-    )
-    return SessionList(
-        sessions=[SessionOut.model_validate(session) for session in sessions]
+    if format == "json":
+        return await run_db(
+            db, _session_page, request, response, username, query, limit
+        )
+
+    version = await run_db(db, versions_service.get_data_version, username)
+    cached = not_modified(request, response, version)
+    if cached is not None:
+        return cached
+    return StreamingResponse(
+        iterate_db(db, _session_lines, username, query),
+        media_type="application/x-ndjson",
+        headers=dict(response.headers),
     )
 
 
-@router.get("/schedule/day")
+@routes.get("/schedule/day")
 def schedule_day(
     request: Request,
+    response: Response,
     day_date: date = Query(...),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> DaySchedule:
     username = request.state.username
-    sessions = sessions_service.list_sessions(db, username, day_date, day_date)
-    return DaySchedule(
-        day_date=day_date,
-        sessions=[SessionOut.model_validate(session) for session in sessions],
+    version = versions_service.get_data_version(db, username)
+    cached = not_modified(request, response, version)
+    if cached is not None:
+        return cached
+    rows = sessions_service.list_session_rows(db, username, day_date, day_date)
+    return json_response(
+        {"day_date": day_date, "sessions": session_rows(rows)}, response
     )
 
 
-@router.get("/schedule/week")
+@routes.get("/schedule/week")
 def schedule_week(
     request: Request,
+    response: Response,
     week_start: date = Query(...),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> WeekSchedule:
     username = request.state.username
-    week_end = week_start + timedelta(days=6)
-    sessions = sessions_service.list_sessions(db, username, week_start, week_end)
-
-    days_map: dict[date, list[SessionOut]] = {
-        week_start + timedelta(days=offset): [] for offset in range(7)
-    }
-    for session in sessions:
-        days_map[session.day_date].append(SessionOut.model_validate(session))
-
-    return WeekSchedule(
-        week_start=week_start,
-        days=[
-            WeekScheduleDay(day_date=day, sessions=days_map[day])
-            for day in sorted(days_map.keys())
-        ],
-    )
+    version, finalized_through = versions_service.get_cache_state(db, username)
+    cached = not_modified(request, response, version)
+    if cached is not None:
+        return cached
+    key = ("schedule_week", week_start)
+    content, generation = memo_lookup(username, key)
+    if content is None:
+        week_end = week_start + timedelta(days=6)
+        rows = sessions_service.list_session_rows(db, username, week_start, week_end)
+        content = memo_store(
+            username,
+            key,
+            generation,
+            week_start,
+            week_end,
+            finalized_through,
+            _week_schedule(week_start, rows),
+        )
+    return encoded_json_response(content, response)
@@ -1,74 +1,111 @@
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, timedelta
 
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import Depends, Query, Request, Response
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.api.caching import memo_lookup, memo_store, not_modified
+from app.api.encoding import encoded_json_response
+from app.api.routing import RouterPair
+from app.api.stats_responses import (
+    average_windows_response,
+    averages_response,
+    day_stats_response,
+    validate_windows,
+    week_stats_response,
+)
+from app.db import get_read_db
 from app.schemas.stats import (
+    AverageWindowsResponse,
     DayStatsResponse,
-    TimerTotal,
-    WeekStatsDay,
     WeekStatsResponse,
 )
 from app.services import stats as stats_service
+from app.services import versions as versions_service
 
-router = APIRouter(prefix="/stats", tags=["stats"])
+routes = RouterPair(prefix="/stats", tags=["stats"])
+router = routes.router
+async_router = routes.async_router
 
 
-@router.get("/day")
+@routes.get("/day")
 def stats_day(
     request: Request,
+    response: Response,
     day_date: date = Query(...),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> DayStatsResponse:
     username = request.state.username
-    totals = stats_service.compute_day_totals(db, username, day_date)
-    return DayStatsResponse(
-        day_date=day_date,
-        totals=[
-            TimerTotal(timer_id=timer_id, total_seconds=total_seconds)
-            for timer_id, total_seconds in totals
-        ],
-    )
+    version, finalized_through = versions_service.get_cache_state(db, username)
+    cached = not_modified(request, response, version)
+    if cached is not None:
+        return cached
+    key = ("stats_day", day_date)
+    content, generation = memo_lookup(username, key)
+    if content is None:
+        totals = stats_service.compute_day_totals(db, username, day_date)
+        content = memo_store(
+            username,
+            key,
+            generation,
+            day_date,
+            day_date,
+            finalized_through,
+            day_stats_response(day_date, totals).model_dump(),
+        )
+    return encoded_json_response(content, response)
 
 
-@router.get("/week")
+@routes.get("/week")
 def stats_week(
     request: Request,
+    response: Response,
     week_start: date = Query(...),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> WeekStatsResponse:
     username = request.state.username
-    days = stats_service.compute_week_totals(db, username, week_start)
-    return WeekStatsResponse(
-        week_start=week_start,
-        daily=[
-            WeekStatsDay(
-                day_date=day_date,
-                totals=[
-                    TimerTotal(timer_id=timer_id, total_seconds=total_seconds)
-                    for timer_id, total_seconds in totals
-                ],
-            )
-            for day_date, totals in days
-        ],
-    )
+    version, finalized_through = versions_service.get_cache_state(db, username)
+    cached = not_modified(request, response, version)
+    if cached is not None:
+        return cached
+    key = ("stats_week", week_start)
+    content, generation = memo_lookup(username, key)
+    if content is None:
+        days = stats_service.compute_week_totals(db, username, week_start)
+        content = memo_store(
+            username,
+            key,
+            generation,
+            week_start,
+            week_start + timedelta(days=6),
+            finalized_through,
+            week_stats_response(week_start, days).model_dump(),
+        )
+    return encoded_json_response(content, response)
 
 
-@router.get("/averages")
+@routes.get("/averages")
 def stats_averages(
     request: Request,
     days: int = Query(14, ge=1, le=365),
-    db: Session = Depends(get_db),
+    end_date: date = Query(...),
+    db: Session = Depends(get_read_db),
 ) -> dict:
     username = request.state.username
-    averages = stats_service.compute_averages(db, username, days)
-    return {
-        "days": days,
-        "averages": [
-            {"timer_id": str(timer_id), "avg_seconds_per_day": avg_seconds}
-            for timer_id, avg_seconds in averages
-        ],
-    }
+    averages = stats_service.compute_averages(db, username, days, end_date)
+    return averages_response(days, averages)
+
+
+@routes.get("/averages/windows")
+def stats_average_windows(
+    request: Request,
+    days: list[int] = Query(...),
+    end_date: date = Query(...),
+    db: Session = Depends(get_read_db),
+) -> AverageWindowsResponse:
+    username = request.state.username
+    windows = stats_service.compute_average_windows(
+        db, username, validate_windows(days), end_date
+    )
+    return average_windows_response(end_date, windows)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from datetime import date
+from uuid import UUID
+
+from fastapi import HTTPException
+
+from app.schemas.stats import (
+    AverageWindow,
+    AverageWindowsResponse,
+    DayStatsResponse,
+    TimerAverage,
+    TimerTotal,
+    WeekStatsDay,
+    WeekStatsResponse,
+)
+
+MAX_AVERAGE_WINDOWS = 12
+
+
+def day_stats_response(
+    day_date: date, totals: list[tuple[UUID, int]]
+) -> DayStatsResponse:
+    return DayStatsResponse(
+        day_date=day_date,
+        totals=[
+            TimerTotal(timer_id=timer_id, total_seconds=total_seconds)
+            for timer_id, total_seconds in totals
+        ],
+    )
+
+
+def week_stats_response(
+    week_start: date, days: list[tuple[date, list[tuple[UUID, int]]]]
+) -> WeekStatsResponse:
+    return WeekStatsResponse(
+        week_start=week_start,
+        daily=[
+            WeekStatsDay(
+                day_date=day_date,
+                totals=[
+                    TimerTotal(timer_id=timer_id, total_seconds=total_seconds)
+                    for timer_id, total_seconds in totals
+                ],
+            )
+            for day_date, totals in days
+        ],
+    )
+
+
+def averages_response(days: int, averages: list[tuple[UUID, int]]) -> dict:
+    return {
+        "days": days,
+        "averages": [
+            {"timer_id": str(timer_id), "avg_seconds_per_day": avg_seconds}
+            for timer_id, avg_seconds in averages
+        ],
+    }
+
+
+def validate_windows(days: list[int]) -> list[int]:
+    if not days or len(days) > MAX_AVERAGE_WINDOWS:
+        raise HTTPException(
+            status_code=400, detail=f"Provide 1-{MAX_AVERAGE_WINDOWS} windows"
+        )
+    if any(window < 1 or window > 365 for window in days):
+        raise HTTPException(status_code=400, detail="Windows must be 1-365 days")
+    return days
+
+
+def average_windows_response(
+    end_date: date, windows: list[tuple[int, list[tuple[UUID, int]]]]
+) -> AverageWindowsResponse:
+    return AverageWindowsResponse(
+        end_date=end_date,
+        windows=[
+            AverageWindow(
+                days=days,
+                averages=[
+                    TimerAverage(timer_id=timer_id, avg_seconds_per_day=avg_seconds)
+                    for timer_id, avg_seconds in averages
+                ],
+            )
+            for days, averages in windows
+        ],
+    )
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+
+from app.api.routing import RouterPair
+from app.db import get_db
+from app.schemas.session import SessionOut
+from app.schemas.sync import SyncEventResult, SyncRequest, SyncResponse
+from app.services import sync as sync_service
+from app.services.sync import SyncResult
+from app.settings import get_settings
+
+settings = get_settings()
+
+routes = RouterPair(tags=["sessions"])
+router = routes.router
+async_router = routes.async_router
+
+
+def _check_batch(payload: SyncRequest) -> None:
+    if len(payload.events) > settings.sync_max_events:
+        raise HTTPException(status_code=413, detail="Too many events")
+
+
+def _sync_error(exc: ValueError) -> HTTPException | None:
+    if str(exc) == "sync_conflict":
+        return HTTPException(
+            status_code=409, detail="Sessions changed during sync; retry the batch"
+        )
+    return None
+
+
+def _sync_response(result: SyncResult) -> SyncResponse:
+    return SyncResponse(
+        results=[
+            SyncEventResult(id=outcome.id, status=outcome.status, detail=outcome.detail)
+            for outcome in result.outcomes
+        ],
+        active_session=SessionOut.model_validate(result.active_session)
+        if result.active_session
+        else None,
+    )
+
+
+@routes.post("/sync")
+def sync_events(
+    payload: SyncRequest, request: Request, db: Session = Depends(get_db)
+) -> SyncResponse:
+    _check_batch(payload)
+    try:
+        result = sync_service.sync_events(
+            db, request.state.username, payload.events
+        )
+    except ValueError as exc:
+        error = _sync_error(exc)
+        if error is not None:
+            raise error
+        raise
+    return _sync_response(result)
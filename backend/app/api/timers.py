@@ -2,28 +2,38 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi import Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.api.caching import not_modified
+from app.api.routing import RouterPair
+from app.db import get_db, get_read_db
 from app.schemas.timer import TimerCreate, TimerList, TimerOut, TimerUpdate
 from app.services import timers as timers_service
+from app.services import versions as versions_service
 
-router = APIRouter(prefix="/timers", tags=["timers"])
+routes = RouterPair(prefix="/timers", tags=["timers"])
+router = routes.router
+async_router = routes.async_router
 
 
-@router.get("")
+@routes.get("")
 def list_timers(
     request: Request,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db),
     include_archived: bool = Query(default=False),
 ) -> TimerList:
     username = request.state.username
+    version = versions_service.get_data_version(db, username)
+    cached = not_modified(request, response, version)
+    if cached is not None:
+        return cached
     timers = timers_service.list_timers(db, username, include_archived)
     return TimerList(timers=timers)
 
 
-@router.post("", status_code=201)
+@routes.post("", status_code=201)
 def create_timer(
     payload: TimerCreate,
     request: Request,
@@ -39,7 +49,7 @@ def create_timer(
     return TimerOut.model_validate(timer)
 
 
-@router.patch("/{timer_id}")
+@routes.patch("/{timer_id}")
 def update_timer(
     timer_id: UUID,
     payload: TimerUpdate,
@@ -59,7 +69,7 @@ def update_timer(
     return TimerOut.model_validate(timer)
 
 
-@router.delete("/{timer_id}", status_code=204)
+@routes.delete("/{timer_id}", status_code=204)
 def delete_timer(
     timer_id: UUID,
     request: Request,
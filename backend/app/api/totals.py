@@ -1,20 +1,32 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Request
-from sqlalchemy import select, update
+from uuid import UUID
+
+from fastapi import Depends, Request
 from sqlalchemy.orm import Session
 
+from app.api.routing import RouterPair
 from app.db import get_db
-from app.models.timer import Timer
 from app.schemas.session import StopTimerRequest
 from app.schemas.stats import TimerTotal
 from app.schemas.totals import ResetTotalsResponse
 from app.services import sessions as sessions_service
+from app.services import timers as timers_service
+
+routes = RouterPair(prefix="/totals", tags=["totals"])
+router = routes.router
+async_router = routes.async_router
 
-router = APIRouter(prefix="/totals", tags=["totals"])
+
+def _reset_response(timer_ids: list[UUID]) -> ResetTotalsResponse:
+    return ResetTotalsResponse(
+        totals=[
+            TimerTotal(timer_id=timer_id, total_seconds=0) for timer_id in timer_ids
+        ]
+    )
 
 
-@router.post("/reset")
+@routes.post("/reset")
 def reset_totals(
     request: Request,
     db: Session = Depends(get_db),
@@ -23,20 +35,5 @@ def reset_totals(
     username = request.state.username
     adjustment_seconds = payload.adjustment_seconds if payload else None
     sessions_service.stop_active_session(db, username, adjustment_seconds)
-
-    with db.begin_nested():
-        db.execute(
-            update(Timer)
-            .where(Timer.username == username)
-            .values(cycle_total_seconds=0)
-        )
-
-    timers = db.execute(
-        select(Timer.id).where(Timer.username == username)
-    ).all()
-
-    return ResetTotalsResponse(
-        totals=[
-            TimerTotal(timer_id=row.id, total_seconds=0) for row in timers
-        ]
-    )
+    timer_ids = timers_service.reset_cycle_totals(db, username)
+    return _reset_response(timer_ids)
@@ -1,15 +1,21 @@
 from fastapi import Depends, Header, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.cache import TTLCache
+from app.db import get_async_db, get_db
 from app.models.user import User
+from app.settings import get_settings
 
+settings = get_settings()
 
-def get_username(
-    request: Request,
-    x_username: str | None = Header(default=None, alias="X-Username"),
-    db: Session = Depends(get_db),
-) -> str:
+known_usernames: TTLCache[str, bool] = TTLCache(
+    maxsize=settings.username_cache_size,
+    ttl_seconds=settings.username_cache_ttl_seconds,
+)
+
+
+def _normalize_username(x_username: str | None) -> str:
     if x_username is None:
         raise HTTPException(status_code=400, detail="X-Username header required")
 
@@ -18,18 +24,45 @@ def get_username(
         raise HTTPException(status_code=400, detail="X-Username header required")
     if len(normalized) > 32:
         raise HTTPException(status_code=400, detail="X-Username must be 1-32 chars")
+    return normalized
+
 
-    user = db.get(User, normalized)
+def _ensure_user(db: Session, username: str) -> None:
+    user = db.get(User, username)
     if user is None:
-        user = User(username=normalized)
+        user = User(username=username)
         db.add(user)
         try:
             db.commit()
         except Exception:
             db.rollback()
-            user = db.get(User, normalized)
+            user = db.get(User, username)
             if user is None:
                 raise
+    known_usernames.set(username, True)
+
+
+def get_username(
+    request: Request,
+    x_username: str | None = Header(default=None, alias="X-Username"),
+    db: Session = Depends(get_db),
+) -> str:
+    normalized = _normalize_username(x_username)
+    if known_usernames.get(normalized) is None:
+        _ensure_user(db, normalized)
+
+    request.state.username = normalized
+    return normalized
+
+
+async def get_username_async(
+    request: Request,
+    x_username: str | None = Header(default=None, alias="X-Username"),
+    db: AsyncSession = Depends(get_async_db),
+) -> str:
+    normalized = _normalize_username(x_username)
+    if known_usernames.get(normalized) is None:
+        await db.run_sync(_ensure_user, normalized)
 
     request.state.username = normalized
     return normalized
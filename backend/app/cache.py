@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Generic, Hashable, Iterable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)  # type: ignore[arg-type]
+            return entry is not _MISSING and entry[0] > time.monotonic()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def discard(self, key: K) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+
+@dataclass(frozen=True)
+class _MemoEntry:
+    expires_at: float
+    first_day: date
+    last_day: date
+    payload: bytes
+
+
+# Encoded responses per user, each covering a day range, bounded by total
+# bytes. Discards advance the user's generation; a result computed across a
+# discard is not stored, so it cannot bring back data from before a write.
+class MemoCache:
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._data: OrderedDict[tuple[str, Hashable], _MemoEntry] = OrderedDict()
+        self._keys: dict[str, set[Hashable]] = {}
+        self._generations: dict[str, int] = {}
+        self._clock = 0
+        self._cleared_at = 0
+        self._lock = threading.Lock()
+
+    def generation(self, username: str) -> int:
+        with self._lock:
+            return self._generation(username)
+
+    def get(self, username: str, key: Hashable) -> bytes | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get((username, key))
+            if entry is None or entry.expires_at <= now:
+                if entry is not None:
+                    self._remove(username, key)
+                self.misses += 1
+                return None
+            self._data.move_to_end((username, key))
+            self.hits += 1
+            return entry.payload
+
+    def set(
+        self,
+        username: str,
+        key: Hashable,
+        payload: bytes,
+        first_day: date,
+        last_day: date,
+        ttl_seconds: float | None,
+        generation: int,
+    ) -> None:
+        if len(payload) > self.max_bytes:
+            return
+        expires_at = (
+            float("inf") if ttl_seconds is None else time.monotonic() + ttl_seconds
+        )
+        with self._lock:
+            if self._generation(username) != generation:
+                return
+            self._remove(username, key)
+            self._data[(username, key)] = _MemoEntry(
+                expires_at, first_day, last_day, payload
+            )
+            self._keys.setdefault(username, set()).add(key)
+            self._bytes += len(payload)
+            while self._bytes > self.max_bytes:
+                (evicted_user, evicted_key), _ = next(iter(self._data.items()))
+                self._remove(evicted_user, evicted_key)
+
+    def discard_days(self, username: str, days: Iterable[date]) -> None:
+        days = list(days)
+        with self._lock:
+            self._bump(username)
+            for key in list(self._keys.get(username, ())):
+                entry = self._data[(username, key)]
+                if any(entry.first_day <= day <= entry.last_day for day in days):
+                    self._remove(username, key)
+
+    def discard_user(self, username: str) -> None:
+        with self._lock:
+            self._bump(username)
+            for key in list(self._keys.get(username, ())):
+                self._remove(username, key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clock += 1
+            self._cleared_at = self._clock
+            self._generations.clear()
+            self._data.clear()
+            self._keys.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "bytes": self._bytes,
+            }
+
+    def _generation(self, username: str) -> int:
+        return max(self._generations.get(username, 0), self._cleared_at)
+
+    def _bump(self, username: str) -> None:
+        self._clock += 1
+        self._generations[username] = self._clock
+
+    def _remove(self, username: str, key: Hashable) -> None:
+        entry = self._data.pop((username, key), None)
+        if entry is None:
+            return
+        self._bytes -= len(entry.payload)
+        keys = self._keys[username]
+        keys.discard(key)
+        if not keys:
+            del self._keys[username]
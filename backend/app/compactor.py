@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+
+from anyio import to_thread
+from sqlalchemy import text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import metrics
+from app.db import SessionLocal
+from app.services import timers as timers_service
+from app.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Any fixed key works as long as nothing else in the database uses it.
+LOCK_KEY = int.from_bytes(b"fa-cmpct", "big")
+TRY_LOCK_SQL = text("SELECT pg_try_advisory_xact_lock(:key)")
+
+
+def compact_once(
+    session_factory: sessionmaker[Session] = SessionLocal,
+    batch_size: int | None = None,
+) -> int:
+    batch_size = batch_size or settings.cycle_compaction_batch_size
+    folded = 0
+    with session_factory() as db:
+        while True:
+            # Held until the batch commits; another worker already compacting
+            # makes this one back off until its next run.
+            if not db.execute(TRY_LOCK_SQL, {"key": LOCK_KEY}).scalar_one():
+                db.rollback()
+                break
+            count = timers_service.fold_cycle_total_entries(db, batch_size)
+            db.commit()
+            folded += count
+            if count < batch_size:
+                break
+    if folded:
+        metrics.compacted_cycle_entries.inc(folded)
+        logger.info("folded %d cycle total entries", folded)
+    return folded
+
+
+async def run() -> None:
+    while True:
+        # Jitter keeps workers started together from polling in lockstep.
+        await asyncio.sleep(
+            settings.cycle_compaction_interval_seconds
+            + random.uniform(0, settings.cycle_compaction_jitter_seconds)
+        )
+        try:
+            await to_thread.run_sync(compact_once)
+        except Exception:
+            logger.exception("cycle total compaction run failed")
+
+
+def start() -> asyncio.Task[None]:
+    return asyncio.create_task(run())
@@ -1,13 +1,61 @@
+from fastapi import Depends, Request
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 
+from app import replica
+from app.metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool
 from app.settings import get_settings
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+engine = create_engine(
+    settings.database_url, pool_pre_ping=True, poolclass=InstrumentedQueuePool
+)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+async_engine = create_async_engine(
+    settings.database_url, pool_pre_ping=True, poolclass=InstrumentedAsyncQueuePool
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False)
+
+replica_engine = None
+ReplicaSessionLocal = None
+async_replica_engine = None
+AsyncReplicaSessionLocal = None
+if settings.database_replica_url:
+    replica.primary_sessions = SessionLocal
+    replica_engine = create_engine(
+        settings.database_replica_url,
+        pool_pre_ping=True,
+        poolclass=InstrumentedQueuePool,
+    )
+    ReplicaSessionLocal = sessionmaker(
+        bind=replica_engine,
+        autoflush=False,
+        autocommit=False,
+        info=replica.SESSION_INFO,
+    )
+    async_replica_engine = create_async_engine(
+        settings.database_replica_url,
+        pool_pre_ping=True,
+        poolclass=InstrumentedAsyncQueuePool,
+    )
+    AsyncReplicaSessionLocal = async_sessionmaker(
+        bind=async_replica_engine, autoflush=False, info=replica.SESSION_INFO
+    )
+
+
+def begin_snapshot(db: Session) -> None:
+    if db.in_transaction():
+        db.commit()
+    db.connection(
+        execution_options={
+            "isolation_level": "REPEATABLE READ",
+            "postgresql_readonly": True,
+        }
+    )
+
 
 def get_db():
     db = SessionLocal()
@@ -19,3 +67,47 @@ def get_db():
         raise
     finally:
         db.close()
+
+
+async def get_async_db():
+    db = AsyncSessionLocal()
+    try:
+        yield db
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
+
+
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+    if ReplicaSessionLocal is None:
+        yield db
+        return
+    lsn = replica.required_lsn(db, request.state.username)
+    replica_db = ReplicaSessionLocal()
+    try:
+        if lsn is not None and replica.replayed(replica_db, lsn):
+            yield replica_db
+        else:
+            yield db
+    finally:
+        replica_db.close()
+
+
+async def get_async_read_db(
+    request: Request, db: AsyncSession = Depends(get_async_db)
+):
+    if AsyncReplicaSessionLocal is None:
+        yield db
+        return
+    lsn = await db.run_sync(replica.required_lsn, request.state.username)
+    replica_db = AsyncReplicaSessionLocal()
+    try:
+        if lsn is not None and await replica_db.run_sync(replica.replayed, lsn):
+            yield replica_db
+        else:
+            yield db
+    finally:
+        await replica_db.close()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import invalidation
+
+_PENDING_KEY = "active_session_changed"
+
+
+class ActiveSessionBroker:
+    def __init__(self) -> None:
+        self._subscribers: dict[
+            str, set[tuple[asyncio.AbstractEventLoop, asyncio.Event]]
+        ] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, username: str) -> asyncio.Event:
+        waker = asyncio.Event()
+        entry = (asyncio.get_running_loop(), waker)
+        with self._lock:
+            self._subscribers.setdefault(username, set()).add(entry)
+        return waker
+
+    def unsubscribe(self, username: str, waker: asyncio.Event) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(username)
+            if not subscribers:
+                return
+            subscribers.difference_update(
+                {entry for entry in subscribers if entry[1] is waker}
+            )
+            if not subscribers:
+                del self._subscribers[username]
+
+    def publish(self, username: str) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(username, ()))
+        for loop, waker in subscribers:
+            try:
+                loop.call_soon_threadsafe(waker.set)
+            except RuntimeError:
+                self.unsubscribe(username, waker)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+active_session_events = ActiveSessionBroker()
+invalidation.register("sessions", active_session_events.publish)
+
+
+def mark_active_session_changed(db: Session, username: str) -> None:
+    db.info.setdefault(_PENDING_KEY, set()).add(username)
+    invalidation.publish(db, username, "sessions")
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session) -> None:
+    for username in session.info.pop(_PENDING_KEY, ()):
+        active_session_events.publish(username)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session: Session, previous_transaction) -> None:
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+from typing import Callable
+
+import psycopg
+from psycopg import sql
+from sqlalchemy import event, make_url, text
+from sqlalchemy.orm import Session
+
+from app.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Identifies this process so it skips the notifications it sent itself; local
+# caches are already kept current by the code that made the write.
+WORKER_ID = uuid.uuid4().hex
+
+_PENDING_KEY = "pending_invalidations"
+_MAX_BACKOFF_SECONDS = 30.0
+
+NOTIFY_SQL = text(
+    "SELECT pg_notify(:channel, payload) "
+    "FROM unnest(CAST(:payloads AS text[])) AS payload"
+)
+
+Evict = Callable[[str], None]
+Clear = Callable[[], None]
+
+_evictors: dict[str, list[Evict]] = {}
+_clearers: list[Clear] = []
+
+
+def register(entity: str, evict: Evict, clear: Clear | None = None) -> None:
+    _evictors.setdefault(entity, []).append(evict)
+    if clear is not None and clear not in _clearers:
+        _clearers.append(clear)
+
+
+def publish(db: Session, username: str, entity: str) -> None:
+    if settings.invalidation_bus:
+        db.info.setdefault(_PENDING_KEY, set()).add((username, entity))
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_before_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    # pg_notify is transactional: listeners only hear about committed writes.
+    payloads = [
+        json.dumps({"worker": WORKER_ID, "username": username, "entity": entity})
+        for username, entity in sorted(pending)
+    ]
+    session.execute(
+        NOTIFY_SQL, {"channel": settings.invalidation_channel, "payloads": payloads}
+    )
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session: Session, previous_transaction) -> None:
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING_KEY, None)
+
+
+def dispatch(payload: str) -> None:
+    try:
+        message = json.loads(payload)
+        worker, username, entity = (
+            message["worker"],
+            message["username"],
+            message["entity"],
+        )
+    except (ValueError, KeyError, TypeError):
+        logger.warning("ignoring malformed invalidation %r", payload)
+        return
+    if worker == WORKER_ID:
+        return
+    for evict in _evictors.get(entity, ()):
+        evict(username)
+
+
+def clear_all() -> None:
+    for clear in _clearers:
+        clear()
+
+
+def listener_dsn(database_url: str) -> str:
+    url = make_url(database_url).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+async def listen(dsn: str, channel: str) -> None:
+    backoff = 1.0
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(
+                dsn, autocommit=True
+            ) as conn:
+                await conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+                # Anything published while we were not listening is lost.
+                clear_all()
+                backoff = 1.0
+                async for notify in conn.notifies():
+                    dispatch(notify.payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning(
+                "invalidation listener disconnected; retrying in %.0fs",
+                backoff,
+                exc_info=True,
+            )
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, _MAX_BACKOFF_SECONDS)
+
+
+def start_listener() -> asyncio.Task[None]:
+    return asyncio.create_task(
+        listen(listener_dsn(settings.database_url), settings.invalidation_channel)
+    )
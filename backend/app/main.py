@@ -1,12 +1,48 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app import (
+    compactor,
+    invalidation,
+    memo,
+    metrics,
+    query_stats,
+    reaper,
+    replica,
+)
 from app.api.router import router
+from app.auth import known_usernames
+from app.db import async_engine, async_replica_engine, engine, replica_engine
+from app.services.stats import cumulative_totals_cache
 from app.settings import get_settings
 
 settings = get_settings()
 
-app = FastAPI(title="FocusArc API", debug=settings.app_env != "prod")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = []
+    if settings.invalidation_bus:
+        tasks.append(invalidation.start_listener())
+    if settings.session_reaper:
+        tasks.append(reaper.start())
+    if settings.cycle_compaction:
+        tasks.append(compactor.start())
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+
+app = FastAPI(
+    title="FocusArc API", debug=settings.app_env != "prod", lifespan=lifespan
+)
 origins = [origin.strip() for origin in settings.cors_origins.split(",") if origin.strip()]
 if origins:
     app.add_middleware(
@@ -15,5 +51,23 @@ if origins:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[
+            "ETag",
+            query_stats.STATEMENTS_HEADER,
+            query_stats.TIME_HEADER,
+        ],
     )
+app.add_middleware(replica.ReadYourWritesMiddleware)
+app.add_middleware(query_stats.QueryStatsMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
 app.include_router(router, prefix="/api")
+
+metrics.watch_engine("sync", engine)
+metrics.watch_engine("async", async_engine.sync_engine)
+if replica_engine is not None:
+    metrics.watch_engine("replica", replica_engine)
+if async_replica_engine is not None:
+    metrics.watch_engine("async_replica", async_replica_engine.sync_engine)
+metrics.watch_cache("usernames", known_usernames)
+metrics.watch_cache("cumulative_totals", cumulative_totals_cache)
+metrics.watch_cache("responses", memo.response_memo)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import argparse
+from datetime import date, datetime, timedelta, timezone
+
+from app import compactor, reaper
+from app.db import SessionLocal
+from app.services import finalization as finalization_service
+from app.services import partitions as partitions_service
+from app.services import sync as sync_service
+from app.settings import get_settings
+
+settings = get_settings()
+
+
+def _month(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m").date()
+
+
+def _day(value: str) -> date:
+    return date.fromisoformat(value)
+
+
+def create_partitions(args: argparse.Namespace) -> None:
+    current = partitions_service.month_start(date.today())
+    first = args.start or current
+    last = partitions_service.add_months(current, args.months_ahead)
+    with SessionLocal() as db:
+        created = partitions_service.ensure_partitions(db, first, last)
+        db.commit()
+    for name in created:
+        print(f"created {name}")
+    print(f"sessions partitioned through {last:%Y-%m}")
+
+
+def detach_partitions(args: argparse.Namespace) -> None:
+    with SessionLocal() as db:
+        try:
+            detached = partitions_service.detach_partitions(db, args.before, args.drop)
+        except ValueError as exc:
+            raise SystemExit(str(exc)) from exc
+        db.commit()
+    action = "dropped" if args.drop else "detached"
+    for name in detached:
+        print(f"{action} {name}")
+
+
+def compact_cycle_totals(args: argparse.Namespace) -> None:
+    folded = compactor.compact_once(batch_size=args.batch_size)
+    print(f"folded {folded} cycle total entries")
+
+
+def finalize_day(args: argparse.Namespace) -> None:
+    day_date = args.day_date or date.today() - timedelta(days=1)
+    with SessionLocal() as db:
+        result = finalization_service.finalize_day(db, day_date, args.chunk_size)
+    print(
+        f"finalized {day_date} for {result.users} users: "
+        f"closed {result.closed_sessions} stale sessions, "
+        f"summarized {result.summarized_users} users"
+    )
+
+
+def reap_sessions(args: argparse.Namespace) -> None:
+    print(f"closed {reaper.reap_once()} abandoned sessions")
+
+
+def prune_sync_events(args: argparse.Namespace) -> None:
+    before = datetime.now(timezone.utc) - timedelta(days=args.older_than_days)
+    with SessionLocal() as db:
+        deleted = sync_service.prune_sync_events(db, before)
+    print(f"deleted {deleted} sync events")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    create = commands.add_parser(
+        "create-partitions", help="create monthly sessions partitions ahead of time"
+    )
+    create.add_argument("--months-ahead", type=int, default=3)
+    create.add_argument(
+        "--from", dest="start", type=_month, help="first month (YYYY-MM)"
+    )
+    create.set_defaults(handler=create_partitions)
+
+    detach = commands.add_parser(
+        "detach-partitions", help="detach sessions partitions older than a month"
+    )
+    detach.add_argument("--before", type=_month, required=True, help="YYYY-MM")
+    detach.add_argument(
+        "--drop", action="store_true", help="drop detached partitions"
+    )
+    detach.set_defaults(handler=detach_partitions)
+
+    compact = commands.add_parser(
+        "compact-cycle-totals", help="fold the cycle total ledger into timers"
+    )
+    compact.add_argument("--batch-size", type=int, default=10_000)
+    compact.set_defaults(handler=compact_cycle_totals)
+
+    finalize = commands.add_parser(
+        "finalize-day", help="end a local day for every user in batches"
+    )
+    finalize.add_argument(
+        "--date",
+        dest="day_date",
+        type=_day,
+        help="local day to finalize (YYYY-MM-DD, default yesterday)",
+    )
+    finalize.add_argument("--chunk-size", type=int, default=5000)
+    finalize.set_defaults(handler=finalize_day)
+
+    reap = commands.add_parser(
+        "reap-sessions", help="close abandoned active sessions once"
+    )
+    reap.set_defaults(handler=reap_sessions)
+
+    prune = commands.add_parser(
+        "prune-sync-events", help="forget sync event ids older than a number of days"
+    )
+    prune.add_argument(
+        "--older-than-days", type=int, default=settings.sync_event_retention_days
+    )
+    prune.set_defaults(handler=prune_sync_events)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
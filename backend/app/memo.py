@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import invalidation
+from app.cache import MemoCache
+from app.settings import get_settings
+
+settings = get_settings()
+
+_PENDING_KEY = "memo_invalidations"
+_ALL_DAYS = None
+
+response_memo = MemoCache(max_bytes=settings.response_memo_max_bytes)
+for _entity in ("sessions", "timers"):
+    invalidation.register(_entity, response_memo.discard_user, response_memo.clear)
+
+
+def ttl_seconds(last_day: date, finalized_through: date | None) -> float | None:
+    # Clients can be up to a day behind UTC, so only periods ending before
+    # yesterday (UTC) are over everywhere; end-day must also have covered them.
+    settled_before = datetime.now(timezone.utc).date() - timedelta(days=1)
+    if (
+        last_day < settled_before
+        and finalized_through is not None
+        and last_day <= finalized_through
+    ):
+        return None
+    return settings.response_memo_recent_ttl_seconds
+
+
+def invalidate_days(db: Session, username: str, days: Iterable[date]) -> None:
+    pending = db.info.setdefault(_PENDING_KEY, {}).setdefault(username, set())
+    if pending is not _ALL_DAYS:
+        pending.update(days)
+
+
+def invalidate_user(db: Session, username: str) -> None:
+    db.info.setdefault(_PENDING_KEY, {})[username] = _ALL_DAYS
+
+
+@event.listens_for(Session, "after_commit")
+def _discard_after_commit(session: Session) -> None:
+    for username, days in session.info.pop(_PENDING_KEY, {}).items():
+        if days is _ALL_DAYS:
+            response_memo.discard_user(username)
+        else:
+            response_memo.discard_days(username, days)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_after_rollback(session: Session, previous_transaction) -> None:
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING_KEY, None)
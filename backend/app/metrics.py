@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Iterable, Iterator
+
+from anyio import to_thread
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.cache import MemoCache, TTLCache
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0
+)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+UNMATCHED_ROUTE = "unmatched"
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: Iterable[float]) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[Labels, tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            series = self._series.get(tuple(sorted(labels.items())))
+            return sum(series[0]) if series else 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = [
+                (labels, list(counts), total[0])
+                for labels, (counts, total) in sorted(self._series.items())
+            ]
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                bucket = _format_labels(labels, (("le", _format_value(bound)),))
+                yield f"{self.name}_bucket{bucket} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(labels)} {cumulative}"
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help_text = help_text
+        self._values: dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_format_labels(labels)} {_format_value(value)}"
+
+
+def _samples(
+    name: str,
+    help_text: str,
+    samples: Iterable[tuple[Labels, float]],
+    kind: str = "gauge",
+) -> Iterator[str]:
+    yield f"# HELP {name} {help_text}"
+    yield f"# TYPE {name} {kind}"
+    for labels, value in samples:
+        yield f"{name}{_format_labels(labels)} {_format_value(value)}"
+
+
+request_latency = Histogram(
+    "focusarc_http_request_duration_seconds",
+    "HTTP request latency by route template and status.",
+    LATENCY_BUCKETS,
+)
+pool_wait = Histogram(
+    "focusarc_db_pool_checkout_wait_seconds",
+    "Time spent obtaining a connection from the SQLAlchemy pool.",
+    POOL_WAIT_BUCKETS,
+)
+pool_checkouts = Counter(
+    "focusarc_db_pool_checkouts_total",
+    "Connections checked out of the SQLAlchemy pool.",
+)
+reaped_sessions = Counter(
+    "focusarc_reaped_sessions_total",
+    "Abandoned active sessions closed by the background reaper.",
+)
+compacted_cycle_entries = Counter(
+    "focusarc_compacted_cycle_entries_total",
+    "Cycle total ledger entries folded into timers by the background compactor.",
+)
+
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+_engines: dict[str, Engine] = {}
+_caches: dict[str, TTLCache | MemoCache] = {}
+
+
+def in_flight_requests() -> int:
+    return _in_flight
+
+
+def _track_in_flight(delta: int) -> None:
+    global _in_flight
+    with _in_flight_lock:
+        _in_flight += delta
+
+
+class _InstrumentedPool:
+    metrics_label = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        finally:
+            pool_wait.observe(time.perf_counter() - started, pool=self.metrics_label)
+            pool_checkouts.inc(pool=self.metrics_label)
+
+    def recreate(self):
+        pool = super().recreate()  # type: ignore[misc]
+        pool.metrics_label = self.metrics_label
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    metrics_label = "sync"
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+def watch_engine(label: str, engine: Engine) -> None:
+    _engines[label] = engine
+    if isinstance(engine.pool, _InstrumentedPool):
+        engine.pool.metrics_label = label
+
+
+def watch_cache(label: str, cache: TTLCache | MemoCache) -> None:
+    _caches[label] = cache
+
+
+def _pool_samples() -> dict[str, list[tuple[Labels, float]]]:
+    samples: dict[str, list[tuple[Labels, float]]] = {
+        "size": [],
+        "checked_out": [],
+        "overflow": [],
+    }
+    for label, engine in sorted(_engines.items()):
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            continue
+        labels = (("pool", label),)
+        samples["size"].append((labels, pool.size()))
+        samples["checked_out"].append((labels, pool.checkedout()))
+        samples["overflow"].append((labels, max(0, pool.overflow())))
+    return samples
+
+
+def _threadpool_samples() -> tuple[float, int, int] | None:
+    try:
+        limiter = to_thread.current_default_thread_limiter()
+    except RuntimeError:
+        return None
+    statistics = limiter.statistics()
+    return limiter.total_tokens, statistics.borrowed_tokens, statistics.tasks_waiting
+
+
+def render() -> str:
+    lines: list[str] = []
+    lines.extend(request_latency.render())
+    lines.extend(
+        _samples(
+            "focusarc_http_requests_in_flight",
+            "HTTP requests currently being served.",
+            [((), in_flight_requests())],
+        )
+    )
+
+    threadpool = _threadpool_samples()
+    if threadpool is not None:
+        capacity, busy, waiting = threadpool
+        lines.extend(
+            _samples(
+                "focusarc_threadpool_slots",
+                "Worker thread slots for sync endpoints by state.",
+                [((("state", "capacity"),), capacity), ((("state", "busy"),), busy)],
+            )
+        )
+        lines.extend(
+            _samples(
+                "focusarc_threadpool_waiting_tasks",
+                "Sync endpoint calls queued for a free worker thread.",
+                [((), waiting)],
+            )
+        )
+
+    pools = _pool_samples()
+    lines.extend(
+        _samples(
+            "focusarc_db_pool_size",
+            "Configured SQLAlchemy pool size.",
+            pools["size"],
+        )
+    )
+    lines.extend(
+        _samples(
+            "focusarc_db_pool_checked_out",
+            "Connections currently checked out of the pool.",
+            pools["checked_out"],
+        )
+    )
+    lines.extend(
+        _samples(
+            "focusarc_db_pool_overflow",
+            "Connections open beyond the pool size.",
+            pools["overflow"],
+        )
+    )
+    lines.extend(pool_checkouts.render())
+    lines.extend(pool_wait.render())
+    lines.extend(reaped_sessions.render())
+    lines.extend(compacted_cycle_entries.render())
+
+    caches = sorted(_caches.items())
+    stats = [((("cache", label),), cache.stats()) for label, cache in caches]
+    lines.extend(
+        _samples(
+            "focusarc_cache_hits_total",
+            "In-process cache hits.",
+            [(labels, values["hits"]) for labels, values in stats],
+            kind="counter",
+        )
+    )
+    lines.extend(
+        _samples(
+            "focusarc_cache_misses_total",
+            "In-process cache misses.",
+            [(labels, values["misses"]) for labels, values in stats],
+            kind="counter",
+        )
+    )
+    lines.extend(
+        _samples(
+            "focusarc_cache_entries",
+            "Entries currently held by in-process caches.",
+            [(labels, values["size"]) for labels, values in stats],
+        )
+    )
+    return "\n".join(lines) + "\n"
+
+
+def route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if not template:
+        return UNMATCHED_ROUTE
+    # Included routers keep their own paths; recover the mount prefix from the
+    # request path so labels read as full templates like /api/timers/{timer_id}.
+    prefix = scope["path"].rsplit("/", template.count("/"))[0]
+    return prefix + template
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        _track_in_flight(1)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _track_in_flight(-1)
+            request_latency.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=route_template(scope),
+                status=str(status),
+            )
@@ -1,7 +1,11 @@
+from app.models.active_session import ActiveSession
 from app.models.base import Base
+from app.models.cycle_total_entry import CycleTotalEntry
 from app.models.day_summary import DaySummary
 from app.models.session import Session
+from app.models.sync_event import SyncEvent
 from app.models.timer import Timer
 from app.models.user import User
+from app.models.write_position import WritePosition
 
-__all__ = ["Base", "User", "Timer", "Session", "DaySummary"]
+__all__ = ["Base", "User", "Timer", "Session", "ActiveSession", "DaySummary", "CycleTotalEntry", "SyncEvent", "WritePosition"]
@@ -0,0 +1,18 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ActiveSession(Base):
+    __tablename__ = "active_sessions"
+
+    username: Mapped[str] = mapped_column(
+        String, ForeignKey("users.username", ondelete="CASCADE"), primary_key=True
+    )
+    session_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    day_date: Mapped[date] = mapped_column(Date, nullable=False)
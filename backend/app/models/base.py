@@ -1,4 +1,4 @@
-from sqlalchemy import MetaData
+from sqlalchemy import DDL, MetaData, event, text
 from sqlalchemy.orm import DeclarativeBase
 
 
@@ -13,3 +13,28 @@ NAMING_CONVENTION = {
 
 class Base(DeclarativeBase):
     metadata = MetaData(naming_convention=NAMING_CONVENTION)
+
+
+# Rows carry the id of the transaction that last wrote them: a column default
+# on insert, a trigger on update. Ids are handed out in start order, so readers
+# only trust them up to their snapshot's xmin.
+CHANGE_SEQ_DEFAULT = text("pg_current_xact_id()::text::bigint")
+
+STAMP_CHANGE_SEQ_FUNCTION = """
+CREATE OR REPLACE FUNCTION stamp_change_seq() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.change_seq := pg_current_xact_id()::text::bigint;
+    RETURN NEW;
+END;
+$$
+"""
+
+event.listen(Base.metadata, "before_create", DDL(STAMP_CHANGE_SEQ_FUNCTION))
+
+
+def change_seq_trigger(table_name: str) -> DDL:
+    return DDL(
+        f"CREATE TRIGGER trg_{table_name}_change_seq BEFORE UPDATE ON {table_name} "
+        "FOR EACH ROW EXECUTE FUNCTION stamp_change_seq()"
+    )
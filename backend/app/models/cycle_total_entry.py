@@ -0,0 +1,36 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Identity, Index, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.models.base import CHANGE_SEQ_DEFAULT, Base
+
+
+class CycleTotalEntry(Base):
+    __tablename__ = "cycle_total_entries"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    timer_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("timers.id", ondelete="CASCADE"), nullable=False
+    )
+    epoch: Mapped[int] = mapped_column(Integer, nullable=False)
+    seconds: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    change_seq: Mapped[int] = mapped_column(
+        BigInteger, server_default=CHANGE_SEQ_DEFAULT, nullable=False
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_cycle_total_entries_timer_id_epoch",
+            "timer_id",
+            "epoch",
+            postgresql_include=["seconds"],
+        ),
+        Index("ix_cycle_total_entries_timer_id_change_seq", "timer_id", "change_seq"),
+    )
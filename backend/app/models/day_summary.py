@@ -33,11 +33,17 @@ class DaySummary(Base):
             name="uq_day_summaries_username_day_timer",
         ),
         CheckConstraint("total_seconds >= 0", name="ck_day_summaries_total_nonnegative"),
-        Index("ix_day_summaries_username_day_date", "username", "day_date"),
+        Index(
+            "ix_day_summaries_username_day_date",
+            "username",
+            "day_date",
+            postgresql_include=["timer_id", "total_seconds"],
+        ),
         Index(
             "ix_day_summaries_username_timer_day_date",
             "username",
             "timer_id",
             "day_date",
+            postgresql_include=["total_seconds"],
         ),
     )
@@ -1,8 +1,9 @@
 import uuid
 from datetime import date, datetime
 
-import sqlalchemy as sa
 from sqlalchemy import (
+    DDL,
+    BigInteger,
     CheckConstraint,
     Date,
     DateTime,
@@ -11,12 +12,13 @@ from sqlalchemy import (
     Integer,
     SmallInteger,
     String,
+    event,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
-from app.models.base import Base
+from app.models.base import CHANGE_SEQ_DEFAULT, Base, change_seq_trigger
 
 
 class Session(Base):
@@ -33,11 +35,14 @@ class Session(Base):
     end_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     duration_seconds: Mapped[int | None] = mapped_column(Integer)
     client_tz: Mapped[str] = mapped_column(String, nullable=False)
-    day_date: Mapped[date] = mapped_column(Date, nullable=False)
+    day_date: Mapped[date] = mapped_column(Date, primary_key=True)
     day_of_week: Mapped[int] = mapped_column(SmallInteger, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    change_seq: Mapped[int] = mapped_column(
+        BigInteger, server_default=CHANGE_SEQ_DEFAULT, nullable=False
+    )
 
     __table_args__ = (
         CheckConstraint(
@@ -49,12 +54,47 @@ class Session(Base):
             name="ck_sessions_duration_nonnegative",
         ),
         Index(
-            "ux_sessions_one_active_per_user",
+            "ix_sessions_username_day_date",
             "username",
-            unique=True,
-            postgresql_where=sa.text("end_at IS NULL"),
+            "day_date",
+            postgresql_include=["timer_id", "duration_seconds", "end_at"],
         ),
-        Index("ix_sessions_username_day_date", "username", "day_date"),
         Index("ix_sessions_username_timer_day_date", "username", "timer_id", "day_date"),
         Index("ix_sessions_username_start_at", "username", "start_at"),
+        Index("ix_sessions_username_change_seq", "username", "change_seq"),
+        {"postgresql_partition_by": "RANGE (day_date)"},
     )
+
+
+DEFAULT_PARTITION = "sessions_default"
+
+TRACK_ACTIVE_SESSION_FUNCTION = """
+CREATE OR REPLACE FUNCTION sessions_track_active() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.end_at IS NULL THEN
+        DELETE FROM active_sessions
+        WHERE username = OLD.username AND session_id = OLD.id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.end_at IS NULL THEN
+        INSERT INTO active_sessions (username, session_id, day_date)
+        VALUES (NEW.username, NEW.id, NEW.day_date);
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+TRACK_ACTIVE_SESSION_TRIGGER = """
+CREATE TRIGGER trg_sessions_track_active
+AFTER INSERT OR UPDATE OF end_at OR DELETE ON sessions
+FOR EACH ROW EXECUTE FUNCTION sessions_track_active()
+"""
+
+for statement in (
+    f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF sessions DEFAULT",
+    TRACK_ACTIVE_SESSION_FUNCTION,
+    TRACK_ACTIVE_SESSION_TRIGGER,
+):
+    event.listen(Session.__table__, "after_create", DDL(statement))
+event.listen(Session.__table__, "after_create", change_seq_trigger("sessions"))
@@ -3,6 +3,7 @@ from datetime import datetime
 
 import sqlalchemy as sa
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     CheckConstraint,
     DateTime,
@@ -11,12 +12,17 @@ from sqlalchemy import (
     Integer,
     String,
     UniqueConstraint,
+    case,
+    event,
+    select,
 )
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, column_property, mapped_column
 from sqlalchemy.sql import func
 
-from app.models.base import Base
+from app.models.base import CHANGE_SEQ_DEFAULT, Base, change_seq_trigger
+from app.models.cycle_total_entry import CycleTotalEntry
+from app.models.user import User
 
 
 class Timer(Base):
@@ -29,7 +35,11 @@ class Timer(Base):
     name: Mapped[str] = mapped_column(String, nullable=False)
     color: Mapped[str] = mapped_column(String, nullable=False)
     icon: Mapped[str] = mapped_column(String, nullable=False)
-    cycle_total_seconds: Mapped[int] = mapped_column(
+    # Compacted total as of cycle_epoch; newer deltas live in cycle_total_entries.
+    cycle_base_seconds: Mapped[int] = mapped_column(
+        Integer, server_default=sa.text("0"), nullable=False
+    )
+    cycle_epoch: Mapped[int] = mapped_column(
         Integer, server_default=sa.text("0"), nullable=False
     )
     is_archived: Mapped[bool] = mapped_column(
@@ -41,9 +51,38 @@ class Timer(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
+    change_seq: Mapped[int] = mapped_column(
+        BigInteger, server_default=CHANGE_SEQ_DEFAULT, nullable=False
+    )
 
     __table_args__ = (
         UniqueConstraint("username", "name", name="uq_timers_username_name"),
         CheckConstraint("char_length(name) BETWEEN 1 AND 32", name="ck_timers_name_len"),
         Index("ix_timers_username_is_archived", "username", "is_archived"),
+        Index("ix_timers_username_change_seq", "username", "change_seq"),
     )
+
+
+event.listen(Timer.__table__, "after_create", change_seq_trigger("timers"))
+
+
+_user_epoch = (
+    select(User.cycle_epoch)
+    .where(User.username == Timer.username)
+    .correlate_except(User)
+    .scalar_subquery()
+)
+_pending_seconds = (
+    select(func.coalesce(func.sum(CycleTotalEntry.seconds), 0))
+    .join(User, User.cycle_epoch == CycleTotalEntry.epoch)
+    .where(CycleTotalEntry.timer_id == Timer.id, User.username == Timer.username)
+    .correlate_except(CycleTotalEntry, User)
+    .scalar_subquery()
+)
+
+# A reset moves the user to a new epoch, which zeroes the base without
+# touching timer rows; compaction folds current-epoch entries into the base.
+Timer.cycle_total_seconds = column_property(
+    case((Timer.cycle_epoch == _user_epoch, Timer.cycle_base_seconds), else_=0)
+    + _pending_seconds
+)
@@ -1,6 +1,7 @@
-from datetime import datetime
+from datetime import date, datetime
 
-from sqlalchemy import CheckConstraint, DateTime, String
+import sqlalchemy as sa
+from sqlalchemy import BigInteger, CheckConstraint, Date, DateTime, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -11,6 +12,19 @@ class User(Base):
     __tablename__ = "users"
 
     username: Mapped[str] = mapped_column(String, primary_key=True)
+    data_version: Mapped[int] = mapped_column(
+        BigInteger, server_default=sa.text("0"), nullable=False
+    )
+    cycle_epoch: Mapped[int] = mapped_column(
+        Integer, server_default=sa.text("0"), nullable=False
+    )
+    finalized_through: Mapped[date | None] = mapped_column(Date)
+    # When cycle totals were last reset; NULL means the cycle covers all time.
+    cycle_started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # Transaction that last reset cycle totals; see stamp_change_seq().
+    cycle_epoch_seq: Mapped[int] = mapped_column(
+        BigInteger, server_default=sa.text("0"), nullable=False
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Integer, String, text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.models.base import Base
+
+
+class WritePosition(Base):
+    # Recorded before authentication, so no foreign key to users.
+    __tablename__ = "write_positions"
+
+    username: Mapped[str] = mapped_column(String, primary_key=True)
+    lsn: Mapped[int] = mapped_column(
+        BigInteger, server_default=text("0"), nullable=False
+    )
+    writes_in_flight: Mapped[int] = mapped_column(
+        Integer, server_default=text("0"), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
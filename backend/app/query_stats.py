@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import route_template
+from app.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+STATEMENTS_HEADER = "X-DB-Statements"
+TIME_HEADER = "X-DB-Time-Ms"
+
+_START_KEY = "query_stats_started"
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    seconds: float = 0.0
+
+    @property
+    def milliseconds(self) -> float:
+        return self.seconds * 1000
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current() -> QueryStats | None:
+    return _current.get()
+
+
+@contextmanager
+def track() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = conn.info.get(_START_KEY)
+    if stats is None or not started:
+        return
+    stats.statements += 1
+    stats.seconds += time.perf_counter() - started.pop()
+
+
+@event.listens_for(Engine, "commit")
+def _commit(conn) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.statements += 1
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context) -> None:
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(_START_KEY):
+        connection.info[_START_KEY].pop()
+
+
+def over_budget(stats: QueryStats) -> bool:
+    return (
+        stats.statements > settings.query_budget_statements
+        or stats.milliseconds > settings.query_budget_ms
+    )
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track() as stats:
+
+            # The headers go out before dependency teardown, so they leave out
+            # get_db's commit and any invalidation notify; the log line and
+            # the tracked stats include them.
+            async def send_with_headers(message: Message) -> None:
+                start = message["type"] == "http.response.start"
+                if start and settings.query_stats_header:
+                    headers = MutableHeaders(scope=message)
+                    headers[STATEMENTS_HEADER] = str(stats.statements)
+                    headers[TIME_HEADER] = f"{stats.milliseconds:.1f}"
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_headers)
+            finally:
+                if over_budget(stats):
+                    logger.warning(
+                        "%s %s ran %d SQL statements in %.1f ms (budget %d / %.0f ms)",
+                        scope["method"],
+                        route_template(scope),
+                        stats.statements,
+                        stats.milliseconds,
+                        settings.query_budget_statements,
+                        settings.query_budget_ms,
+                    )
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from datetime import datetime, timezone
+
+from anyio import to_thread
+from sqlalchemy import text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import metrics
+from app.db import SessionLocal
+from app.services import sessions as sessions_service
+from app.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Any fixed key works as long as nothing else in the database uses it.
+LOCK_KEY = int.from_bytes(b"fa-reap", "big")
+TRY_LOCK_SQL = text("SELECT pg_try_advisory_xact_lock(:key)")
+
+
+def reap_once(
+    session_factory: sessionmaker[Session] = SessionLocal,
+    now: datetime | None = None,
+) -> int:
+    now = now or datetime.now(timezone.utc)
+    reaped = 0
+    with session_factory() as db:
+        while True:
+            # Held until the batch commits; another worker already reaping
+            # makes this one back off until its next run.
+            if not db.execute(TRY_LOCK_SQL, {"key": LOCK_KEY}).scalar_one():
+                db.rollback()
+                break
+            closed = sessions_service.reap_abandoned_sessions(
+                db,
+                now,
+                settings.session_reaper_max_age_hours * 3600,
+                settings.session_reaper_batch_size,
+            )
+            db.commit()
+            reaped += closed
+            if closed < settings.session_reaper_batch_size:
+                break
+    if reaped:
+        metrics.reaped_sessions.inc(reaped)
+        logger.info("closed %d abandoned sessions", reaped)
+    return reaped
+
+
+async def run() -> None:
+    while True:
+        # Jitter keeps workers started together from polling in lockstep.
+        await asyncio.sleep(
+            settings.session_reaper_interval_seconds
+            + random.uniform(0, settings.session_reaper_jitter_seconds)
+        )
+        try:
+            await to_thread.run_sync(reap_once)
+        except Exception:
+            logger.exception("session reaper run failed")
+
+
+def start() -> asyncio.Task[None]:
+    return asyncio.create_task(run())
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from anyio import to_thread
+from sqlalchemy import text
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.settings import get_settings
+
+settings = get_settings()
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+SESSION_INFO = {"read_replica": True}
+
+# Each user's writes are tracked in the primary's write_positions table so
+# every worker sees them: a write in flight, then the WAL position that holds
+# it once committed. Reads go to the replica only after it has replayed that
+# position. A marker older than replica_write_timeout_seconds is from a
+# worker that died mid-request and is ignored.
+WRITE_STARTED_SQL = text(
+    """
+    INSERT INTO write_positions (username, writes_in_flight)
+    VALUES (:username, 1)
+    ON CONFLICT (username) DO UPDATE
+    SET writes_in_flight = CASE
+            WHEN write_positions.updated_at
+                < now() - make_interval(secs => :timeout)
+                THEN 1
+            ELSE write_positions.writes_in_flight + 1
+        END,
+        updated_at = now()
+    """
+)
+WRITE_FINISHED_SQL = text(
+    """
+    UPDATE write_positions
+    SET writes_in_flight = GREATEST(writes_in_flight - 1, 0),
+        lsn = GREATEST(lsn, (pg_current_wal_lsn() - '0/0'::pg_lsn)::bigint),
+        updated_at = now()
+    WHERE username = :username
+    """
+)
+REQUIRED_LSN_SQL = text(
+    """
+    SELECT lsn,
+           writes_in_flight > 0
+               AND updated_at >= now() - make_interval(secs => :timeout)
+    FROM write_positions
+    WHERE username = :username
+    """
+)
+# A primary (or the tests' read-only stand-in) has no replay position; its
+# current position covers everything it has committed.
+REPLAYED_SQL = text(
+    """
+    SELECT (
+        COALESCE(pg_last_wal_replay_lsn(), pg_current_wal_lsn()) - '0/0'::pg_lsn
+    )::bigint >= :lsn
+    """
+)
+
+# Set by app.db when a replica is configured; writes are only tracked then.
+primary_sessions: sessionmaker[Session] | None = None
+
+
+def is_replica(db: Session) -> bool:
+    return db.info.get("read_replica", False)
+
+
+def required_lsn(db: Session, username: str) -> int | None:
+    """WAL position the replica must have replayed to serve the user.
+
+    ``None`` means one of the user's writes is still in flight, so only the
+    primary can serve them.
+    """
+    row = db.execute(
+        REQUIRED_LSN_SQL,
+        {"username": username, "timeout": settings.replica_write_timeout_seconds},
+    ).one_or_none()
+    if row is None:
+        return 0
+    lsn, writing = row
+    return None if writing else lsn
+
+
+def replayed(db: Session, lsn: int) -> bool:
+    return lsn == 0 or db.execute(REPLAYED_SQL, {"lsn": lsn}).scalar_one()
+
+
+def _record(statement, username: str) -> None:
+    with primary_sessions() as db:
+        db.execute(
+            statement,
+            {"username": username, "timeout": settings.replica_write_timeout_seconds},
+        )
+        db.commit()
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        username = ""
+        if (
+            scope["type"] == "http"
+            and scope["method"] not in SAFE_METHODS
+            and primary_sessions is not None
+        ):
+            username = Headers(scope=scope).get("x-username", "").strip()
+        if not username or len(username) > 32:
+            await self.app(scope, receive, send)
+            return
+
+        await to_thread.run_sync(_record, WRITE_STARTED_SQL, username)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # The request's session commits after the response has been sent,
+            # so the position read here includes the write.
+            await to_thread.run_sync(_record, WRITE_FINISHED_SQL, username)
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+from app.schemas.session import SessionOut
+from app.schemas.timer import TimerOut
+
+
+class ChangesResponse(BaseModel):
+    since: int | None
+    next: int
+    reset: bool
+    timers: list[TimerOut]
+    sessions: list[SessionOut]
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+from app.schemas.session import DaySchedule, SessionOut
+from app.schemas.stats import (
+    AverageWindowsResponse,
+    DayStatsResponse,
+    WeekStatsResponse,
+)
+from app.schemas.timer import TimerOut
+
+
+class DashboardResponse(BaseModel):
+    timers: list[TimerOut]
+    active_session: SessionOut | None
+    day_stats: DayStatsResponse
+    week_stats: WeekStatsResponse
+    averages: AverageWindowsResponse
+    schedule_day: DaySchedule
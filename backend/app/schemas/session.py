@@ -45,6 +45,7 @@ class StopTimerResponse(BaseModel):
 
 class SessionList(BaseModel):
     sessions: list[SessionOut]
+    next_cursor: str | None = None
 
 
 class DaySchedule(BaseModel):
@@ -60,3 +61,9 @@ class WeekScheduleDay(BaseModel):
 class WeekSchedule(BaseModel):
     week_start: date
     days: list[WeekScheduleDay]
+
+
+class SessionImportResponse(BaseModel):
+    received: int
+    imported: int
+    skipped: int
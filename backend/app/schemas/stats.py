@@ -35,3 +35,18 @@ class WeekStatsDay(BaseModel):
 class WeekStatsResponse(BaseModel):
     week_start: date
     daily: list[WeekStatsDay]
+
+
+class TimerAverage(BaseModel):
+    timer_id: UUID
+    avg_seconds_per_day: int
+
+
+class AverageWindow(BaseModel):
+    days: int
+    averages: list[TimerAverage]
+
+
+class AverageWindowsResponse(BaseModel):
+    end_date: date
+    windows: list[AverageWindow]
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from typing import Literal
+from uuid import UUID
+
+from pydantic import AwareDatetime, BaseModel, model_validator
+
+from app.schemas.session import SessionOut
+
+SyncStatus = Literal["applied", "ignored", "rejected"]
+
+
+class SyncEventIn(BaseModel):
+    id: UUID
+    type: Literal["start", "stop", "adjust"]
+    occurred_at_client: AwareDatetime
+    timer_id: UUID | None = None
+    client_tz: str | None = None
+    session_id: UUID | None = None
+    adjustment_seconds: int = 0
+
+    @model_validator(mode="after")
+    def _check_event_fields(self) -> SyncEventIn:
+        if self.type == "start" and (self.timer_id is None or not self.client_tz):
+            raise ValueError("start events need timer_id and client_tz")
+        if self.type == "adjust" and self.session_id is None:
+            raise ValueError("adjust events need session_id")
+        return self
+
+
+class SyncRequest(BaseModel):
+    events: list[SyncEventIn]
+
+
+class SyncEventResult(BaseModel):
+    id: UUID
+    status: SyncStatus
+    detail: str | None = None
+
+
+class SyncResponse(BaseModel):
+    results: list[SyncEventResult]
+    active_session: SessionOut | None
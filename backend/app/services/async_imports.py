@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from itertools import islice
+from typing import Any, Iterator
+
+from anyio import to_thread
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services import imports as imports_service
+from app.services.imports import (
+    COPY_STAGING_SQL,
+    CREATE_STAGING_SQL,
+    CountingRows,
+    ImportFormat,
+    ImportResult,
+)
+
+# Rows parsed per worker-thread hop; parsing stays off the event loop.
+PARSE_BATCH_SIZE = 1000
+
+
+def _next_batch(rows: Iterator[tuple[Any, ...]]) -> list[tuple[Any, ...]]:
+    return list(islice(rows, PARSE_BATCH_SIZE))
+
+
+async def import_sessions(
+    db: AsyncSession, username: str, body: bytes, fmt: ImportFormat
+) -> ImportResult:
+    timer_ids = await db.run_sync(imports_service.user_timer_ids, username)
+    rows = CountingRows(
+        imports_service.prepare_rows(
+            imports_service.read_records(body, fmt), timer_ids
+        )
+    )
+    parsed = iter(rows)
+    async with db.begin_nested():
+        connection = await db.connection()
+        raw = (await connection.get_raw_connection()).driver_connection
+        async with raw.cursor() as cursor:
+            await cursor.execute(CREATE_STAGING_SQL)
+            async with cursor.copy(COPY_STAGING_SQL) as copy:
+                while batch := await to_thread.run_sync(_next_batch, parsed):
+                    for row in batch:
+                        await copy.write_row(row)
+        return await db.run_sync(
+            imports_service.merge_staged_sessions, username, rows.count
+        )
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from sqlalchemy import Row, exists, or_, select, text
+from sqlalchemy.orm import Session
+
+from app.models.cycle_total_entry import CycleTotalEntry
+from app.models.session import Session as SessionModel
+from app.models.timer import Timer
+from app.models.user import User
+from app.services.sessions import SESSION_ROW_COLUMNS
+
+# Every transaction below xmin has finished, so no row stamped with a lower
+# id can still appear; rows at or above it are sent again until it passes them.
+HIGH_WATER_SQL = text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+
+
+@dataclass
+class ChangeSet:
+    next_seq: int
+    reset: bool = False
+    timers: list[Timer] = field(default_factory=list)
+    sessions: list[Row] = field(default_factory=list)
+
+
+def high_water(db: Session) -> int:
+    return db.execute(HIGH_WATER_SQL).scalar_one()
+
+
+def changed_timers(db: Session, username: str, since: int) -> list[Timer]:
+    # Closing a session or resetting totals changes cycle_total_seconds without
+    # writing the timer row, so ledger entries and resets count as changes too.
+    ledger_changed = exists().where(
+        CycleTotalEntry.timer_id == Timer.id, CycleTotalEntry.change_seq >= since
+    )
+    reset_seq = (
+        select(User.cycle_epoch_seq)
+        .where(User.username == username)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(Timer)
+        .where(
+            Timer.username == username,
+            or_(Timer.change_seq >= since, ledger_changed, reset_seq >= since),
+        )
+        .order_by(Timer.created_at.asc())
+    )
+    return list(db.execute(stmt).scalars().all())
+
+
+def changed_session_rows(
+    db: Session, username: str, since: int, limit: int
+) -> list[Row]:
+    stmt = (
+        select(*SESSION_ROW_COLUMNS)
+        .where(SessionModel.username == username, SessionModel.change_seq >= since)
+        .order_by(SessionModel.change_seq.asc(), SessionModel.id.asc())
+        .limit(limit)
+    )
+    return list(db.execute(stmt).all())
+
+
+def changes_since(db: Session, username: str, since: int, limit: int) -> ChangeSet:
+    # Read the mark first: anything committed after it is picked up next time.
+    changes = ChangeSet(next_seq=high_water(db))
+    sessions = changed_session_rows(db, username, since, limit + 1)
+    if len(sessions) > limit:
+        changes.reset = True
+        return changes
+    changes.sessions = sessions
+    changes.timers = changed_timers(db, username, since)
+    return changes
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.models.session import Session as SessionModel
+from app.models.timer import Timer
+from app.services import sessions as sessions_service
+from app.services import stats as stats_service
+from app.services import timers as timers_service
+
+
+@dataclass
+class Dashboard:
+    timers: list[Timer]
+    active_session: SessionModel | None
+    day_totals: list[tuple[UUID, int]]
+    week_totals: list[tuple[date, list[tuple[UUID, int]]]]
+    average_windows: list[tuple[int, list[tuple[UUID, int]]]]
+    day_sessions: list[SessionModel]
+
+
+def load_dashboard(
+    db: Session,
+    username: str,
+    day_date: date,
+    week_start: date,
+    windows: list[int],
+    end_date: date,
+) -> Dashboard:
+    return Dashboard(
+        timers=timers_service.list_timers(db, username, include_archived=False),
+        active_session=sessions_service.get_active_session(db, username),
+        day_totals=stats_service.compute_day_totals(db, username, day_date),
+        week_totals=stats_service.compute_week_totals(db, username, week_start),
+        average_windows=stats_service.compute_average_windows(
+            db, username, windows, end_date
+        ),
+        day_sessions=sessions_service.list_sessions(db, username, day_date, day_date),
+    )
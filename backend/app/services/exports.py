@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any, Iterator, Literal
+from uuid import UUID
+
+from sqlalchemy import Row, Select, select
+from sqlalchemy.orm import Session
+
+from app.db import begin_snapshot
+from app.models.day_summary import DaySummary
+from app.models.session import Session as SessionModel
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FLUSH_BYTES = 64 * 1024
+
+CSV_COLUMNS = [
+    "type",
+    "id",
+    "timer_id",
+    "start_at",
+    "end_at",
+    "duration_seconds",
+    "client_tz",
+    "day_date",
+    "day_of_week",
+    "total_seconds",
+]
+
+
+def sessions_export_query(username: str) -> Select:
+    return (
+        select(
+            SessionModel.id,
+            SessionModel.timer_id,
+            SessionModel.start_at,
+            SessionModel.end_at,
+            SessionModel.duration_seconds,
+            SessionModel.client_tz,
+            SessionModel.day_date,
+            SessionModel.day_of_week,
+        )
+        .where(SessionModel.username == username)
+        .order_by(SessionModel.start_at.asc(), SessionModel.id.asc())
+    )
+
+
+def day_summaries_export_query(username: str) -> Select:
+    return (
+        select(DaySummary.day_date, DaySummary.timer_id, DaySummary.total_seconds)
+        .where(DaySummary.username == username)
+        .order_by(DaySummary.day_date.asc(), DaySummary.timer_id.asc())
+    )
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class ExportEncoder:
+    def __init__(self, fmt: ExportFormat, compress: bool = False) -> None:
+        self.fmt = fmt
+        self._buffer = io.StringIO()
+        self._csv = csv.DictWriter(
+            self._buffer, fieldnames=CSV_COLUMNS, lineterminator="\n"
+        )
+        self._compressor = (
+            zlib.compressobj(wbits=zlib.MAX_WBITS | 16) if compress else None
+        )
+        if fmt == "csv":
+            self._csv.writeheader()
+
+    def write(self, kind: str, row: Row) -> bytes:
+        record: dict[str, Any] = {"type": kind}
+        record.update((key, _plain(value)) for key, value in row._mapping.items())
+        if self.fmt == "csv":
+            self._csv.writerow(record)
+        else:
+            self._buffer.write(json.dumps(record, separators=(",", ":")))
+            self._buffer.write("\n")
+        if self._buffer.tell() < EXPORT_FLUSH_BYTES:
+            return b""
+        return self._drain()
+
+    def finish(self) -> bytes:
+        chunk = self._drain()
+        if self._compressor is not None:
+            chunk += self._compressor.flush()
+        return chunk
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        if self._compressor is not None:
+            return self._compressor.compress(data)
+        return data
+
+
+def export_statements(username: str) -> list[tuple[str, Select]]:
+    return [
+        ("session", sessions_export_query(username)),
+        ("day_summary", day_summaries_export_query(username)),
+    ]
+
+
+def iter_export(
+    db: Session,
+    username: str,
+    fmt: ExportFormat,
+    compress: bool = False,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    # Sessions and day summaries are read in one snapshot so a stop that
+    # commits between the two statements cannot skew the export.
+    begin_snapshot(db)
+    encoder = ExportEncoder(fmt, compress)
+    for kind, stmt in export_statements(username):
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        for row in result:
+            chunk = encoder.write(kind, row)
+            if chunk:
+                yield chunk
+    yield encoder.finish()
+
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app import invalidation
+from app.services.sessions import _CLOSE_CTES
+
+CHUNK_BOUND_SQL = text(
+    """
+    SELECT max(username) AS through, count(*) AS users
+    FROM (
+        SELECT username FROM users
+        WHERE username > :after
+        ORDER BY username
+        LIMIT :chunk_size
+    ) AS chunk
+    """
+)
+
+# Sessions still open from :day_date or earlier are closed at their own local
+# midnight once that has passed, with the same bookkeeping as a manual stop.
+CLOSE_STALE_SQL = text(
+    f"""
+WITH active AS (
+    SELECT sessions.id, sessions.day_date, sessions.start_at, sessions.client_tz
+    FROM active_sessions
+    JOIN sessions
+      ON sessions.id = active_sessions.session_id
+     AND sessions.day_date = active_sessions.day_date
+    WHERE active_sessions.username > :after
+      AND active_sessions.username <= :through
+      AND active_sessions.day_date <= :day_date
+      AND sessions.end_at IS NULL
+    FOR UPDATE OF sessions
+),
+ending AS (
+    SELECT id, day_date,
+           GREATEST(start_at, local_midnight - interval '1 millisecond') AS end_at
+    FROM active,
+         LATERAL (
+             SELECT CAST(day_date + 1 AS timestamp) AT TIME ZONE client_tz
+                 AS local_midnight
+         ) AS midnight
+    WHERE local_midnight <= CAST(:now AS timestamptz)
+),
+{_CLOSE_CTES},
+version AS (
+    UPDATE users SET data_version = data_version + 1
+    WHERE username IN (SELECT username FROM closed)
+)
+SELECT username FROM closed
+"""
+)
+
+SUMMARIZE_DAY_SQL = text(
+    """
+WITH totals AS (
+    INSERT INTO day_summaries (id, username, day_date, timer_id, total_seconds)
+    SELECT gen_random_uuid(), username, day_date, timer_id,
+           COALESCE(SUM(duration_seconds), 0)
+    FROM sessions
+    WHERE username > :after
+      AND username <= :through
+      AND day_date = :day_date
+      AND end_at IS NOT NULL
+    GROUP BY username, day_date, timer_id
+    ON CONFLICT (username, day_date, timer_id)
+    DO UPDATE SET total_seconds = EXCLUDED.total_seconds
+    WHERE day_summaries.total_seconds IS DISTINCT FROM EXCLUDED.total_seconds
+    RETURNING username
+),
+finalized AS (
+    UPDATE users
+    SET finalized_through = GREATEST(finalized_through, CAST(:day_date AS date)),
+        data_version = data_version + CASE
+            WHEN username IN (SELECT username FROM totals) THEN 1 ELSE 0
+        END
+    WHERE username > :after AND username <= :through
+)
+SELECT DISTINCT username FROM totals
+"""
+)
+
+
+@dataclass
+class FinalizeResult:
+    users: int = 0
+    closed_sessions: int = 0
+    summarized_users: int = 0
+
+
+def finalize_chunk(
+    db: Session, day_date: date, after: str, through: str, now: datetime
+) -> tuple[set[str], set[str]]:
+    bounds = {"after": after, "through": through, "day_date": day_date}
+    closed = set(
+        db.execute(CLOSE_STALE_SQL, {**bounds, "now": now, "adjustment": 0}).scalars()
+    )
+    summarized = set(db.execute(SUMMARIZE_DAY_SQL, bounds).scalars())
+    for username in closed | summarized:
+        invalidation.publish(db, username, "sessions")
+    return closed, summarized
+
+
+def finalize_day(
+    db: Session,
+    day_date: date,
+    chunk_size: int = 5000,
+    now: datetime | None = None,
+) -> FinalizeResult:
+    now = now or datetime.now(timezone.utc)
+    result = FinalizeResult()
+    after = ""
+    while True:
+        chunk = db.execute(
+            CHUNK_BOUND_SQL, {"after": after, "chunk_size": chunk_size}
+        ).one()
+        if chunk.through is None:
+            return result
+        closed, summarized = finalize_chunk(db, day_date, after, chunk.through, now)
+        db.commit()
+        result.users += chunk.users
+        result.closed_sessions += len(closed)
+        result.summarized_users += len(summarized)
+        after = chunk.through
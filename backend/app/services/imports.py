@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Literal
+from uuid import UUID
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app import invalidation, memo
+from app.models.timer import Timer
+from app.services.sessions import _get_timezone
+from app.services.versions import bump_data_version
+
+ImportFormat = Literal["ndjson", "csv"]
+
+STAGING_TABLE = "session_import"
+CREATE_STAGING_SQL = f"""
+CREATE TEMP TABLE {STAGING_TABLE} (
+    id uuid NOT NULL,
+    timer_id uuid NOT NULL,
+    start_at timestamptz NOT NULL,
+    end_at timestamptz NOT NULL,
+    duration_seconds integer NOT NULL,
+    client_tz text NOT NULL,
+    day_date date NOT NULL,
+    day_of_week smallint NOT NULL
+) ON COMMIT DROP
+"""
+COPY_STAGING_SQL = (
+    f"COPY {STAGING_TABLE} (id, timer_id, start_at, end_at, duration_seconds, "
+    "client_tz, day_date, day_of_week) FROM STDIN"
+)
+
+# Session ids are unique across days, so a re-import whose day_date moved is
+# still skipped. Imported history only adds to the cycle total when it started
+# inside the user's current cycle.
+MERGE_SESSIONS_SQL = text(
+    f"""
+    WITH staged AS (
+        SELECT DISTINCT ON (id) *
+        FROM {STAGING_TABLE}
+        ORDER BY id
+    ),
+    inserted AS (
+        INSERT INTO sessions (
+            id, username, timer_id, start_at, end_at, duration_seconds,
+            client_tz, day_date, day_of_week
+        )
+        SELECT id, :username, timer_id, start_at, end_at, duration_seconds,
+               client_tz, day_date, day_of_week
+        FROM staged
+        WHERE NOT EXISTS (SELECT 1 FROM sessions WHERE sessions.id = staged.id)
+        ON CONFLICT (id, day_date) DO NOTHING
+        RETURNING timer_id, start_at, duration_seconds
+    ),
+    timer_totals AS (
+        SELECT inserted.timer_id, users.cycle_epoch,
+               SUM(inserted.duration_seconds) AS total_seconds
+        FROM inserted
+        JOIN users ON users.username = :username
+        WHERE users.cycle_started_at IS NULL
+           OR inserted.start_at >= users.cycle_started_at
+        GROUP BY inserted.timer_id, users.cycle_epoch
+    ),
+    ledger AS (
+        INSERT INTO cycle_total_entries (timer_id, epoch, seconds)
+        SELECT timer_id, cycle_epoch, total_seconds
+        FROM timer_totals
+        WHERE total_seconds > 0
+    )
+    SELECT COUNT(*) FROM inserted
+    """
+)
+
+REBUILD_DAY_SUMMARIES_SQL = text(
+    f"""
+    INSERT INTO day_summaries (id, username, day_date, timer_id, total_seconds)
+    SELECT gen_random_uuid(), username, day_date, timer_id,
+           COALESCE(SUM(duration_seconds), 0)
+    FROM sessions
+    WHERE username = :username
+      AND end_at IS NOT NULL
+      AND day_date IN (SELECT DISTINCT day_date FROM {STAGING_TABLE})
+    GROUP BY username, day_date, timer_id
+    ON CONFLICT (username, day_date, timer_id)
+    DO UPDATE SET total_seconds = EXCLUDED.total_seconds
+    """
+)
+
+
+class InvalidImportRow(ValueError):
+    def __init__(self, code: str, line: int) -> None:
+        super().__init__(code)
+        self.code = code
+        self.line = line
+
+
+@dataclass(frozen=True)
+class ImportResult:
+    received: int
+    imported: int
+
+    @property
+    def skipped(self) -> int:
+        return self.received - self.imported
+
+
+def read_records(
+    body: bytes, fmt: ImportFormat
+) -> Iterator[tuple[int, dict[str, Any]]]:
+    try:
+        content = body.decode("utf-8-sig")
+    except UnicodeDecodeError as exc:
+        raise InvalidImportRow("invalid_encoding", 0) from exc
+
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(content, newline=""))
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(content.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            raise InvalidImportRow("invalid_row", line_number) from exc
+        if not isinstance(record, dict):
+            raise InvalidImportRow("invalid_row", line_number)
+        yield line_number, record
+
+
+def _parse_uuid(value: Any, code: str, line: int) -> UUID:
+    try:
+        return UUID(str(value))
+    except ValueError as exc:
+        raise InvalidImportRow(code, line) from exc
+
+
+def _parse_datetime(value: Any, line: int) -> datetime:
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError as exc:
+        raise InvalidImportRow("invalid_datetime", line) from exc
+    if parsed.tzinfo is None:
+        raise InvalidImportRow("invalid_datetime", line)
+    return parsed
+
+
+def prepare_rows(
+    records: Iterable[tuple[int, dict[str, Any]]], timer_ids: set[UUID]
+) -> Iterator[tuple[Any, ...]]:
+    zones: dict[str, Any] = {}
+    for line, record in records:
+        timer_id = _parse_uuid(record.get("timer_id"), "timer_not_found", line)
+        if timer_id not in timer_ids:
+            raise InvalidImportRow("timer_not_found", line)
+
+        client_tz = record.get("client_tz") or ""
+        tz = zones.get(client_tz)
+        if tz is None:
+            try:
+                tz = zones[client_tz] = _get_timezone(client_tz)
+            except ValueError as exc:
+                raise InvalidImportRow("invalid_timezone", line) from exc
+
+        start_at = _parse_datetime(record.get("start_at"), line)
+        end_at = _parse_datetime(record.get("end_at"), line)
+        if end_at < start_at:
+            raise InvalidImportRow("invalid_time_range", line)
+
+        duration = record.get("duration_seconds")
+        if duration in (None, ""):
+            duration_seconds = int((end_at - start_at).total_seconds())
+        else:
+            try:
+                duration_seconds = int(duration)
+            except (TypeError, ValueError) as exc:
+                raise InvalidImportRow("invalid_duration", line) from exc
+            if duration_seconds < 0:
+                raise InvalidImportRow("invalid_duration", line)
+
+        session_id = record.get("id")
+        local_start = start_at.astimezone(tz)
+        yield (
+            _parse_uuid(session_id, "invalid_row", line) if session_id else uuid.uuid4(),
+            timer_id,
+            start_at,
+            end_at,
+            duration_seconds,
+            client_tz,
+            local_start.date(),
+            local_start.weekday(),
+        )
+
+
+class CountingRows:
+    def __init__(self, rows: Iterator[tuple[Any, ...]]) -> None:
+        self.rows = rows
+        self.count = 0
+
+    def __iter__(self) -> Iterator[tuple[Any, ...]]:
+        for row in self.rows:
+            self.count += 1
+            yield row
+
+
+def user_timer_ids(db: Session, username: str) -> set[UUID]:
+    return set(
+        db.execute(select(Timer.id).where(Timer.username == username)).scalars()
+    )
+
+
+def merge_staged_sessions(db: Session, username: str, received: int) -> ImportResult:
+    imported = db.execute(MERGE_SESSIONS_SQL, {"username": username}).scalar_one()
+    db.execute(REBUILD_DAY_SUMMARIES_SQL, {"username": username})
+    db.execute(text(f"DROP TABLE {STAGING_TABLE}"))
+    if imported:
+        bump_data_version(db, username)
+        invalidation.publish(db, username, "sessions")
+        memo.invalidate_user(db, username)
+    return ImportResult(received=received, imported=int(imported))
+
+
+def import_sessions(
+    db: Session, username: str, body: bytes, fmt: ImportFormat
+) -> ImportResult:
+    rows = CountingRows(
+        prepare_rows(read_records(body, fmt), user_timer_ids(db, username))
+    )
+    with db.begin_nested():
+        raw = db.connection().connection.driver_connection
+        with raw.cursor() as cursor:
+            cursor.execute(CREATE_STAGING_SQL)
+            with cursor.copy(COPY_STAGING_SQL) as copy:
+                for row in rows:
+                    copy.write_row(row)
+        return merge_staged_sessions(db, username, rows.count)
+
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import re
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.session import DEFAULT_PARTITION
+
+PARTITION_PATTERN = re.compile(r"^sessions_p(\d{4})_(\d{2})$")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"sessions_p{month:%Y_%m}"
+
+
+def list_partitions(db: Session) -> list[tuple[str, date]]:
+    names = db.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = 'sessions'::regclass
+            """
+        )
+    ).scalars()
+    partitions = []
+    for name in names:
+        match = PARTITION_PATTERN.match(name)
+        if match:
+            partitions.append((name, date(int(match[1]), int(match[2]), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def create_partition(db: Session, month: date) -> bool:
+    month = month_start(month)
+    name = partition_name(month)
+    if any(existing == name for existing, _ in list_partitions(db)):
+        return False
+
+    bounds = {"lower": month, "upper": add_months(month, 1)}
+    db.execute(
+        text(
+            f"CREATE TABLE {name} "
+            "(LIKE sessions INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+    )
+    db.execute(
+        text(
+            f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE day_date >= :lower AND day_date < :upper
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+            """
+        ),
+        bounds,
+    )
+    db.execute(
+        text(
+            f"ALTER TABLE sessions ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{bounds['lower']}') TO ('{bounds['upper']}')"
+        )
+    )
+    db.execute(
+        text(
+            f"""
+            INSERT INTO active_sessions (username, session_id, day_date)
+            SELECT username, id, day_date FROM {name} WHERE end_at IS NULL
+            ON CONFLICT (username) DO NOTHING
+            """
+        )
+    )
+    return True
+
+
+def ensure_partitions(db: Session, first_month: date, last_month: date) -> list[str]:
+    created = []
+    month = month_start(first_month)
+    while month <= last_month:
+        if create_partition(db, month):
+            created.append(partition_name(month))
+        month = add_months(month, 1)
+    return created
+
+
+def detach_partitions(db: Session, before: date, drop: bool = False) -> list[str]:
+    detached = []
+    for name, month in list_partitions(db):
+        if month >= month_start(before):
+            continue
+        has_active = db.execute(
+            text(f"SELECT EXISTS (SELECT 1 FROM {name} WHERE end_at IS NULL)")
+        ).scalar_one()
+        if has_active:
+            raise ValueError(f"active_session_in_partition:{name}")
+        db.execute(text(f"ALTER TABLE sessions DETACH PARTITION {name}"))
+        if drop:
+            db.execute(text(f"DROP TABLE {name}"))
+        detached.append(name)
+    return detached
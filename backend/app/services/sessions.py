@@ -1,25 +1,195 @@
 from __future__ import annotations
 
+import uuid
 from datetime import date, datetime, time, timedelta, timezone
-from typing import Tuple
+from typing import Iterator, Tuple
 from uuid import UUID
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import select
+from sqlalchemy import Row, Select, and_, func, select, text, tuple_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app import memo
+from app.events import mark_active_session_changed
+from app.models.active_session import ActiveSession
 from app.models.session import Session as SessionModel
 from app.models.timer import Timer
 
-
-def _increment_cycle_total(db: Session, timer_id: UUID, delta_seconds: int) -> None:
-    if delta_seconds <= 0:
-        return
-    timer = db.get(Timer, timer_id)
-    if timer is None:
-        return
-    timer.cycle_total_seconds += delta_seconds
+SESSION_ROW_COLUMNS = (
+    SessionModel.id,
+    SessionModel.timer_id,
+    SessionModel.start_at,
+    SessionModel.end_at,
+    SessionModel.duration_seconds,
+    SessionModel.client_tz,
+    SessionModel.day_date,
+    SessionModel.day_of_week,
+)
+
+SESSION_COLUMNS_SQL = (
+    "id, username, timer_id, start_at, end_at, duration_seconds, "
+    "client_tz, day_date, day_of_week, created_at"
+)
+
+# Locks the running session through the active_sessions row so a concurrent
+# transition that already closed it sees no active session.
+_ACTIVE_CTE = """
+active AS (
+    SELECT sessions.id, sessions.day_date, sessions.timer_id, sessions.start_at
+    FROM active_sessions
+    JOIN sessions
+      ON sessions.id = active_sessions.session_id
+     AND sessions.day_date = active_sessions.day_date
+    WHERE active_sessions.username = :username
+      AND sessions.end_at IS NULL
+    FOR UPDATE
+)"""
+
+_CLOSE_CTES = """
+closed AS (
+    UPDATE sessions
+    SET end_at = ending.end_at,
+        duration_seconds = GREATEST(
+            0,
+            floor(extract(epoch FROM ending.end_at - sessions.start_at))::int
+                + :adjustment
+        )
+    FROM ending
+    WHERE sessions.id = ending.id AND sessions.day_date = ending.day_date
+    RETURNING sessions.*
+),
+cycle_totals AS (
+    INSERT INTO cycle_total_entries (timer_id, epoch, seconds)
+    SELECT closed.timer_id, users.cycle_epoch, closed.duration_seconds
+    FROM closed
+    JOIN users ON users.username = closed.username
+    WHERE closed.duration_seconds > 0
+),
+day_totals AS (
+    INSERT INTO day_summaries (id, username, day_date, timer_id, total_seconds)
+    SELECT gen_random_uuid(), username, day_date, timer_id, duration_seconds
+    FROM closed
+    ON CONFLICT (username, day_date, timer_id)
+    DO UPDATE SET total_seconds = day_summaries.total_seconds + EXCLUDED.total_seconds
+)"""
+
+_STOP_SQL = f"""
+WITH {_ACTIVE_CTE},
+ending AS (
+    SELECT id, day_date, {{end_at}} AS end_at FROM active
+),
+{_CLOSE_CTES},
+version AS (
+    UPDATE users SET data_version = data_version + 1
+    WHERE username = :username AND EXISTS (SELECT 1 FROM closed)
+)
+SELECT {SESSION_COLUMNS_SQL} FROM closed
+"""
+
+STOP_ACTIVE_SQL = text(_STOP_SQL.format(end_at="CAST(:now AS timestamptz)"))
+
+STOP_ACTIVE_FOR_DAY_SQL = text(
+    _STOP_SQL.format(
+        end_at="""CASE
+            WHEN active.day_date = CAST(:day_date AS date)
+                THEN CAST(:now AS timestamptz)
+            ELSE GREATEST(active.start_at, CAST(:previous_day_end AS timestamptz))
+        END"""
+    )
+)
+
+# The insert waits on count(*) over closed so the trigger events that release
+# the old active_sessions row are queued ahead of the one claiming it.
+START_TIMER_SQL = text(
+    f"""
+WITH timer AS (
+    SELECT id FROM timers WHERE id = :timer_id AND username = :username
+),
+{_ACTIVE_CTE},
+ending AS (
+    SELECT id, day_date, CAST(:now AS timestamptz) AS end_at
+    FROM active
+    WHERE active.timer_id <> :timer_id AND EXISTS (SELECT 1 FROM timer)
+),
+{_CLOSE_CTES},
+started AS (
+    INSERT INTO sessions (
+        id, username, timer_id, start_at, client_tz, day_date, day_of_week
+    )
+    SELECT :session_id, :username, timer.id, :now, :client_tz, :day_date,
+           :day_of_week
+    FROM timer
+    WHERE NOT EXISTS (SELECT 1 FROM active WHERE active.timer_id = timer.id)
+      AND (SELECT count(*) FROM closed) >= 0
+    RETURNING sessions.*
+),
+version AS (
+    UPDATE users SET data_version = data_version + 1
+    WHERE username = :username AND EXISTS (SELECT 1 FROM started)
+),
+unchanged AS (
+    SELECT sessions.*
+    FROM sessions
+    JOIN active ON sessions.id = active.id AND sessions.day_date = active.day_date
+    WHERE active.timer_id = :timer_id AND EXISTS (SELECT 1 FROM timer)
+)
+SELECT {SESSION_COLUMNS_SQL} FROM closed
+UNION ALL
+SELECT {SESSION_COLUMNS_SQL} FROM started
+UNION ALL
+SELECT {SESSION_COLUMNS_SQL} FROM unchanged
+"""
+)
+
+
+# Applies the end-day rules with each session's own local "today": a session
+# from an earlier local day ends just before today's local midnight, one from
+# today (only picked once it exceeds the age limit) ends now.
+REAP_ABANDONED_SQL = text(
+    f"""
+WITH active AS (
+    SELECT sessions.id, sessions.day_date, sessions.start_at, sessions.client_tz,
+           local.today
+    FROM active_sessions
+    JOIN sessions
+      ON sessions.id = active_sessions.session_id
+     AND sessions.day_date = active_sessions.day_date
+    CROSS JOIN LATERAL (
+        SELECT CAST(
+            CAST(:now AS timestamptz) AT TIME ZONE sessions.client_tz AS date
+        ) AS today
+    ) AS local
+    WHERE sessions.end_at IS NULL
+      AND (
+          sessions.day_date < local.today
+          OR sessions.start_at < CAST(:now AS timestamptz)
+              - CAST(:max_age_seconds AS double precision) * interval '1 second'
+      )
+    ORDER BY sessions.start_at
+    LIMIT :batch_size
+    FOR UPDATE OF sessions SKIP LOCKED
+),
+ending AS (
+    SELECT id, day_date,
+           CASE
+               WHEN day_date = today THEN CAST(:now AS timestamptz)
+               ELSE GREATEST(
+                   start_at,
+                   (CAST(today AS timestamp) AT TIME ZONE client_tz)
+                       - interval '1 millisecond'
+               )
+           END AS end_at
+    FROM active
+),
+{_CLOSE_CTES},
+version AS (
+    UPDATE users SET data_version = data_version + 1
+    WHERE username IN (SELECT username FROM closed)
+)
+SELECT username, day_date FROM closed
+"""
+)
 
 
 def _get_timezone(client_tz: str) -> ZoneInfo:
@@ -43,79 +213,106 @@ def _end_of_day_utc(day_date: date, tz: ZoneInfo) -> datetime:
     return local_end.astimezone(timezone.utc)
 
 
-def get_active_session(db: Session, username: str) -> SessionModel | None:
+def _active_session_query(username: str) -> Select[tuple[SessionModel]]:
     return (
-        db.execute(
-            select(SessionModel).where(
-                SessionModel.username == username,
-                SessionModel.end_at.is_(None),
-            )
+        select(SessionModel)
+        .join(
+            ActiveSession,
+            and_(
+                ActiveSession.session_id == SessionModel.id,
+                ActiveSession.day_date == SessionModel.day_date,
+            ),
         )
-        .scalars()
-        .first()
+        .where(ActiveSession.username == username)
     )
 
 
-def start_timer(
+def get_active_session(db: Session, username: str) -> SessionModel | None:
+    return db.execute(_active_session_query(username)).scalars().first()
+
+
+def lock_active_session(db: Session, username: str) -> SessionModel | None:
+    stmt = _active_session_query(username).with_for_update()
+    return db.execute(stmt).scalars().first()
+
+
+def latest_transition_at(db: Session, username: str) -> datetime | None:
+    stmt = (
+        select(func.coalesce(SessionModel.end_at, SessionModel.start_at))
+        .where(SessionModel.username == username)
+        .order_by(SessionModel.start_at.desc())
+        .limit(1)
+    )
+    return db.execute(stmt).scalar()
+
+
+def _run_transition(db: Session, statement, params: dict) -> list[SessionModel]:
+    stmt = (
+        select(SessionModel)
+        .from_statement(statement)
+        .execution_options(populate_existing=True)
+    )
+    sessions = list(db.execute(stmt, params).scalars())
+    if any(session.end_at is not None for session in sessions):
+        # The closed session added a ledger entry; drop loaded cycle totals.
+        for instance in list(db.identity_map.values()):
+            if isinstance(instance, Timer):
+                db.expire(instance, ["cycle_total_seconds"])
+    return sessions
+
+
+def start_timer_at(
     db: Session,
     username: str,
     timer_id: UUID,
     client_tz: str,
+    at: datetime,
+    session_id: UUID,
     stopped_adjustment_seconds: int | None = None,
 ) -> Tuple[SessionModel | None, SessionModel]:
-    timer = db.get(Timer, timer_id)
-    if timer is None or timer.username != username:
-        raise LookupError("timer_not_found")
+    day_date, day_of_week = _derive_day(client_tz, at)
+    sessions = _run_transition(
+        db,
+        START_TIMER_SQL,
+        {
+            "username": username,
+            "timer_id": timer_id,
+            "session_id": session_id,
+            "now": at,
+            "client_tz": client_tz,
+            "day_date": day_date,
+            "day_of_week": day_of_week,
+            "adjustment": stopped_adjustment_seconds or 0,
+        },
+    )
 
-    now = datetime.now(timezone.utc)
-    day_date, day_of_week = _derive_day(client_tz, now)
+    stopped_session = next((s for s in sessions if s.end_at is not None), None)
+    active_session = next((s for s in sessions if s.end_at is None), None)
+    if active_session is None:
+        raise LookupError("timer_not_found")
+    if active_session.id == session_id:
+        mark_active_session_changed(db, username)
+        memo.invalidate_days(db, username, [s.day_date for s in sessions])
+    return stopped_session, active_session
 
-    stopped_session: SessionModel | None = None
 
+def start_timer(
+    db: Session,
+    username: str,
+    timer_id: UUID,
+    client_tz: str,
+    stopped_adjustment_seconds: int | None = None,
+) -> Tuple[SessionModel | None, SessionModel]:
     try:
-        with db.begin_nested():
-            active = (
-                db.execute(
-                    select(SessionModel)
-                    .where(
-                        SessionModel.username == username,
-                        SessionModel.end_at.is_(None),
-                    )
-                    .with_for_update()
-                )
-                .scalars()
-                .first()
-            )
-
-            if active and active.timer_id == timer_id:
-                return None, active
-
-            if active is not None:
-                active.end_at = now
-                base_duration = int((active.end_at - active.start_at).total_seconds())
-                adjustment = stopped_adjustment_seconds or 0
-                active.duration_seconds = max(0, base_duration + adjustment)
-                stopped_session = active
-                _increment_cycle_total(
-                    db, active.timer_id, active.duration_seconds or 0
-                )
-
-            new_session = SessionModel(
-                username=username,
-                timer_id=timer_id,
-                start_at=now,
-                end_at=None,
-                duration_seconds=None,
-                client_tz=client_tz,
-                day_date=day_date,
-                day_of_week=day_of_week,
-            )
-            db.add(new_session)
-
-        db.refresh(new_session)
-        if stopped_session is not None:
-            db.refresh(stopped_session)
-        return stopped_session, new_session
+        return start_timer_at(
+            db,
+            username,
+            timer_id,
+            client_tz,
+            datetime.now(timezone.utc),
+            uuid.uuid4(),
+            stopped_adjustment_seconds,
+        )
     except IntegrityError:
         db.rollback()
         active = get_active_session(db, username)
@@ -125,44 +322,36 @@ def start_timer(
 
 
 def stop_active_session(
-    db: Session, username: str, adjustment_seconds: int | None = None
+    db: Session,
+    username: str,
+    adjustment_seconds: int | None = None,
+    at: datetime | None = None,
 ) -> SessionModel | None:
-    now = datetime.now(timezone.utc)
-
-    with db.begin_nested():
-        active = (
-            db.execute(
-                select(SessionModel)
-                .where(
-                    SessionModel.username == username,
-                    SessionModel.end_at.is_(None),
-                )
-                .with_for_update()
-            )
-            .scalars()
-            .first()
-        )
-
-        if active is None:
-            return None
-
-        active.end_at = now
-        base_duration = int((active.end_at - active.start_at).total_seconds())
-        adjustment = adjustment_seconds or 0
-        active.duration_seconds = max(0, base_duration + adjustment)
-        _increment_cycle_total(db, active.timer_id, active.duration_seconds or 0)
+    sessions = _run_transition(
+        db,
+        STOP_ACTIVE_SQL,
+        {
+            "username": username,
+            "now": at or datetime.now(timezone.utc),
+            "adjustment": adjustment_seconds or 0,
+        },
+    )
+    if not sessions:
+        return None
 
-    db.refresh(active)
-    return active
+    mark_active_session_changed(db, username)
+    memo.invalidate_days(db, username, [sessions[0].day_date])
+    return sessions[0]
 
 
-def list_sessions(
-    db: Session,
+def sessions_query(
     username: str,
     start_date: date,
     end_date: date,
     timer_id: UUID | None = None,
-) -> list[SessionModel]:
+    after: tuple[datetime, UUID] | None = None,
+    limit: int | None = None,
+) -> Select[tuple[SessionModel]]:
     stmt = select(SessionModel).where(
         SessionModel.username == username,
         SessionModel.day_date >= start_date,
@@ -170,46 +359,96 @@ def list_sessions(
     )
     if timer_id is not None:
         stmt = stmt.where(SessionModel.timer_id == timer_id)
-    stmt = stmt.order_by(SessionModel.start_at.asc())
-    return list(db.execute(stmt).scalars().all())
+    if after is not None:
+        stmt = stmt.where(
+            tuple_(SessionModel.start_at, SessionModel.id) > tuple_(*after)
+        )
+    stmt = stmt.order_by(SessionModel.start_at.asc(), SessionModel.id.asc())
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
 
 
-def stop_active_session_for_day(
-    db: Session, username: str, client_tz: str, day_date: date
-) -> SessionModel | None:
-    tz = _get_timezone(client_tz)
-    now = datetime.now(timezone.utc)
-
-    with db.begin_nested():
-        active = (
-            db.execute(
-                select(SessionModel)
-                .where(
-                    SessionModel.username == username,
-                    SessionModel.end_at.is_(None),
-                )
-                .with_for_update()
-            )
-            .scalars()
-            .first()
-        )
+def list_sessions(
+    db: Session,
+    username: str,
+    start_date: date,
+    end_date: date,
+    timer_id: UUID | None = None,
+    after: tuple[datetime, UUID] | None = None,
+    limit: int | None = None,
+) -> list[SessionModel]:
+    stmt = sessions_query(username, start_date, end_date, timer_id, after, limit)
+    return list(db.execute(stmt).scalars().all())
 
-        if active is None:
-            return None
 
-        if active.day_date == day_date:
-            end_at = now
-        else:
-            previous_day = day_date - timedelta(days=1)
-            end_at = _end_of_day_utc(previous_day, tz)
-            if end_at < active.start_at:
-                end_at = active.start_at
+def list_session_rows(
+    db: Session,
+    username: str,
+    start_date: date,
+    end_date: date,
+    timer_id: UUID | None = None,
+    after: tuple[datetime, UUID] | None = None,
+    limit: int | None = None,
+) -> list[Row]:
+    stmt = sessions_query(username, start_date, end_date, timer_id, after, limit)
+    return list(db.execute(stmt.with_only_columns(*SESSION_ROW_COLUMNS)).all())
+
 
-        active.end_at = end_at
-        active.duration_seconds = max(
-            0, int((active.end_at - active.start_at).total_seconds())
+def iter_session_rows(
+    db: Session,
+    username: str,
+    start_date: date,
+    end_date: date,
+    timer_id: UUID | None = None,
+    after: tuple[datetime, UUID] | None = None,
+    batch_size: int = 1000,
+) -> Iterator[Row]:
+    stmt = sessions_query(username, start_date, end_date, timer_id, after)
+    result = db.execute(
+        stmt.with_only_columns(*SESSION_ROW_COLUMNS).execution_options(
+            yield_per=batch_size
         )
-        _increment_cycle_total(db, active.timer_id, active.duration_seconds or 0)
+    )
+    yield from result
 
-    db.refresh(active)
-    return active
+
+def stop_active_session_for_day(
+    db: Session, username: str, client_tz: str, day_date: date
+) -> SessionModel | None:
+    tz = _get_timezone(client_tz)
+    sessions = _run_transition(
+        db,
+        STOP_ACTIVE_FOR_DAY_SQL,
+        {
+            "username": username,
+            "now": datetime.now(timezone.utc),
+            "day_date": day_date,
+            "previous_day_end": _end_of_day_utc(day_date - timedelta(days=1), tz),
+            "adjustment": 0,
+        },
+    )
+    if not sessions:
+        return None
+
+    mark_active_session_changed(db, username)
+    memo.invalidate_days(db, username, [sessions[0].day_date])
+    return sessions[0]
+
+
+def reap_abandoned_sessions(
+    db: Session, now: datetime, max_age_seconds: float, batch_size: int
+) -> int:
+    rows = db.execute(
+        REAP_ABANDONED_SQL,
+        {
+            "now": now,
+            "max_age_seconds": max_age_seconds,
+            "batch_size": batch_size,
+            "adjustment": 0,
+        },
+    ).all()
+    for row in rows:
+        mark_active_session_changed(db, row.username)
+        memo.invalidate_days(db, row.username, [row.day_date])
+    return len(rows)
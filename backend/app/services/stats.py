@@ -1,21 +1,89 @@
 from __future__ import annotations
 
 import uuid
+from bisect import bisect_left, bisect_right
 from datetime import date, timedelta
 from typing import Iterable
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
+from app import invalidation, memo
+from app.cache import TTLCache
 from app.models.day_summary import DaySummary
 from app.models.session import Session as SessionModel
 from app.models.timer import Timer
+from app.models.user import User
+from app.services.versions import get_data_version
+from app.settings import get_settings
+
+settings = get_settings()
+
+
+class CumulativeTotals:
+    def __init__(
+        self,
+        version: int,
+        timer_ids: list[UUID],
+        rows: Iterable[tuple[UUID, date, int]],
+    ) -> None:
+        self.version = version
+        self.timer_ids = timer_ids
+        self._days: dict[UUID, list[date]] = {timer_id: [] for timer_id in timer_ids}
+        self._running: dict[UUID, list[int]] = {timer_id: [] for timer_id in timer_ids}
+        for timer_id, day_date, total_seconds in rows:
+            days = self._days.get(timer_id)
+            if days is None:
+                continue
+            running = self._running[timer_id]
+            days.append(day_date)
+            running.append((running[-1] if running else 0) + total_seconds)
+
+    def window_total(self, timer_id: UUID, start_date: date, end_date: date) -> int:
+        days = self._days.get(timer_id)
+        if not days:
+            return 0
+        running = self._running[timer_id]
+        upper = bisect_right(days, end_date)
+        lower = bisect_left(days, start_date)
+        if upper <= lower:
+            return 0
+        return running[upper - 1] - (running[lower - 1] if lower else 0)
+
+    def averages(self, end_date: date, days: int) -> list[tuple[UUID, int]]:
+        start_date = end_date - timedelta(days=days - 1)
+        return [
+            (timer_id, int(self.window_total(timer_id, start_date, end_date) / days))
+            for timer_id in self.timer_ids
+        ]
+
+
+cumulative_totals_cache: TTLCache[str, CumulativeTotals] = TTLCache(
+    maxsize=settings.averages_cache_size,
+    ttl_seconds=settings.averages_cache_ttl_seconds,
+)
+for _entity in ("sessions", "timers"):
+    invalidation.register(
+        _entity, cumulative_totals_cache.discard, cumulative_totals_cache.clear
+    )
 
 
 def compute_day_totals(
     db: Session, username: str, day_date: date
+) -> list[tuple[UUID, int]]:
+    stmt = select(DaySummary.timer_id, DaySummary.total_seconds).where(
+        DaySummary.username == username,
+        DaySummary.day_date == day_date,
+    )
+
+    rows = db.execute(stmt).all()
+    return [(row.timer_id, int(row.total_seconds)) for row in rows]
+
+
+def compute_session_day_totals(
+    db: Session, username: str, day_date: date
 ) -> list[tuple[UUID, int]]:
     stmt = (
         select(
@@ -48,21 +116,24 @@ def upsert_day_summaries(
         for timer_id, total_seconds in totals
     ]
 
-    if not rows:
-        return
-
-    stmt = insert(DaySummary).values(rows)
-    stmt = stmt.on_conflict_do_update(
-        index_elements=[
-            DaySummary.username,
-            DaySummary.day_date,
-            DaySummary.timer_id,
-        ],
-        set_={"total_seconds": stmt.excluded.total_seconds},
-    )
-
+    # Ending a day records it as finalized even when nothing was tracked.
+    user_values = {"finalized_through": func.greatest(User.finalized_through, day_date)}
     with db.begin_nested():
-        db.execute(stmt)
+        if rows:
+            stmt = insert(DaySummary).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[
+                    DaySummary.username,
+                    DaySummary.day_date,
+                    DaySummary.timer_id,
+                ],
+                set_={"total_seconds": stmt.excluded.total_seconds},
+            )
+            db.execute(stmt)
+            user_values["data_version"] = User.data_version + 1
+        db.execute(update(User).where(User.username == username).values(user_values))
+    memo.invalidate_days(db, username, [day_date])
+    invalidation.publish(db, username, "sessions")
 
 
 def compute_week_totals(
@@ -70,19 +141,13 @@ def compute_week_totals(
 ) -> list[tuple[date, list[tuple[UUID, int]]]]:
     week_end = week_start + timedelta(days=6)
     stmt = (
-        select(
-            SessionModel.day_date,
-            SessionModel.timer_id,
-            func.coalesce(func.sum(SessionModel.duration_seconds), 0).label("total"),
-        )
+        select(DaySummary.day_date, DaySummary.timer_id, DaySummary.total_seconds)
         .where(
-            SessionModel.username == username,
-            SessionModel.day_date >= week_start,
-            SessionModel.day_date <= week_end,
-            SessionModel.end_at.is_not(None),
+            DaySummary.username == username,
+            DaySummary.day_date >= week_start,
+            DaySummary.day_date <= week_end,
         )
-        .group_by(SessionModel.day_date, SessionModel.timer_id)
-        .order_by(SessionModel.day_date.asc(), SessionModel.timer_id.asc())
+        .order_by(DaySummary.day_date.asc(), DaySummary.timer_id.asc())
     )
     rows = db.execute(stmt).all()
 
@@ -90,45 +155,48 @@ def compute_week_totals(
         week_start + timedelta(days=offset): [] for offset in range(7)
     }
     for row in rows:
-        day_map[row.day_date].append((row.timer_id, int(row.total)))
+        day_map[row.day_date].append((row.timer_id, int(row.total_seconds)))
 
     return [(day, day_map[day]) for day in sorted(day_map.keys())]
 
 
-def compute_averages(
-    db: Session, username: str, days: int
-) -> list[tuple[UUID, int]]:
-    end_date = date.today()
-    start_date = end_date - timedelta(days=days - 1)
+def load_cumulative_totals(db: Session, username: str) -> CumulativeTotals:
+    version = get_data_version(db, username)
+    cached = cumulative_totals_cache.get(username)
+    if cached is not None and cached.version == version:
+        return cached
 
-    totals_subq = (
-        select(
-            SessionModel.day_date,
-            SessionModel.timer_id,
-            func.sum(SessionModel.duration_seconds).label("total_seconds"),
-        )
-        .where(
-            SessionModel.username == username,
-            SessionModel.day_date >= start_date,
-            SessionModel.day_date <= end_date,
-            SessionModel.end_at.is_not(None),
-        )
-        .group_by(SessionModel.day_date, SessionModel.timer_id)
-        .subquery()
+    timer_ids = list(
+        db.execute(
+            select(Timer.id)
+            .where(Timer.username == username, Timer.is_archived.is_(False))
+            .order_by(Timer.created_at.asc())
+        ).scalars()
     )
-
-    day_count = float(days)
-    stmt = (
-        select(
-            Timer.id,
-            func.coalesce(func.sum(totals_subq.c.total_seconds), 0)
-            / day_count,
-        )
-        .select_from(Timer)
-        .outerjoin(totals_subq, totals_subq.c.timer_id == Timer.id)
-        .where(Timer.username == username, Timer.is_archived.is_(False))
-        .group_by(Timer.id)
+    rows = db.execute(
+        select(DaySummary.timer_id, DaySummary.day_date, DaySummary.total_seconds)
+        .where(DaySummary.username == username)
+        .order_by(DaySummary.timer_id.asc(), DaySummary.day_date.asc())
+    ).all()
+
+    totals = CumulativeTotals(
+        version,
+        timer_ids,
+        ((row.timer_id, row.day_date, int(row.total_seconds)) for row in rows),
     )
+    cumulative_totals_cache.set(username, totals)
+    return totals
 
-    rows = db.execute(stmt).all()
-    return [(row[0], int(row[1])) for row in rows]
+
+def compute_averages(
+    db: Session, username: str, days: int, end_date: date
+) -> list[tuple[UUID, int]]:
+    totals = load_cumulative_totals(db, username)
+    return totals.averages(end_date, days)
+
+
+def compute_average_windows(
+    db: Session, username: str, windows: list[int], end_date: date
+) -> list[tuple[int, list[tuple[UUID, int]]]]:
+    totals = load_cumulative_totals(db, username)
+    return [(days, totals.averages(end_date, days)) for days in windows]
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import invalidation, memo
+from app.models.session import Session as SessionModel
+from app.schemas.sync import SyncEventIn
+from app.services import sessions as sessions_service
+
+# Claiming ids before applying anything makes a retried batch that races the
+# original wait on the primary key, then replay the stored outcomes.
+CLAIM_EVENTS_SQL = text(
+    """
+    INSERT INTO sync_events (username, id, event_type, status)
+    SELECT :username, event.id, event.event_type, 'pending'
+    FROM unnest(CAST(:ids AS uuid[]), CAST(:types AS text[]))
+        AS event(id, event_type)
+    ON CONFLICT (username, id) DO NOTHING
+    RETURNING id
+    """
+)
+
+STORED_OUTCOMES_SQL = text(
+    """
+    SELECT id, status, detail
+    FROM sync_events
+    WHERE username = :username AND id = ANY(CAST(:ids AS uuid[]))
+    """
+)
+
+RECORD_OUTCOMES_SQL = text(
+    """
+    UPDATE sync_events
+    SET status = outcome.status, detail = outcome.detail
+    FROM unnest(
+        CAST(:ids AS uuid[]), CAST(:statuses AS text[]), CAST(:details AS text[])
+    ) AS outcome(id, status, detail)
+    WHERE sync_events.username = :username AND sync_events.id = outcome.id
+    """
+)
+
+# The difference lands in the current cycle, like any other closed session.
+ADJUST_SESSION_SQL = text(
+    """
+WITH target AS (
+    SELECT id, day_date, end_at, duration_seconds
+    FROM sessions
+    WHERE username = :username AND id = :session_id
+    FOR UPDATE
+),
+adjusted AS (
+    UPDATE sessions
+    SET duration_seconds = GREATEST(0, target.duration_seconds + :adjustment)
+    FROM target
+    WHERE sessions.id = target.id
+      AND sessions.day_date = target.day_date
+      AND target.end_at IS NOT NULL
+    RETURNING sessions.username, sessions.timer_id, sessions.day_date,
+              sessions.duration_seconds - target.duration_seconds AS delta
+),
+cycle_totals AS (
+    INSERT INTO cycle_total_entries (timer_id, epoch, seconds)
+    SELECT adjusted.timer_id, users.cycle_epoch, adjusted.delta
+    FROM adjusted
+    JOIN users ON users.username = adjusted.username
+    WHERE adjusted.delta <> 0
+),
+day_totals AS (
+    UPDATE day_summaries
+    SET total_seconds = GREATEST(0, day_summaries.total_seconds + adjusted.delta)
+    FROM adjusted
+    WHERE day_summaries.username = adjusted.username
+      AND day_summaries.day_date = adjusted.day_date
+      AND day_summaries.timer_id = adjusted.timer_id
+),
+version AS (
+    UPDATE users SET data_version = data_version + 1
+    WHERE username = :username
+      AND EXISTS (SELECT 1 FROM adjusted WHERE delta <> 0)
+)
+SELECT target.day_date, target.end_at IS NULL AS running, adjusted.delta
+FROM target
+LEFT JOIN adjusted ON true
+"""
+)
+
+PRUNE_EVENTS_SQL = text("DELETE FROM sync_events WHERE created_at < :before")
+
+
+@dataclass(frozen=True)
+class SyncOutcome:
+    id: UUID
+    status: str
+    detail: str | None = None
+
+
+@dataclass
+class SyncResult:
+    outcomes: list[SyncOutcome]
+    active_session: SessionModel | None
+
+
+@dataclass
+class _Timeline:
+    active: SessionModel | None
+    last_transition_at: datetime | None
+
+
+def _adjust_session(db: Session, username: str, event: SyncEventIn) -> SyncOutcome:
+    row = db.execute(
+        ADJUST_SESSION_SQL,
+        {
+            "username": username,
+            "session_id": event.session_id,
+            "adjustment": event.adjustment_seconds,
+        },
+    ).first()
+    if row is None:
+        return SyncOutcome(event.id, "rejected", "session_not_found")
+    if row.running:
+        return SyncOutcome(event.id, "rejected", "session_active")
+    if row.delta:
+        invalidation.publish(db, username, "sessions")
+        memo.invalidate_days(db, username, [row.day_date])
+    return SyncOutcome(event.id, "applied")
+
+
+def _apply_event(
+    db: Session,
+    username: str,
+    event: SyncEventIn,
+    timeline: _Timeline,
+    now: datetime,
+) -> SyncOutcome:
+    if event.type == "adjust":
+        return _adjust_session(db, username, event)
+
+    # Client clocks that run ahead are pulled back to the server's.
+    at = min(event.occurred_at_client, now)
+    if timeline.last_transition_at is not None and at < timeline.last_transition_at:
+        return SyncOutcome(event.id, "rejected", "stale_event")
+
+    if event.type == "stop":
+        if timeline.active is None:
+            return SyncOutcome(event.id, "ignored", "not_running")
+        sessions_service.stop_active_session(
+            db, username, event.adjustment_seconds, at
+        )
+        timeline.active = None
+        timeline.last_transition_at = at
+        return SyncOutcome(event.id, "applied")
+
+    if timeline.active is not None and timeline.active.timer_id == event.timer_id:
+        return SyncOutcome(event.id, "ignored", "already_running")
+    try:
+        _, timeline.active = sessions_service.start_timer_at(
+            db,
+            username,
+            event.timer_id,
+            event.client_tz,
+            at,
+            event.id,
+            event.adjustment_seconds,
+        )
+    except (LookupError, ValueError) as exc:
+        return SyncOutcome(event.id, "rejected", str(exc))
+    timeline.last_transition_at = at
+    return SyncOutcome(event.id, "applied")
+
+
+def sync_events(
+    db: Session,
+    username: str,
+    events: list[SyncEventIn],
+    now: datetime | None = None,
+) -> SyncResult:
+    now = now or datetime.now(timezone.utc)
+    unique: dict[UUID, SyncEventIn] = {}
+    for event in events:
+        unique.setdefault(event.id, event)
+
+    claimed = set(
+        db.execute(
+            CLAIM_EVENTS_SQL,
+            {
+                "username": username,
+                "ids": list(unique),
+                "types": [event.type for event in unique.values()],
+            },
+        ).scalars()
+    )
+    outcomes: dict[UUID, SyncOutcome] = {}
+    if len(claimed) < len(unique):
+        seen = [event_id for event_id in unique if event_id not in claimed]
+        stored = db.execute(STORED_OUTCOMES_SQL, {"username": username, "ids": seen})
+        outcomes.update(
+            (row.id, SyncOutcome(row.id, row.status, row.detail)) for row in stored
+        )
+
+    # Locking the running session holds off live start/stop requests until the
+    # batch commits; a start that slips in while nothing is running fails the
+    # batch with an IntegrityError instead.
+    timeline = _Timeline(
+        active=sessions_service.lock_active_session(db, username),
+        last_transition_at=sessions_service.latest_transition_at(db, username),
+    )
+    try:
+        for event_id, event in unique.items():
+            if event_id in claimed:
+                outcomes[event_id] = _apply_event(db, username, event, timeline, now)
+    except IntegrityError as exc:
+        raise ValueError("sync_conflict") from exc
+
+    applied = [outcomes[event_id] for event_id in unique if event_id in claimed]
+    if applied:
+        db.execute(
+            RECORD_OUTCOMES_SQL,
+            {
+                "username": username,
+                "ids": [outcome.id for outcome in applied],
+                "statuses": [outcome.status for outcome in applied],
+                "details": [outcome.detail for outcome in applied],
+            },
+        )
+    return SyncResult(
+        outcomes=[outcomes[event.id] for event in events],
+        active_session=timeline.active,
+    )
+
+
+def prune_sync_events(db: Session, before: datetime) -> int:
+    deleted = db.execute(PRUNE_EVENTS_SQL, {"before": before}).rowcount
+    db.commit()
+    return deleted
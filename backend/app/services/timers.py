@@ -2,12 +2,15 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import func, literal_column, select, text, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app import invalidation
 from app.models.timer import Timer
+from app.models.user import User
 from app.schemas.timer import TimerCreate, TimerUpdate
+from app.services.versions import bump_data_version
 
 
 def list_timers(db: Session, username: str, include_archived: bool) -> list[Timer]:
@@ -26,6 +29,8 @@ def create_timer(db: Session, username: str, data: TimerCreate) -> Timer:
         icon=data.icon,
     )
     db.add(timer)
+    bump_data_version(db, username)
+    invalidation.publish(db, username, "timers")
     try:
         db.commit()
     except IntegrityError as exc:
@@ -50,6 +55,8 @@ def update_timer(
         timer.icon = data.icon
     if data.is_archived is not None:
         timer.is_archived = data.is_archived
+    bump_data_version(db, username)
+    invalidation.publish(db, username, "timers")
 
     try:
         db.commit()
@@ -66,5 +73,89 @@ def archive_timer(db: Session, username: str, timer_id: UUID) -> bool:
         return False
     if not timer.is_archived:
         timer.is_archived = True
+        bump_data_version(db, username)
+        invalidation.publish(db, username, "timers")
         db.commit()
     return True
+
+
+CURRENT_CHANGE_SEQ = literal_column("pg_current_xact_id()::text::bigint")
+
+
+# Folds the oldest ledger entries into the timers they belong to. Entries from
+# an epoch older than the user's current one were reset away and are dropped.
+COMPACT_CYCLE_TOTALS_SQL = text(
+    """
+    WITH folded AS (
+        DELETE FROM cycle_total_entries
+        WHERE id IN (
+            SELECT id FROM cycle_total_entries ORDER BY id LIMIT :batch_size
+        )
+        RETURNING timer_id, epoch, seconds
+    ),
+    timer_totals AS (
+        SELECT folded.timer_id,
+               users.cycle_epoch,
+               COALESCE(
+                   SUM(folded.seconds) FILTER (
+                       WHERE folded.epoch = users.cycle_epoch
+                   ),
+                   0
+               ) AS seconds,
+               COUNT(*) AS entries
+        FROM folded
+        JOIN timers ON timers.id = folded.timer_id
+        JOIN users ON users.username = timers.username
+        GROUP BY folded.timer_id, users.cycle_epoch
+    ),
+    compacted AS (
+        UPDATE timers
+        SET cycle_base_seconds = CASE
+                WHEN timers.cycle_epoch = timer_totals.cycle_epoch
+                    THEN timers.cycle_base_seconds
+                ELSE 0
+            END + timer_totals.seconds,
+            cycle_epoch = timer_totals.cycle_epoch
+        FROM timer_totals
+        WHERE timers.id = timer_totals.timer_id
+    )
+    SELECT COALESCE(SUM(entries), 0) FROM timer_totals
+    """
+)
+
+
+def reset_cycle_totals(db: Session, username: str) -> list[UUID]:
+    # Starting a new epoch zeroes every timer without locking their rows.
+    db.execute(
+        update(User)
+        .where(User.username == username)
+        .values(
+            cycle_epoch=User.cycle_epoch + 1,
+            cycle_started_at=func.now(),
+            cycle_epoch_seq=CURRENT_CHANGE_SEQ,
+            data_version=User.data_version + 1,
+        )
+    )
+    invalidation.publish(db, username, "totals")
+    for instance in list(db.identity_map.values()):
+        if isinstance(instance, Timer):
+            db.expire(instance, ["cycle_total_seconds"])
+
+    rows = db.execute(select(Timer.id).where(Timer.username == username)).all()
+    return [row.id for row in rows]
+
+
+def fold_cycle_total_entries(db: Session, batch_size: int) -> int:
+    return db.execute(
+        COMPACT_CYCLE_TOTALS_SQL, {"batch_size": batch_size}
+    ).scalar_one()
+
+
+def compact_cycle_totals(db: Session, batch_size: int = 10_000) -> int:
+    folded = 0
+    while True:
+        count = fold_cycle_total_entries(db, batch_size)
+        db.commit()
+        folded += count
+        if count < batch_size:
+            return folded
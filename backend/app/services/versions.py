@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app import replica
+from app.models.user import User
+
+
+def get_data_version(db: Session, username: str) -> int:
+    version = db.execute(
+        select(User.data_version).where(User.username == username)
+    ).scalar_one_or_none()
+    return version or 0
+
+
+def get_cache_state(db: Session, username: str) -> tuple[int, date | None]:
+    row = db.execute(
+        select(User.data_version, User.finalized_through).where(
+            User.username == username
+        )
+    ).one_or_none()
+    if row is None:
+        return 0, None
+    if replica.is_replica(db):
+        # A lagging replica must not get a memo entry kept indefinitely.
+        return row.data_version, None
+    return row.data_version, row.finalized_through
+
+
+def bump_data_version(db: Session, username: str) -> int:
+    version = db.execute(
+        update(User)
+        .where(User.username == username)
+        .values(data_version=User.data_version + 1)
+        .returning(User.data_version)
+    ).scalar_one_or_none()
+    return version or 0
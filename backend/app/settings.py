@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -6,6 +8,33 @@ class Settings(BaseSettings):
     log_level: str = "info"
     cors_origins: str = "http://localhost:5173"
     database_url: str = "postgresql+psycopg://coursetimers:coursetimers@db:5432/coursetimers"
+    database_replica_url: str | None = None
+    replica_write_timeout_seconds: float = 60.0
+    db_mode: Literal["sync", "async"] = "sync"
+    username_cache_size: int = 10000
+    username_cache_ttl_seconds: float = 300.0
+    averages_cache_size: int = 1024
+    averages_cache_ttl_seconds: float = 3600.0
+    active_session_stream_heartbeat_seconds: float = 20.0
+    session_import_max_bytes: int = 64 * 1024 * 1024
+    query_stats_header: bool = False
+    query_budget_statements: int = 15
+    query_budget_ms: float = 250.0
+    invalidation_bus: bool = False
+    invalidation_channel: str = "focusarc_invalidate"
+    response_memo_max_bytes: int = 32 * 1024 * 1024
+    response_memo_recent_ttl_seconds: float = 30.0
+    session_reaper: bool = False
+    session_reaper_interval_seconds: float = 300.0
+    session_reaper_jitter_seconds: float = 60.0
+    session_reaper_max_age_hours: float = 16.0
+    session_reaper_batch_size: int = 500
+    cycle_compaction: bool = True
+    cycle_compaction_interval_seconds: float = 300.0
+    cycle_compaction_jitter_seconds: float = 60.0
+    cycle_compaction_batch_size: int = 10_000
+    sync_max_events: int = 500
+    sync_event_retention_days: int = 30
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -0,0 +1,423 @@
+"""Drive concurrent FocusArc users against a running API and report per-route latency.
+
+Run from backend/ against a migrated scratch database, either pointing at a
+server that is already up or letting the driver start uvicorn itself:
+
+    python -m benchmarks.loadgen --base-url http://127.0.0.1:8000 --users 50
+    DATABASE_URL=postgresql+psycopg://... python -m benchmarks.loadgen --serve
+
+Results are written as JSON (--output) and can be compared with an earlier run
+(--compare baseline.json).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+CLIENT_TZ = "UTC"
+TIMER_COUNT = 4
+TIMER_COLORS = ["#22C55E", "#3B82F6", "#F97316", "#A855F7"]
+AVERAGE_WINDOWS = [7, 14, 30, 90]
+
+
+@dataclass
+class RouteStats:
+    latencies: list[float] = field(default_factory=list)
+    statuses: dict[int, int] = field(default_factory=dict)
+    errors: int = 0
+
+    def record(self, latency_ms: float, status: int) -> None:
+        self.latencies.append(latency_ms)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if status >= 400:
+            self.errors += 1
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    rank = max(1, int(len(ordered) * fraction + 0.999999))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(stats: RouteStats, elapsed: float) -> dict[str, Any]:
+    ordered = sorted(stats.latencies)
+    count = len(ordered)
+    return {
+        "requests": count,
+        "errors": stats.errors,
+        "statuses": {
+            str(status): total for status, total in sorted(stats.statuses.items())
+        },
+        "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(ordered) / count, 3) if count else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50), 3),
+        "p95_ms": round(percentile(ordered, 0.95), 3),
+        "p99_ms": round(percentile(ordered, 0.99), 3),
+        "max_ms": round(ordered[-1], 3) if count else 0.0,
+    }
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.routes: dict[str, RouteStats] = {}
+        self.total = RouteStats()
+        self.recording = False
+
+    def record(self, route: str, latency_ms: float, status: int) -> None:
+        if not self.recording:
+            return
+        self.routes.setdefault(route, RouteStats()).record(latency_ms, status)
+        self.total.record(latency_ms, status)
+
+    def report(self, elapsed: float) -> dict[str, Any]:
+        return {
+            "total": summarize(self.total, elapsed),
+            "routes": {
+                route: summarize(stats, elapsed)
+                for route, stats in sorted(self.routes.items())
+            },
+        }
+
+
+class VirtualUser:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        recorder: Recorder,
+        username: str,
+        rng: random.Random,
+        think_seconds: float,
+        use_etags: bool,
+    ) -> None:
+        self.client = client
+        self.recorder = recorder
+        self.username = username
+        self.rng = rng
+        self.think_seconds = think_seconds
+        self.use_etags = use_etags
+        self.etags: dict[str, str] = {}
+        self.timer_ids: list[str] = []
+        self.active_timer: str | None = None
+
+    async def request(
+        self,
+        route: str,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        body: dict[str, Any] | None = None,
+    ) -> httpx.Response | None:
+        headers = {"X-Username": self.username}
+        cache_key = f"{path}?{sorted((params or {}).items())}"
+        if method == "GET" and self.use_etags and cache_key in self.etags:
+            headers["If-None-Match"] = self.etags[cache_key]
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(
+                method, path, params=params, json=body, headers=headers
+            )
+        except httpx.HTTPError:
+            self.recorder.record(route, (time.perf_counter() - started) * 1000, 599)
+            return None
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.recorder.record(route, latency_ms, response.status_code)
+        etag = response.headers.get("etag")
+        if method == "GET" and etag:
+            self.etags[cache_key] = etag
+        return response
+
+    async def setup(self) -> None:
+        response = await self.request("GET /timers", "GET", "/api/timers")
+        timers = (
+            response.json()["timers"]
+            if response is not None and response.status_code == 200
+            else []
+        )
+        self.timer_ids = [timer["id"] for timer in timers if not timer["is_archived"]]
+        for index in range(len(self.timer_ids), TIMER_COUNT):
+            response = await self.request(
+                "POST /timers",
+                "POST",
+                "/api/timers",
+                body={"name": f"Load {index}", "color": TIMER_COLORS[index]},
+            )
+            if response is not None and response.status_code == 201:
+                self.timer_ids.append(response.json()["id"])
+        response = await self.request(
+            "GET /active-session", "GET", "/api/active-session"
+        )
+        if response is not None and response.status_code == 200:
+            active = response.json().get("active_session")
+            self.active_timer = active["timer_id"] if active else None
+
+    async def poll_active_session(self) -> None:
+        await self.request("GET /active-session", "GET", "/api/active-session")
+
+    async def start_timer(self) -> None:
+        choices = [
+            timer_id for timer_id in self.timer_ids if timer_id != self.active_timer
+        ]
+        if not choices:
+            return
+        timer_id = self.rng.choice(choices)
+        response = await self.request(
+            "POST /timers/{id}/start",
+            "POST",
+            f"/api/timers/{timer_id}/start",
+            body={"client_tz": CLIENT_TZ},
+        )
+        if response is not None and response.status_code == 200:
+            self.active_timer = timer_id
+
+    async def stop_timer(self) -> None:
+        response = await self.request("POST /stop", "POST", "/api/stop", body={})
+        if response is not None and response.status_code == 200:
+            self.active_timer = None
+
+    async def end_day(self) -> None:
+        response = await self.request(
+            "POST /end-day",
+            "POST",
+            "/api/end-day",
+            body={"client_tz": CLIENT_TZ, "day_date": _today().isoformat()},
+        )
+        if response is not None and response.status_code == 200:
+            self.active_timer = None
+
+    async def view_today(self) -> None:
+        params = {"day_date": _today().isoformat()}
+        await self.request("GET /stats/day", "GET", "/api/stats/day", params=params)
+        await self.request(
+            "GET /schedule/day", "GET", "/api/schedule/day", params=params
+        )
+
+    async def view_week(self) -> None:
+        params = {"week_start": _week_start().isoformat()}
+        await self.request("GET /stats/week", "GET", "/api/stats/week", params=params)
+        await self.request(
+            "GET /schedule/week", "GET", "/api/schedule/week", params=params
+        )
+
+    async def view_averages(self) -> None:
+        await self.request(
+            "GET /stats/averages/windows",
+            "GET",
+            "/api/stats/averages/windows",
+            params={"days": AVERAGE_WINDOWS, "end_date": _today().isoformat()},
+        )
+
+    async def view_dashboard(self) -> None:
+        await self.request(
+            "GET /dashboard",
+            "GET",
+            "/api/dashboard",
+            params={
+                "day_date": _today().isoformat(),
+                "week_start": _week_start().isoformat(),
+            },
+        )
+
+    def actions(self) -> list[tuple[Callable[[], Awaitable[None]], int]]:
+        return [
+            (self.poll_active_session, 50),
+            (self.start_timer, 12),
+            (self.stop_timer, 4),
+            (self.view_today, 12),
+            (self.view_week, 8),
+            (self.view_averages, 6),
+            (self.view_dashboard, 4),
+            (self.end_day, 1),
+        ]
+
+    async def run(self, deadline: float) -> None:
+        actions, weights = zip(*self.actions())
+        while time.perf_counter() < deadline:
+            await self.rng.choices(actions, weights)[0]()
+            pause = self.rng.expovariate(1 / self.think_seconds)
+            await asyncio.sleep(min(pause, max(0.0, deadline - time.perf_counter())))
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _week_start() -> date:
+    today = _today()
+    return today - timedelta(days=today.weekday())
+
+
+async def run_load(args: argparse.Namespace) -> dict[str, Any]:
+    recorder = Recorder()
+    limits = httpx.Limits(
+        max_connections=args.users, max_keepalive_connections=args.users
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        users = [
+            VirtualUser(
+                client,
+                recorder,
+                f"{args.user_prefix}{index}",
+                random.Random(args.seed + index),
+                args.think_time,
+                not args.no_etags,
+            )
+            for index in range(args.users)
+        ]
+        await asyncio.gather(*(user.setup() for user in users))
+
+        if args.warmup:
+            warmup_deadline = time.perf_counter() + args.warmup
+            await asyncio.gather(*(user.run(warmup_deadline) for user in users))
+
+        recorder.recording = True
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(user.run(deadline) for user in users))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "config": {
+            "base_url": args.base_url,
+            "users": args.users,
+            "duration_seconds": args.duration,
+            "warmup_seconds": args.warmup,
+            "think_time_seconds": args.think_time,
+            "etags": not args.no_etags,
+            "seed": args.seed,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "elapsed_seconds": round(elapsed, 3),
+        **recorder.report(elapsed),
+    }
+
+
+def print_report(results: dict[str, Any], baseline: dict[str, Any] | None) -> None:
+    config = results["config"]
+    print(
+        f"{config['users']} users for {results['elapsed_seconds']:.1f}s "
+        f"against {config['base_url']}"
+    )
+    header = (
+        f"{'route':<30}{'reqs':>8}{'err':>6}{'rps':>9}"
+        f"{'p50':>9}{'p95':>9}{'p99':>9}"
+    )
+    if baseline:
+        header += f"{'p95 vs base':>14}"
+    print(header)
+    rows = [*results["routes"].items(), ("TOTAL", results["total"])]
+    for route, summary in rows:
+        line = (
+            f"{route:<30}{summary['requests']:>8}{summary['errors']:>6}"
+            f"{summary['throughput_rps']:>9.1f}{summary['p50_ms']:>9.1f}"
+            f"{summary['p95_ms']:>9.1f}{summary['p99_ms']:>9.1f}"
+        )
+        if baseline:
+            base = (
+                baseline["total"]
+                if route == "TOTAL"
+                else baseline["routes"].get(route)
+            )
+            if base and base["p95_ms"]:
+                change = (summary["p95_ms"] - base["p95_ms"]) / base["p95_ms"] * 100
+                line += f"{change:>+13.1f}%"
+        print(line)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args: argparse.Namespace) -> subprocess.Popen:
+    port = _free_port()
+    env = dict(os.environ)
+    if args.database_url:
+        env["DATABASE_URL"] = args.database_url
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(args.workers),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+    args.base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit("uvicorn exited before becoming healthy")
+        try:
+            if httpx.get(f"{args.base_url}/api/health", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise SystemExit("uvicorn did not become healthy within 30s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--think-time", type=float, default=0.5)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--user-prefix", default="load-")
+    parser.add_argument("--no-etags", action="store_true")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument("--serve", action="store_true", help="start uvicorn locally")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    server = start_server(args) if args.serve else None
+    try:
+        results = asyncio.run(run_load(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(results, baseline)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Compare the ORM + Pydantic and Core row + orjson read paths for a week schedule.
+
+Run from backend/ against a scratch database:
+
+    DATABASE_URL=postgresql+psycopg://... python -m benchmarks.session_serialization
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, delete, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.api.encoding import dump_json
+from app.api.sessions import _week_schedule
+from app.models.session import Session as SessionModel
+from app.models.timer import Timer
+from app.models.user import User
+from app.schemas.session import SessionOut, WeekSchedule, WeekScheduleDay
+from app.services import sessions as sessions_service
+from app.settings import get_settings
+
+USERNAME = "bench-serialization"
+WEEK_START = date(2026, 1, 5)
+
+
+def seed(SessionLocal, session_count: int) -> None:
+    with SessionLocal() as db:
+        db.execute(delete(User).where(User.username == USERNAME))
+        db.execute(insert(User).values(username=USERNAME))
+        timer_ids = [uuid.uuid4() for _ in range(8)]
+        db.execute(
+            insert(Timer),
+            [
+                {
+                    "id": timer_id,
+                    "username": USERNAME,
+                    "name": f"Timer {index}",
+                    "color": "#22C55E",
+                    "icon": "book",
+                }
+                for index, timer_id in enumerate(timer_ids)
+            ],
+        )
+        start = datetime.combine(WEEK_START, datetime.min.time(), tzinfo=timezone.utc)
+        step = timedelta(days=7) / session_count
+        rows = []
+        for index in range(session_count):
+            start_at = start + step * index
+            duration = random.randint(1, int(step.total_seconds()))
+            rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "username": USERNAME,
+                    "timer_id": random.choice(timer_ids),
+                    "start_at": start_at,
+                    "end_at": start_at + timedelta(seconds=duration),
+                    "duration_seconds": duration,
+                    "client_tz": "UTC",
+                    "day_date": start_at.date(),
+                    "day_of_week": start_at.weekday(),
+                }
+            )
+        db.execute(insert(SessionModel), rows)
+        db.commit()
+
+
+def orm_path(db) -> bytes:
+    week_end = WEEK_START + timedelta(days=6)
+    sessions = sessions_service.list_sessions(db, USERNAME, WEEK_START, week_end)
+    days_map: dict[date, list[SessionOut]] = {
+        WEEK_START + timedelta(days=offset): [] for offset in range(7)
+    }
+    for session in sessions:
+        days_map[session.day_date].append(SessionOut.model_validate(session))
+    schedule = WeekSchedule(
+        week_start=WEEK_START,
+        days=[
+            WeekScheduleDay(day_date=day, sessions=days_map[day])
+            for day in sorted(days_map.keys())
+        ],
+    )
+    return schedule.model_dump_json().encode()
+
+
+def row_path(db) -> bytes:
+    week_end = WEEK_START + timedelta(days=6)
+    rows = sessions_service.list_session_rows(db, USERNAME, WEEK_START, week_end)
+    return dump_json(_week_schedule(WEEK_START, rows))
+
+
+def measure(SessionLocal, path, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        with SessionLocal() as db:
+            started = time.perf_counter()
+            path(db)
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--database-url", default=get_settings().database_url)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False)
+    seed(SessionLocal, args.sessions)
+    try:
+        with SessionLocal() as db:
+            assert orm_path(db) == row_path(db), "read paths disagree"
+        results = {
+            "orm+pydantic": measure(SessionLocal, orm_path, args.repeat),
+            "rows+orjson": measure(SessionLocal, row_path, args.repeat),
+        }
+    finally:
+        with SessionLocal() as db:
+            db.execute(delete(User).where(User.username == USERNAME))
+            db.commit()
+
+    baseline = statistics.median(results["orm+pydantic"])
+    print(f"{args.sessions} sessions in one week, {args.repeat} runs each")
+    for name, timings in results.items():
+        median = statistics.median(timings)
+        print(
+            f"{name:>14}: median {median:8.1f} ms  "
+            f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:8.1f} ms  "
+            f"x{baseline / median:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -27,5 +27,6 @@ else:
 PY
 
 alembic upgrade head
+python -m app.maintenance create-partitions
 
 exec "$@"
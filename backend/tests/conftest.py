@@ -1,13 +1,22 @@
 import os
+from contextlib import contextmanager
 
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
-from app.db import get_db
+from app import query_stats
+from app.auth import known_usernames
+from app.api.router import build_router
+from app.db import get_async_db, get_db
 from app.main import app
+from app.memo import response_memo
 from app.models.base import Base
+from app.services.stats import cumulative_totals_cache
 
 
 def _get_test_database_url() -> str:
@@ -30,6 +39,9 @@ def engine():
 def db_session(engine):
     Base.metadata.drop_all(engine)
     Base.metadata.create_all(engine)
+    known_usernames.clear()
+    cumulative_totals_cache.clear()
+    response_memo.clear()
     SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
     db = SessionLocal()
     try:
@@ -47,6 +59,10 @@ def client(engine, db_session):
         db = SessionLocal()
         try:
             yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
         finally:
             db.close()
 
@@ -54,3 +70,71 @@ def client(engine, db_session):
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def async_client(engine, db_session):
+    async_engine = create_async_engine(engine.url, poolclass=NullPool)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False)
+
+    async def override_get_async_db():
+        db = AsyncSessionLocal()
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        finally:
+            await db.close()
+
+    async_app = FastAPI()
+    async_app.include_router(build_router("async"), prefix="/api")
+    async_app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(async_app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def auth_headers():
+    return {"X-Username": "jay"}
+
+
+@pytest.fixture
+def create_timer(auth_headers):
+    def create(client, name: str) -> dict:
+        response = client.post(
+            "/api/timers",
+            json={"name": name, "color": "#22C55E"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 201
+        return response.json()
+
+    return create
+
+
+@pytest.fixture
+def statement_budget(client, monkeypatch):
+    # Read the stats once the request has finished, so the budget covers the
+    # commit and notify that run during dependency teardown.
+    finished: list[query_stats.QueryStats] = []
+    track = query_stats.track
+
+    @contextmanager
+    def recording_track():
+        with track() as stats:
+            yield stats
+        finished.append(stats)
+
+    monkeypatch.setattr(query_stats, "track", recording_track)
+
+    def check(response, budget: int) -> int:
+        statements = finished[-1].statements
+        assert statements <= budget, (
+            f"{response.request.method} {response.request.url.path} ran "
+            f"{statements} SQL statements (budget {budget})"
+        )
+        return statements
+
+    return check
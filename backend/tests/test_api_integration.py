@@ -1,3 +1,16 @@
+import csv
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.auth import known_usernames
+from app.services import exports as exports_service
+
+
 def _create_timer(client, headers, name: str):
     response = client.post(
         "/api/timers",
@@ -13,6 +26,17 @@ def test_missing_username_rejected(client):
     assert response.status_code == 400
 
 
+def test_known_username_skips_users_lookup(client):
+    headers = {"X-Username": "jay"}
+    client.get("/api/me", headers=headers)
+    hits_before = known_usernames.hits
+
+    response = client.get("/api/me", headers=headers)
+
+    assert response.status_code == 200
+    assert known_usernames.hits == hits_before + 1
+
+
 def test_timer_flow_and_single_active_enforced(client):
     headers = {"X-Username": "jay"}
     timer_a = _create_timer(client, headers, "BIO130")
@@ -98,3 +122,361 @@ def test_end_day_stops_active_session(client):
 
     active_response = client.get("/api/active-session", headers=headers)
     assert active_response.json()["active_session"] is None
+
+
+def test_read_endpoints_return_not_modified_until_a_write(client):
+    headers = {"X-Username": "jay"}
+    _create_timer(client, headers, "BIO130")
+
+    response = client.get("/api/timers", headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    response = client.get(
+        "/api/timers", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+    _create_timer(client, headers, "CHEM200")
+
+    response = client.get(
+        "/api/timers", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.json()["timers"]) == 2
+
+
+def test_session_writes_bump_schedule_etag(client):
+    headers = {"X-Username": "jay"}
+    timer = _create_timer(client, headers, "BIO130")
+    start_response = client.post(
+        f"/api/timers/{timer['id']}/start",
+        json={"client_tz": "UTC"},
+        headers=headers,
+    )
+    day_date = start_response.json()["active_session"]["day_date"]
+
+    response = client.get(
+        "/api/schedule/day", params={"day_date": day_date}, headers=headers
+    )
+    etag = response.headers["ETag"]
+
+    client.post("/api/stop", headers=headers)
+
+    response = client.get(
+        "/api/schedule/day",
+        params={"day_date": day_date},
+        headers={**headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 200
+    assert response.json()["sessions"][0]["end_at"] is not None
+
+
+def test_average_windows_use_client_end_date(client):
+    headers = {"X-Username": "jay"}
+    timer = _create_timer(client, headers, "BIO130")
+    start_response = client.post(
+        f"/api/timers/{timer['id']}/start",
+        json={"client_tz": "UTC"},
+        headers=headers,
+    )
+    day_date = start_response.json()["active_session"]["day_date"]
+    client.post("/api/stop", headers=headers)
+
+    response = client.get(
+        "/api/stats/averages/windows",
+        params=[("days", 7), ("days", 30), ("end_date", day_date)],
+        headers=headers,
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["end_date"] == day_date
+    assert [window["days"] for window in body["windows"]] == [7, 30]
+    assert body["windows"][0]["averages"][0]["timer_id"] == timer["id"]
+
+    response = client.get(
+        "/api/stats/averages/windows",
+        params=[("days", 0), ("end_date", day_date)],
+        headers=headers,
+    )
+    assert response.status_code == 400
+
+    response = client.get("/api/stats/averages", params={"days": 7}, headers=headers)
+    assert response.status_code == 422
+
+    response = client.get(
+        "/api/stats/averages", params={"days": 7, "end_date": day_date}, headers=headers
+    )
+    assert response.json()["averages"][0]["timer_id"] == timer["id"]
+
+
+def _record_sessions(client, headers, timers) -> str:
+    day_date = None
+    for timer in timers:
+        response = client.post(
+            f"/api/timers/{timer['id']}/start",
+            json={"client_tz": "UTC"},
+            headers=headers,
+        )
+        day_date = response.json()["active_session"]["day_date"]
+    client.post("/api/stop", headers=headers)
+    return day_date
+
+
+def test_sessions_keyset_pagination_walks_every_row(client):
+    headers = {"X-Username": "jay"}
+    timer_a = _create_timer(client, headers, "BIO130")
+    timer_b = _create_timer(client, headers, "CHEM200")
+    day_date = _record_sessions(client, headers, [timer_a, timer_b, timer_a])
+    params = {"from": day_date, "to": day_date, "limit": 2}
+
+    first = client.get("/api/sessions", params=params, headers=headers).json()
+    assert len(first["sessions"]) == 2
+    assert first["next_cursor"] is not None
+
+    second = client.get(
+        "/api/sessions",
+        params={**params, "cursor": first["next_cursor"]},
+        headers=headers,
+    ).json()
+    assert len(second["sessions"]) == 1
+    assert second["next_cursor"] is None
+
+    full = client.get(
+        "/api/sessions", params={"from": day_date, "to": day_date}, headers=headers
+    ).json()
+    assert [item["id"] for item in first["sessions"] + second["sessions"]] == [
+        item["id"] for item in full["sessions"]
+    ]
+
+    response = client.get(
+        "/api/sessions", params={**params, "cursor": "not-a-cursor"}, headers=headers
+    )
+    assert response.status_code == 400
+
+
+def test_sessions_ndjson_stream(client):
+    headers = {"X-Username": "jay"}
+    timer_a = _create_timer(client, headers, "BIO130")
+    timer_b = _create_timer(client, headers, "CHEM200")
+    day_date = _record_sessions(client, headers, [timer_a, timer_b])
+
+    response = client.get(
+        "/api/sessions",
+        params={"from": day_date, "to": day_date, "format": "ndjson"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert "ETag" in response.headers
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["timer_id"] for line in lines] == [timer_a["id"], timer_b["id"]]
+
+
+def test_session_import_merges_rows_and_rebuilds_rollups(client):
+    headers = {"X-Username": "jay"}
+    timer = _create_timer(client, headers, "BIO130")
+    session_id = "8a5c3b5e-2a43-4a53-9a3f-0d7f8b7e4c11"
+    rows = [
+        {
+            "id": session_id,
+            "timer_id": timer["id"],
+            "start_at": "2026-01-05T23:30:00+00:00",
+            "end_at": "2026-01-06T00:30:00+00:00",
+            "client_tz": "America/Toronto",
+        },
+        {
+            "timer_id": timer["id"],
+            "start_at": "2026-01-06T15:00:00Z",
+            "end_at": "2026-01-06T15:20:00Z",
+            "duration_seconds": 900,
+            "client_tz": "America/Toronto",
+        },
+    ]
+    body = "\n".join(json.dumps(row) for row in rows)
+    ndjson_headers = {**headers, "Content-Type": "application/x-ndjson"}
+
+    response = client.post("/api/sessions/import", content=body, headers=ndjson_headers)
+    assert response.status_code == 200
+    assert response.json() == {"received": 2, "imported": 2, "skipped": 0}
+
+    response = client.get(
+        "/api/sessions", params={"from": "2026-01-05", "to": "2026-01-06"}, headers=headers
+    )
+    sessions = response.json()["sessions"]
+    assert [(s["day_date"], s["day_of_week"]) for s in sessions] == [
+        ("2026-01-05", 0),
+        ("2026-01-06", 1),
+    ]
+
+    response = client.get("/api/stats/day", params={"day_date": "2026-01-05"}, headers=headers)
+    assert response.json()["totals"] == [{"timer_id": timer["id"], "total_seconds": 3600}]
+
+    response = client.post(
+        "/api/sessions/import", content=json.dumps(rows[0]), headers=ndjson_headers
+    )
+    assert response.json() == {"received": 1, "imported": 0, "skipped": 1}
+
+    response = client.get("/api/timers", headers=headers)
+    assert response.json()["timers"][0]["cycle_total_seconds"] == 4500
+
+
+def test_session_import_dedupes_ids_and_counts_only_the_current_cycle(client):
+    headers = {"X-Username": "jay"}
+    timer = _create_timer(client, headers, "BIO130")
+    ndjson_headers = {**headers, "Content-Type": "application/x-ndjson"}
+    session_id = "8a5c3b5e-2a43-4a53-9a3f-0d7f8b7e4c11"
+    old = {
+        "id": session_id,
+        "timer_id": timer["id"],
+        "start_at": "2026-01-05T10:00:00Z",
+        "end_at": "2026-01-05T11:00:00Z",
+        "client_tz": "UTC",
+    }
+    client.post("/api/totals/reset", headers=headers)
+
+    moved = {
+        **old,
+        "start_at": "2026-01-07T10:00:00Z",
+        "end_at": "2026-01-07T11:00:00Z",
+    }
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    recent = {
+        "timer_id": timer["id"],
+        "start_at": (now + timedelta(seconds=1)).isoformat(),
+        "end_at": (now + timedelta(minutes=20)).isoformat(),
+        "client_tz": "UTC",
+    }
+    body = "\n".join(json.dumps(row) for row in (old, moved, recent))
+    response = client.post("/api/sessions/import", content=body, headers=ndjson_headers)
+    assert response.json() == {"received": 3, "imported": 2, "skipped": 1}
+
+    body = json.dumps(moved)
+    response = client.post("/api/sessions/import", content=body, headers=ndjson_headers)
+    assert response.json() == {"received": 1, "imported": 0, "skipped": 1}
+
+    response = client.get("/api/timers", headers=headers)
+    assert response.json()["timers"][0]["cycle_total_seconds"] == 1199
+
+
+def test_session_import_csv_rejects_bad_rows(client):
+    headers = {"X-Username": "jay"}
+    timer = _create_timer(client, headers, "BIO130")
+    body = (
+        "timer_id,start_at,end_at,client_tz\n"
+        f"{timer['id']},2026-01-05T10:00:00Z,2026-01-05T11:00:00Z,UTC\n"
+        f"{timer['id']},2026-01-05T12:00:00Z,2026-01-05T13:00:00Z,Mars/Base\n"
+    )
+
+    response = client.post(
+        "/api/sessions/import",
+        content=body,
+        headers={**headers, "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Line 3: Invalid client_tz"
+
+    response = client.get(
+        "/api/sessions", params={"from": "2026-01-05", "to": "2026-01-05"}, headers=headers
+    )
+    assert response.json()["sessions"] == []
+
+    response = client.post(
+        "/api/sessions/import", content=body, headers={**headers, "Content-Type": "text/plain"}
+    )
+    assert response.status_code == 415
+
+
+def test_export_streams_sessions_and_summaries(client):
+    headers = {"X-Username": "jay"}
+    timers = [_create_timer(client, headers, "BIO130")]
+    _record_sessions(client, headers, timers)
+
+    response = client.get("/api/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in response.text.splitlines()]
+    kinds = [record["type"] for record in records]
+    assert kinds.count("session") >= 1
+    assert kinds[-1] == "day_summary"
+
+    response = client.get(
+        "/api/export", params={"format": "csv", "gzip": "true"}, headers=headers
+    )
+    assert response.headers["content-type"] == "application/gzip"
+    rows = list(csv.DictReader(gzip.decompress(response.content).decode().splitlines()))
+    assert [row["type"] for row in rows] == kinds
+
+
+def test_export_reads_one_snapshot(client, engine):
+    headers = {"X-Username": "jay"}
+    timer = _create_timer(client, headers, "BIO130")
+    client.post(
+        f"/api/timers/{timer['id']}/start", json={"client_tz": "UTC"}, headers=headers
+    )
+    export_engine = create_engine(engine.url, poolclass=NullPool)
+
+    @event.listens_for(export_engine, "before_cursor_execute")
+    def _stop_between_statements(conn, cursor, statement, *args):
+        if "FROM day_summaries" in statement:
+            assert client.post("/api/stop", headers=headers).status_code == 200
+
+    db = sessionmaker(bind=export_engine)()
+    try:
+        body = b"".join(exports_service.iter_export(db, "jay", "ndjson"))
+    finally:
+        db.close()
+        export_engine.dispose()
+
+    records = [json.loads(line) for line in body.decode().splitlines()]
+    assert [record["type"] for record in records] == ["session"]
+    assert records[0]["end_at"] is None
+
+
+def test_dashboard_bundles_startup_reads(client):
+    headers = {"X-Username": "jay"}
+    timer = _create_timer(client, headers, "BIO130")
+    response = client.post(
+        f"/api/timers/{timer['id']}/start", json={"client_tz": "UTC"}, headers=headers
+    )
+    day_date = response.json()["active_session"]["day_date"]
+    params = {"day_date": day_date, "week_start": day_date}
+
+    response = client.get("/api/dashboard", params=params, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body["timers"]] == [timer["id"]]
+    assert body["active_session"]["timer_id"] == timer["id"]
+    assert body["schedule_day"]["sessions"][0]["timer_id"] == timer["id"]
+    assert [window["days"] for window in body["averages"]["windows"]] == [7, 14, 30, 90]
+    assert body["averages"]["end_date"] == day_date
+    assert len(body["week_stats"]["daily"]) == 7
+
+    etag = response.headers["ETag"]
+    response = client.get(
+        "/api/dashboard", params=params, headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+
+def test_metrics_expose_route_latency(client):
+    headers = {"X-Username": "jay"}
+    timer = _create_timer(client, headers, "BIO130")
+    client.post(
+        f"/api/timers/{timer['id']}/start", json={"client_tz": "UTC"}, headers=headers
+    )
+
+    response = client.get("/api/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert (
+        'focusarc_http_request_duration_seconds_count{method="POST",'
+        'route="/api/timers/{timer_id}/start",status="200"}'
+    ) in body
+    assert "focusarc_http_requests_in_flight 1" in body
+    assert 'focusarc_db_pool_size{pool="sync"}' in body
+    assert 'focusarc_cache_hits_total{cache="usernames"}' in body
@@ -0,0 +1,188 @@
+import json
+
+from app.api.router import build_router
+
+
+def _create_timer(client, headers, name: str):
+    response = client.post(
+        "/api/timers",
+        json={"name": name, "color": "#22C55E", "icon": "flask"},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def _routes(db_mode: str) -> set[tuple[str, str]]:
+    return {
+        (method, route.path)
+        for route in build_router(db_mode).routes
+        for method in getattr(route, "methods", ())
+    }
+
+
+def test_async_router_serves_the_same_routes():
+    assert _routes("async") == _routes("sync")
+
+
+def test_async_missing_username_rejected(async_client):
+    response = async_client.get("/api/me")
+    assert response.status_code == 400
+
+
+def test_async_timer_flow_and_single_active_enforced(async_client):
+    headers = {"X-Username": "jay"}
+    timer_a = _create_timer(async_client, headers, "BIO130")
+    timer_b = _create_timer(async_client, headers, "CHEM200")
+
+    response = async_client.post(
+        f"/api/timers/{timer_a['id']}/start",
+        json={"client_tz": "UTC"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+
+    response = async_client.post(
+        f"/api/timers/{timer_b['id']}/start",
+        json={"client_tz": "UTC"},
+        headers=headers,
+    )
+    body = response.json()
+    assert body["stopped_session"]["timer_id"] == timer_a["id"]
+    assert body["active_session"]["timer_id"] == timer_b["id"]
+
+    response = async_client.get("/api/me", headers=headers)
+    assert response.json()["active_session"]["timer_id"] == timer_b["id"]
+
+    response = async_client.post("/api/stop", headers=headers)
+    assert response.json()["stopped_session"]["end_at"] is not None
+
+
+def test_async_end_day_and_stats_agree(async_client):
+    headers = {"X-Username": "jay"}
+    timer = _create_timer(async_client, headers, "BIO130")
+
+    start_response = async_client.post(
+        f"/api/timers/{timer['id']}/start",
+        json={"client_tz": "UTC"},
+        headers=headers,
+    )
+    day_date = start_response.json()["active_session"]["day_date"]
+
+    response = async_client.post(
+        "/api/end-day",
+        json={"client_tz": "UTC", "day_date": day_date},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    end_day_totals = response.json()["totals"]
+
+    response = async_client.get(
+        "/api/stats/day", params={"day_date": day_date}, headers=headers
+    )
+    assert response.json()["totals"] == end_day_totals
+
+    response = async_client.get(
+        "/api/schedule/day", params={"day_date": day_date}, headers=headers
+    )
+    assert len(response.json()["sessions"]) == 1
+
+
+def test_async_stats_week_not_modified(async_client):
+    headers = {"X-Username": "jay"}
+    _create_timer(async_client, headers, "BIO130")
+    params = {"week_start": "2026-01-05"}
+
+    response = async_client.get("/api/stats/week", params=params, headers=headers)
+    etag = response.headers["ETag"]
+
+    response = async_client.get(
+        "/api/stats/week", params=params, headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+
+def test_async_sessions_ndjson_and_pages(async_client):
+    headers = {"X-Username": "jay"}
+    timer_a = _create_timer(async_client, headers, "BIO130")
+    timer_b = _create_timer(async_client, headers, "CHEM200")
+    for timer in (timer_a, timer_b):
+        response = async_client.post(
+            f"/api/timers/{timer['id']}/start",
+            json={"client_tz": "UTC"},
+            headers=headers,
+        )
+    day_date = response.json()["active_session"]["day_date"]
+    params = {"from": day_date, "to": day_date}
+
+    response = async_client.get(
+        "/api/sessions", params={**params, "format": "ndjson"}, headers=headers
+    )
+    assert len(response.text.splitlines()) == 2
+
+    page = async_client.get(
+        "/api/sessions", params={**params, "limit": 1}, headers=headers
+    ).json()
+    assert page["sessions"][0]["timer_id"] == timer_a["id"]
+    assert page["next_cursor"] is not None
+
+
+def test_async_session_import_copies_rows(async_client):
+    headers = {"X-Username": "jay"}
+    timer = _create_timer(async_client, headers, "BIO130")
+    body = (
+        "timer_id,start_at,end_at,client_tz\n"
+        f"{timer['id']},2026-01-05T10:00:00Z,2026-01-05T11:00:00Z,UTC\n"
+        f"{timer['id']},2026-01-05T12:00:00Z,2026-01-05T12:30:00Z,UTC\n"
+    )
+
+    response = async_client.post(
+        "/api/sessions/import",
+        content=body,
+        headers={**headers, "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 200
+    assert response.json()["imported"] == 2
+
+    response = async_client.get(
+        "/api/stats/day", params={"day_date": "2026-01-05"}, headers=headers
+    )
+    assert response.json()["totals"] == [
+        {"timer_id": timer["id"], "total_seconds": 5400}
+    ]
+
+
+def test_async_export_streams_ndjson(async_client):
+    headers = {"X-Username": "jay"}
+    timer = _create_timer(async_client, headers, "BIO130")
+    async_client.post(
+        f"/api/timers/{timer['id']}/start", json={"client_tz": "UTC"}, headers=headers
+    )
+    async_client.post("/api/stop", headers=headers)
+
+    response = async_client.get("/api/export", headers=headers)
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["type"] for record in records] == ["session", "day_summary"]
+    assert records[0]["timer_id"] == timer["id"]
+
+
+def test_async_dashboard_matches_individual_reads(async_client):
+    headers = {"X-Username": "jay"}
+    timer = _create_timer(async_client, headers, "BIO130")
+    response = async_client.post(
+        f"/api/timers/{timer['id']}/start", json={"client_tz": "UTC"}, headers=headers
+    )
+    day_date = response.json()["active_session"]["day_date"]
+
+    response = async_client.get(
+        "/api/dashboard",
+        params={"day_date": day_date, "week_start": day_date, "days": [7]},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["timers"] == async_client.get("/api/timers", headers=headers).json()["timers"]
+    assert body["day_stats"] == async_client.get(
+        "/api/stats/day", params={"day_date": day_date}, headers=headers
+    ).json()
@@ -0,0 +1,104 @@
+from datetime import date
+
+from app import cache as cache_module
+from app.cache import MemoCache, TTLCache
+
+MONDAY = date(2026, 1, 5)
+SUNDAY = date(2026, 1, 11)
+
+
+def _freeze_clock(monkeypatch, value: float) -> None:
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: value)
+
+
+def test_hit_and_miss_counters():
+    cache: TTLCache[str, bool] = TTLCache(maxsize=10, ttl_seconds=60)
+
+    assert cache.get("jay") is None
+    cache.set("jay", True)
+    assert cache.get("jay") is True
+    assert cache.get("jay") is True
+
+    assert cache.hits == 2
+    assert cache.misses == 1
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    cache: TTLCache[str, bool] = TTLCache(maxsize=10, ttl_seconds=30)
+
+    _freeze_clock(monkeypatch, 100.0)
+    cache.set("jay", True)
+
+    _freeze_clock(monkeypatch, 129.0)
+    assert cache.get("jay") is True
+
+    _freeze_clock(monkeypatch, 130.0)
+    assert cache.get("jay") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_evicted_when_full():
+    cache: TTLCache[str, bool] = TTLCache(maxsize=2, ttl_seconds=60)
+
+    cache.set("a", True)
+    cache.set("b", True)
+    cache.get("a")
+    cache.set("c", True)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+
+def _memoize(cache: MemoCache, key, payload: bytes, ttl=None, first=MONDAY, last=SUNDAY):
+    cache.set("jay", key, payload, first, last, ttl, cache.generation("jay"))
+
+
+def test_memo_evicts_least_recently_used_by_bytes():
+    cache = MemoCache(max_bytes=10)
+
+    _memoize(cache, "a", b"aaaa")
+    _memoize(cache, "b", b"bbbb")
+    cache.get("jay", "a")
+    _memoize(cache, "c", b"cccc")
+
+    assert cache.get("jay", "a") == b"aaaa"
+    assert cache.get("jay", "b") is None
+    assert cache.stats()["bytes"] == 8
+
+
+def test_memo_ttl_applies_only_to_entries_given_one(monkeypatch):
+    cache = MemoCache(max_bytes=100)
+
+    _freeze_clock(monkeypatch, 100.0)
+    _memoize(cache, "past", b"{}")
+    _memoize(cache, "current", b"{}", ttl=30)
+
+    _freeze_clock(monkeypatch, 1_000_000.0)
+    assert cache.get("jay", "past") == b"{}"
+    assert cache.get("jay", "current") is None
+
+
+def test_memo_discards_only_overlapping_days():
+    cache = MemoCache(max_bytes=100)
+    _memoize(cache, "week", b"{}")
+    _memoize(cache, "next", b"{}", first=date(2026, 1, 12), last=date(2026, 1, 18))
+
+    cache.discard_days("jay", [date(2026, 1, 7)])
+
+    assert cache.get("jay", "week") is None
+    assert cache.get("jay", "next") == b"{}"
+
+
+def test_memo_rejects_results_computed_across_a_discard():
+    cache = MemoCache(max_bytes=100)
+    generation = cache.generation("jay")
+
+    cache.discard_days("jay", [MONDAY])
+    cache.set("jay", "week", b"stale", MONDAY, SUNDAY, None, generation)
+    assert cache.get("jay", "week") is None
+
+    generation = cache.generation("jay")
+    cache.clear()
+    cache.set("jay", "week", b"stale", MONDAY, SUNDAY, None, generation)
+    assert cache.get("jay", "week") is None
@@ -0,0 +1,127 @@
+import json
+
+from sqlalchemy import text
+
+from app.api import changes as changes_api
+
+HEADERS = {"X-Username": "jay"}
+
+
+def _changes(client, since: int | None = None) -> dict:
+    params = {} if since is None else {"since": since}
+    response = client.get("/api/changes", params=params, headers=HEADERS)
+    assert response.status_code == 200
+    return response.json()
+
+
+def _create_timer(client, name: str) -> str:
+    response = client.post(
+        "/api/timers", json={"name": name, "color": "#22C55E"}, headers=HEADERS
+    )
+    return response.json()["id"]
+
+
+def _start_stop(client, timer_id: str) -> None:
+    client.post(
+        f"/api/timers/{timer_id}/start", json={"client_tz": "UTC"}, headers=HEADERS
+    )
+    client.post("/api/stop", json={"adjustment_seconds": 60}, headers=HEADERS)
+
+
+def test_changes_return_rows_written_since_high_water(client):
+    mark = _changes(client)["next"]
+    bio = _create_timer(client, "BIO130")
+    chem = _create_timer(client, "CHEM200")
+    _start_stop(client, bio)
+
+    delta = _changes(client, mark)
+    assert not delta["reset"]
+    assert [timer["id"] for timer in delta["timers"]] == [bio, chem]
+    assert delta["timers"][0]["cycle_total_seconds"] == 60
+    assert [(s["timer_id"], s["duration_seconds"]) for s in delta["sessions"]] == [
+        (bio, 60)
+    ]
+
+    quiet = _changes(client, delta["next"])
+    assert (quiet["timers"], quiet["sessions"]) == ([], [])
+
+    # A closed session only adds a ledger entry, but its timer's total moved.
+    _start_stop(client, chem)
+    delta = _changes(client, quiet["next"])
+    assert [timer["id"] for timer in delta["timers"]] == [chem]
+    assert [s["timer_id"] for s in delta["sessions"]] == [chem]
+
+    client.delete(f"/api/timers/{chem}", headers=HEADERS)
+    delta = _changes(client, delta["next"])
+    assert [(t["id"], t["is_archived"]) for t in delta["timers"]] == [(chem, True)]
+
+    client.post("/api/totals/reset", headers=HEADERS)
+    delta = _changes(client, delta["next"])
+    assert {t["id"]: t["cycle_total_seconds"] for t in delta["timers"]} == {
+        bio: 0,
+        chem: 0,
+    }
+
+
+def test_changes_resend_rows_from_transactions_open_at_read_time(client, engine):
+    bio = _create_timer(client, "BIO130")
+    mark = _changes(client)["next"]
+
+    with engine.connect() as writer:
+        writer.execute(
+            text("UPDATE timers SET name = 'BIO131' WHERE id = :id"), {"id": bio}
+        )
+        writer.execute(
+            text(
+                "UPDATE users SET data_version = data_version + 1 "
+                "WHERE username = 'jay'"
+            )
+        )
+        during = _changes(client, mark)
+        assert during["timers"] == []
+        writer.commit()
+
+    after = _changes(client, during["next"])
+    assert [timer["name"] for timer in after["timers"]] == ["BIO131"]
+
+
+def test_changes_ask_for_reload_past_the_session_limit(client, monkeypatch):
+    bio = _create_timer(client, "BIO130")
+    mark = _changes(client)["next"]
+    rows = "\n".join(
+        json.dumps(
+            {
+                "timer_id": bio,
+                "start_at": f"2026-01-0{day}T09:00:00Z",
+                "end_at": f"2026-01-0{day}T10:00:00Z",
+                "client_tz": "UTC",
+            }
+        )
+        for day in (5, 6)
+    )
+    client.post(
+        "/api/sessions/import",
+        content=rows,
+        headers={**HEADERS, "Content-Type": "application/x-ndjson"},
+    )
+    monkeypatch.setattr(changes_api, "CHANGES_SESSION_LIMIT", 1)
+
+    delta = _changes(client, mark)
+
+    assert delta["reset"]
+    assert (delta["timers"], delta["sessions"]) == ([], [])
+    assert delta["next"] >= mark
+
+
+def test_async_changes_return_new_timers(async_client):
+    response = async_client.get("/api/changes", headers=HEADERS)
+    mark = response.json()["next"]
+    async_client.post(
+        "/api/timers", json={"name": "BIO130", "color": "#22C55E"}, headers=HEADERS
+    )
+
+    response = async_client.get(
+        "/api/changes", params={"since": mark}, headers=HEADERS
+    )
+
+    assert [timer["name"] for timer in response.json()["timers"]] == ["BIO130"]
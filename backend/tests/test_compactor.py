@@ -0,0 +1,71 @@
+import threading
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app import compactor
+from app.main import app
+from app.models.cycle_total_entry import CycleTotalEntry
+from app.models.timer import Timer
+from app.models.user import User
+
+
+def _ledger(db_session, seconds: list[int]) -> Timer:
+    db_session.add(User(username="jay"))
+    db_session.commit()
+    timer = Timer(username="jay", name="BIO130", color="#22C55E", icon="book")
+    db_session.add(timer)
+    db_session.commit()
+    db_session.add_all(
+        CycleTotalEntry(timer_id=timer.id, epoch=0, seconds=value) for value in seconds
+    )
+    db_session.commit()
+    return timer
+
+
+def _ledger_size(db_session) -> int:
+    return db_session.execute(select(func.count(CycleTotalEntry.id))).scalar_one()
+
+
+def test_compactor_folds_in_batches_and_skips_while_locked(engine, db_session):
+    timer = _ledger(db_session, [600, 300, 60])
+    factory = sessionmaker(bind=engine, autoflush=False)
+
+    with engine.connect() as other:
+        other.execute(
+            text("SELECT pg_advisory_lock(:key)"), {"key": compactor.LOCK_KEY}
+        )
+        assert compactor.compact_once(factory, batch_size=2) == 0
+        other.execute(
+            text("SELECT pg_advisory_unlock(:key)"), {"key": compactor.LOCK_KEY}
+        )
+
+    assert compactor.compact_once(factory, batch_size=2) == 3
+    assert _ledger_size(db_session) == 0
+    db_session.refresh(timer)
+    assert timer.cycle_base_seconds == 960
+
+
+def test_compactor_runs_in_the_background_of_the_app(engine, db_session, monkeypatch):
+    timer = _ledger(db_session, [600, 300])
+    factory = sessionmaker(bind=engine, autoflush=False)
+    compact_once = compactor.compact_once
+    folded = threading.Event()
+
+    def compact_test_database() -> int:
+        count = compact_once(factory)
+        if count:
+            folded.set()
+        return count
+
+    monkeypatch.setattr(compactor, "compact_once", compact_test_database)
+    monkeypatch.setattr(compactor.settings, "cycle_compaction_interval_seconds", 0)
+    monkeypatch.setattr(compactor.settings, "cycle_compaction_jitter_seconds", 0)
+
+    with TestClient(app):
+        assert folded.wait(timeout=5)
+
+    assert _ledger_size(db_session) == 0
+    db_session.refresh(timer)
+    assert timer.cycle_base_seconds == 900
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select, text
+
+from app.models.cycle_total_entry import CycleTotalEntry
+from app.models.timer import Timer
+from app.models.user import User
+from app.services import sessions as sessions_service
+from app.services import timers as timers_service
+
+T0 = datetime(2026, 1, 5, 9, 0, tzinfo=timezone.utc)
+
+
+def _freeze_time(monkeypatch, frozen: datetime) -> None:
+    class FrozenDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return frozen.astimezone(tz) if tz else frozen.replace(tzinfo=None)
+
+    monkeypatch.setattr(sessions_service, "datetime", FrozenDateTime)
+
+
+def _setup(db_session) -> tuple[Timer, Timer]:
+    db_session.add(User(username="jay"))
+    db_session.commit()
+    timers = [
+        Timer(username="jay", name=name, color="#22C55E", icon="book")
+        for name in ("BIO130", "CHEM200")
+    ]
+    db_session.add_all(timers)
+    db_session.commit()
+    return timers[0], timers[1]
+
+
+def _track(db_session, monkeypatch, timer: Timer, start: datetime, seconds: int):
+    _freeze_time(monkeypatch, start)
+    sessions_service.start_timer(db_session, "jay", timer.id, "UTC")
+    _freeze_time(monkeypatch, start + timedelta(seconds=seconds))
+    sessions_service.stop_active_session(db_session, "jay")
+    db_session.commit()
+
+
+def _totals(db_session) -> dict[str, int]:
+    db_session.expire_all()
+    rows = db_session.execute(select(Timer.name, Timer.cycle_total_seconds)).all()
+    return dict(rows)
+
+
+def _ledger_size(db_session) -> int:
+    return db_session.execute(select(func.count(CycleTotalEntry.id))).scalar_one()
+
+
+def test_closed_sessions_append_to_ledger_until_compacted(db_session, monkeypatch):
+    bio, chem = _setup(db_session)
+    _track(db_session, monkeypatch, bio, T0, 600)
+    _track(db_session, monkeypatch, chem, T0 + timedelta(hours=1), 300)
+    _track(db_session, monkeypatch, bio, T0 + timedelta(hours=2), 60)
+
+    assert _totals(db_session) == {"BIO130": 660, "CHEM200": 300}
+    assert _ledger_size(db_session) == 3
+
+    assert timers_service.compact_cycle_totals(db_session, batch_size=2) == 3
+    assert _ledger_size(db_session) == 0
+    assert _totals(db_session) == {"BIO130": 660, "CHEM200": 300}
+    db_session.refresh(bio)
+    assert bio.cycle_base_seconds == 660
+
+    _track(db_session, monkeypatch, bio, T0 + timedelta(hours=3), 40)
+    assert _totals(db_session) == {"BIO130": 700, "CHEM200": 300}
+
+
+def test_reset_starts_new_epoch_without_writing_timers(db_session, monkeypatch):
+    bio, chem = _setup(db_session)
+    _track(db_session, monkeypatch, bio, T0, 600)
+    timers_service.compact_cycle_totals(db_session)
+    _track(db_session, monkeypatch, chem, T0 + timedelta(hours=1), 300)
+
+    row_versions = text("SELECT id, xmin::text FROM timers ORDER BY id")
+    before = db_session.execute(row_versions).all()
+    timers_service.reset_cycle_totals(db_session, "jay")
+    db_session.commit()
+
+    assert db_session.execute(row_versions).all() == before
+    assert _totals(db_session) == {"BIO130": 0, "CHEM200": 0}
+
+    _track(db_session, monkeypatch, chem, T0 + timedelta(hours=2), 120)
+    assert _totals(db_session) == {"BIO130": 0, "CHEM200": 120}
+
+    # The pre-reset CHEM200 entry is discarded rather than folded in.
+    assert timers_service.compact_cycle_totals(db_session) == 2
+    assert _totals(db_session) == {"BIO130": 0, "CHEM200": 120}
@@ -0,0 +1,54 @@
+import asyncio
+import threading
+
+from sqlalchemy import text
+
+from app.events import active_session_events, mark_active_session_changed
+
+
+def _wait_for_publish(username: str, trigger) -> bool:
+    async def scenario() -> bool:
+        waker = active_session_events.subscribe(username)
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, trigger)
+            try:
+                await asyncio.wait_for(waker.wait(), timeout=0.5)
+            except asyncio.TimeoutError:
+                return False
+            return True
+        finally:
+            active_session_events.unsubscribe(username, waker)
+
+    return asyncio.run(scenario())
+
+
+def test_publish_from_worker_thread_wakes_subscriber():
+    def trigger():
+        thread = threading.Thread(target=active_session_events.publish, args=("jay",))
+        thread.start()
+        thread.join()
+
+    assert _wait_for_publish("jay", trigger)
+    assert active_session_events.subscriber_count() == 0
+
+
+def test_publish_only_wakes_matching_username():
+    assert not _wait_for_publish("jay", lambda: active_session_events.publish("sam"))
+
+
+def test_commit_publishes_marked_username(db_session):
+    def trigger():
+        mark_active_session_changed(db_session, "jay")
+        db_session.commit()
+
+    assert _wait_for_publish("jay", trigger)
+
+
+def test_rollback_discards_marked_username(db_session):
+    def trigger():
+        db_session.execute(text("SELECT 1"))
+        mark_active_session_changed(db_session, "jay")
+        db_session.rollback()
+        db_session.commit()
+
+    assert not _wait_for_publish("jay", trigger)
@@ -0,0 +1,81 @@
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select
+
+from app.models.session import Session as SessionModel
+from app.models.timer import Timer
+from app.models.user import User
+from app.services import finalization as finalization_service
+from app.services import stats as stats_service
+
+DAY = date(2026, 1, 6)
+# Past midnight in Toronto (UTC-5) but still Jan 6 in Honolulu (UTC-10).
+NOW = datetime(2026, 1, 7, 7, 0, tzinfo=timezone.utc)
+
+
+def _user_with_timer(db_session, username: str) -> Timer:
+    db_session.add(User(username=username))
+    db_session.commit()
+    timer = Timer(username=username, name="BIO130", color="#22C55E", icon="book")
+    db_session.add(timer)
+    db_session.commit()
+    return timer
+
+
+def _session(
+    db_session, timer: Timer, tz_name: str, start_at: datetime, seconds: int | None
+) -> SessionModel:
+    session = SessionModel(
+        username=timer.username,
+        timer_id=timer.id,
+        start_at=start_at,
+        end_at=start_at + timedelta(seconds=seconds) if seconds is not None else None,
+        duration_seconds=seconds,
+        client_tz=tz_name,
+        day_date=DAY,
+        day_of_week=DAY.weekday(),
+    )
+    db_session.add(session)
+    db_session.commit()
+    return session
+
+
+def test_finalize_day_closes_stale_sessions_and_summarizes_every_user(db_session):
+    toronto = _user_with_timer(db_session, "ana")
+    honolulu = _user_with_timer(db_session, "ben")
+    finished = _user_with_timer(db_session, "cy")
+    _user_with_timer(db_session, "dee")
+
+    evening = datetime(2026, 1, 7, 2, 0, tzinfo=timezone.utc)
+    _session(db_session, toronto, "America/Toronto", evening - timedelta(hours=1), 600)
+    stale = _session(db_session, toronto, "America/Toronto", evening, None)
+    open_session = _session(db_session, honolulu, "Pacific/Honolulu", evening, None)
+    morning = datetime(2026, 1, 6, 9, tzinfo=timezone.utc)
+    _session(db_session, finished, "UTC", morning, 900)
+
+    result = finalization_service.finalize_day(db_session, DAY, chunk_size=2, now=NOW)
+
+    assert (result.users, result.closed_sessions, result.summarized_users) == (4, 1, 2)
+
+    db_session.expire_all()
+    local_midnight = datetime.combine(
+        DAY, time(23, 59, 59, 999000), tzinfo=ZoneInfo("America/Toronto")
+    )
+    assert db_session.get(SessionModel, (stale.id, DAY)).end_at == local_midnight
+    assert db_session.get(SessionModel, (open_session.id, DAY)).end_at is None
+
+    assert dict(stats_service.compute_day_totals(db_session, "ana", DAY)) == {
+        toronto.id: 600 + 3 * 3600 - 1
+    }
+    assert dict(stats_service.compute_day_totals(db_session, "cy", DAY)) == {
+        finished.id: 900
+    }
+    assert stats_service.compute_day_totals(db_session, "ben", DAY) == []
+    assert set(db_session.execute(select(User.finalized_through)).scalars()) == {DAY}
+
+    versions = select(User.username, User.data_version).order_by(User.username)
+    before = db_session.execute(versions).all()
+    again = finalization_service.finalize_day(db_session, DAY, now=NOW)
+    assert (again.closed_sessions, again.summarized_users) == (0, 0)
+    assert db_session.execute(versions).all() == before
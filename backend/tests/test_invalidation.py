@@ -0,0 +1,94 @@
+import asyncio
+import json
+
+import psycopg
+import pytest
+
+from app import invalidation
+from app.models.user import User
+from app.schemas.timer import TimerCreate
+from app.services import timers as timers_service
+from app.services.stats import cumulative_totals_cache
+
+CHANNEL = "focusarc_invalidate_test"
+
+
+@pytest.fixture
+def bus(engine, monkeypatch):
+    monkeypatch.setattr(invalidation.settings, "invalidation_bus", True)
+    monkeypatch.setattr(invalidation.settings, "invalidation_channel", CHANNEL)
+    dsn = invalidation.listener_dsn(engine.url.render_as_string(hide_password=False))
+    with psycopg.connect(dsn, autocommit=True) as listener:
+        listener.execute(f"LISTEN {CHANNEL}")
+        yield dsn, listener
+
+
+def _received(listener) -> list[dict]:
+    return [
+        json.loads(notify.payload) for notify in listener.notifies(timeout=0.2)
+    ]
+
+
+def test_committed_writes_notify_the_bus(db_session, bus):
+    _, listener = bus
+    db_session.add(User(username="jay"))
+    db_session.commit()
+
+    timers_service.create_timer(
+        db_session, "jay", TimerCreate(name="BIO130", color="#22C55E")
+    )
+
+    assert _received(listener) == [
+        {"worker": invalidation.WORKER_ID, "username": "jay", "entity": "timers"}
+    ]
+
+
+def test_rolled_back_writes_do_not_notify(db_session, bus):
+    _, listener = bus
+    db_session.add(User(username="jay"))
+    db_session.flush()
+    invalidation.publish(db_session, "jay", "timers")
+    db_session.rollback()
+    db_session.commit()
+
+    assert _received(listener) == []
+
+
+def test_dispatch_ignores_own_notifications(monkeypatch):
+    evicted = []
+    monkeypatch.setitem(invalidation._evictors, "timers", [evicted.append])
+
+    for worker in (invalidation.WORKER_ID, "other-worker"):
+        invalidation.dispatch(
+            json.dumps({"worker": worker, "username": "jay", "entity": "timers"})
+        )
+    invalidation.dispatch("not json")
+
+    assert evicted == ["jay"]
+
+
+def test_listener_evicts_caches_for_other_workers(bus):
+    dsn, listener = bus
+    payload = json.dumps(
+        {"worker": "other-worker", "username": "jay", "entity": "sessions"}
+    )
+
+    async def scenario() -> bool:
+        task = asyncio.create_task(invalidation.listen(dsn, CHANNEL))
+        try:
+            for _ in range(50):
+                await asyncio.sleep(0.05)
+                # The listener clears everything on connect; seed afterwards.
+                cumulative_totals_cache.set("jay", object())
+                listener.execute("SELECT pg_notify(%s, %s)", (CHANNEL, payload))
+                await asyncio.sleep(0.05)
+                if cumulative_totals_cache.get("jay") is None:
+                    return True
+            return False
+        finally:
+            task.cancel()
+
+    try:
+        assert asyncio.run(scenario())
+    finally:
+        cumulative_totals_cache.clear()
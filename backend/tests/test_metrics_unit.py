@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, text
+
+from app import metrics
+from app.metrics import Histogram, InstrumentedQueuePool, pool_checkouts, route_template
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("demo_seconds", "Demo.", (0.1, 1.0))
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.5, route="/a")
+    histogram.observe(5.0, route="/a")
+
+    lines = list(histogram.render())
+
+    assert 'demo_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 'demo_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{route="/a"} 3' in lines
+    assert 'demo_seconds_sum{route="/a"} 5.55' in lines
+
+
+def test_route_template_restores_router_prefix():
+    route = SimpleNamespace(path="/timers/{timer_id}/start")
+    scope = {"path": "/api/timers/abc/start", "route": route}
+
+    assert route_template(scope) == "/api/timers/{timer_id}/start"
+    assert route_template({"path": "/nope"}) == metrics.UNMATCHED_ROUTE
+
+
+def test_instrumented_pool_counts_checkouts():
+    engine = create_engine("sqlite://", poolclass=InstrumentedQueuePool)
+    before = pool_checkouts.value(pool="sync")
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert pool_checkouts.value(pool="sync") == before + 2
+    assert metrics.pool_wait.count(pool="sync") >= 2
+
+
+def test_watched_pool_counts_checkouts_under_its_label(monkeypatch):
+    monkeypatch.setattr(metrics, "_engines", {})
+    engine = create_engine("sqlite://", poolclass=InstrumentedQueuePool)
+    metrics.watch_engine("replica", engine)
+    before = pool_checkouts.value(pool="replica")
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    engine.dispose()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert pool_checkouts.value(pool="replica") == before + 2
+    assert (
+        f'focusarc_db_pool_checkouts_total{{pool="replica"}} {before + 2}'
+        in metrics.render().splitlines()
+    )
@@ -0,0 +1,104 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from app.models.session import Session as SessionModel
+from app.models.timer import Timer
+from app.models.user import User
+from app.services import partitions as partitions_service
+from app.services import sessions as sessions_service
+
+
+def _setup_timer(db_session) -> Timer:
+    db_session.add(User(username="jay"))
+    db_session.commit()
+    timer = Timer(username="jay", name="BIO130", color="#22C55E", icon="book")
+    db_session.add(timer)
+    db_session.commit()
+    return timer
+
+
+def _add_session(
+    db_session, timer: Timer, day_date: date, ended: bool
+) -> SessionModel:
+    start_at = datetime.combine(day_date, datetime.min.time(), tzinfo=timezone.utc)
+    session = SessionModel(
+        username=timer.username,
+        timer_id=timer.id,
+        start_at=start_at,
+        end_at=start_at if ended else None,
+        duration_seconds=0 if ended else None,
+        client_tz="UTC",
+        day_date=day_date,
+        day_of_week=day_date.weekday(),
+    )
+    db_session.add(session)
+    db_session.commit()
+    return session
+
+
+def _partition_of(db_session, session: SessionModel) -> str:
+    return db_session.execute(
+        text("SELECT tableoid::regclass::text FROM sessions WHERE id = :id"),
+        {"id": session.id},
+    ).scalar_one()
+
+
+def test_create_partition_moves_rows_out_of_default(db_session):
+    timer = _setup_timer(db_session)
+    closed = _add_session(db_session, timer, date(2026, 3, 2), ended=True)
+    active = _add_session(db_session, timer, date(2026, 3, 10), ended=False)
+    assert _partition_of(db_session, active) == "sessions_default"
+
+    created = partitions_service.ensure_partitions(
+        db_session, date(2026, 2, 1), date(2026, 4, 1)
+    )
+    db_session.commit()
+
+    assert created == ["sessions_p2026_02", "sessions_p2026_03", "sessions_p2026_04"]
+    assert _partition_of(db_session, closed) == "sessions_p2026_03"
+    assert _partition_of(db_session, active) == "sessions_p2026_03"
+    assert sessions_service.get_active_session(db_session, "jay").id == active.id
+    assert partitions_service.ensure_partitions(
+        db_session, date(2026, 3, 1), date(2026, 3, 1)
+    ) == []
+
+
+def test_one_active_session_per_user_across_partitions(db_session):
+    timer = _setup_timer(db_session)
+    partitions_service.ensure_partitions(
+        db_session, date(2026, 1, 1), date(2026, 2, 1)
+    )
+    db_session.commit()
+    _add_session(db_session, timer, date(2026, 1, 31), ended=False)
+
+    with pytest.raises(IntegrityError):
+        _add_session(db_session, timer, date(2026, 2, 1), ended=False)
+    db_session.rollback()
+
+
+def test_detach_partitions_skips_months_with_active_sessions(db_session):
+    timer = _setup_timer(db_session)
+    partitions_service.ensure_partitions(
+        db_session, date(2026, 1, 1), date(2026, 2, 1)
+    )
+    db_session.commit()
+    _add_session(db_session, timer, date(2026, 1, 5), ended=True)
+    active = _add_session(db_session, timer, date(2026, 2, 5), ended=False)
+
+    with pytest.raises(ValueError):
+        partitions_service.detach_partitions(db_session, date(2026, 3, 1), drop=True)
+    db_session.rollback()
+
+    detached = partitions_service.detach_partitions(
+        db_session, date(2026, 2, 1), drop=True
+    )
+    db_session.commit()
+
+    assert detached == ["sessions_p2026_01"]
+    assert [name for name, _ in partitions_service.list_partitions(db_session)] == [
+        "sessions_p2026_02"
+    ]
+    assert sessions_service.get_active_session(db_session, "jay").id == active.id
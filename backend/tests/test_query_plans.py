@@ -0,0 +1,326 @@
+import random
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models.base import Base
+from app.models.session import Session as SessionModel
+from app.models.timer import Timer
+from app.models.user import User
+from app.services import partitions as partitions_service
+from app.services import sessions as sessions_service
+from app.services import stats as stats_service
+from app.services.stats import cumulative_totals_cache
+
+USER_COUNT = 200
+TIMERS_PER_USER = 6
+SESSIONS_PER_DAY = 3
+FIRST_DAY = date(2025, 7, 1)
+LAST_DAY = date(2025, 12, 31)
+TARGET = "plan-user-0"
+TARGET_DAY = date(2025, 11, 12)
+TARGET_WEEK = date(2025, 11, 10)
+
+# Shared buffers touched by the whole statement (hit + read). Roughly 3x what
+# each plan needs on the seeded dataset.
+BUFFER_BUDGETS = {
+    "stats.compute_day_totals": 15,
+    "stats.compute_session_day_totals": 15,
+    "stats.compute_week_totals": 15,
+    "stats.load_cumulative_totals": 30,
+    "sessions.get_active_session": 15,
+    "sessions.list_sessions": 75,
+    "sessions.list_sessions_for_timer": 30,
+    "sessions.list_sessions_page": 75,
+    "sessions.list_session_rows": 75,
+    "sessions.iter_session_rows": 1700,
+    "sessions.stop_active_session": 75,
+}
+
+# The planner rightly seq scans relations of a few pages (users, active
+# sessions, the empty default partition); anything larger must use an index.
+SEQ_SCAN_MAX_PAGES = 4
+
+INDEX_ONLY = {
+    "stats.compute_day_totals": "ix_day_summaries_username_day_date",
+    "stats.compute_session_day_totals": "ix_sessions_username_day_date",
+    "stats.compute_week_totals": "ix_day_summaries_username_day_date",
+    "stats.load_cumulative_totals": "ix_day_summaries_username_timer_day_date",
+}
+
+
+def _seed(db) -> None:
+    rng = random.Random(13)
+    partitions_service.ensure_partitions(db, FIRST_DAY, LAST_DAY)
+    db.execute(
+        insert(User),
+        [{"username": f"plan-user-{index}"} for index in range(USER_COUNT)],
+    )
+    timers = {
+        f"plan-user-{index}": [uuid.uuid4() for _ in range(TIMERS_PER_USER)]
+        for index in range(USER_COUNT)
+    }
+    db.execute(
+        insert(Timer),
+        [
+            {
+                "id": timer_id,
+                "username": username,
+                "name": f"Timer {position}",
+                "color": "#22C55E",
+                "icon": "book",
+            }
+            for username, timer_ids in timers.items()
+            for position, timer_id in enumerate(timer_ids)
+        ],
+    )
+
+    day_count = (LAST_DAY - FIRST_DAY).days + 1
+    for offset in range(day_count):
+        day = FIRST_DAY + timedelta(days=offset)
+        start = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc)
+        rows = []
+        for slot in range(SESSIONS_PER_DAY):
+            start_at = start + timedelta(hours=8 + slot * 4)
+            for username, timer_ids in timers.items():
+                duration = rng.randint(300, 5400)
+                rows.append(
+                    {
+                        "id": uuid.uuid4(),
+                        "username": username,
+                        "timer_id": rng.choice(timer_ids),
+                        "start_at": start_at,
+                        "end_at": start_at + timedelta(seconds=duration),
+                        "duration_seconds": duration,
+                        "client_tz": "UTC",
+                        "day_date": day,
+                        "day_of_week": day.weekday(),
+                    }
+                )
+        db.execute(insert(SessionModel), rows)
+
+    active_start = datetime(2025, 12, 31, 22, tzinfo=timezone.utc)
+    db.execute(
+        insert(SessionModel),
+        [
+            {
+                "id": uuid.uuid4(),
+                "username": username,
+                "timer_id": timer_ids[0],
+                "start_at": active_start,
+                "client_tz": "UTC",
+                "day_date": LAST_DAY,
+                "day_of_week": LAST_DAY.weekday(),
+            }
+            for username, timer_ids in timers.items()
+        ],
+    )
+    db.execute(
+        text(
+            """
+            INSERT INTO day_summaries (id, username, day_date, timer_id, total_seconds)
+            SELECT gen_random_uuid(), username, day_date, timer_id,
+                   SUM(duration_seconds)
+            FROM sessions
+            WHERE end_at IS NOT NULL
+            GROUP BY username, day_date, timer_id
+            """
+        )
+    )
+    db.commit()
+
+
+@pytest.fixture(scope="module")
+def plan_db(engine):
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    cumulative_totals_cache.clear()
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    with SessionLocal() as db:
+        _seed(db)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM ANALYZE"))
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(engine)
+
+
+def _first_timer(db):
+    return db.execute(
+        text("SELECT id FROM timers WHERE username = :username ORDER BY name LIMIT 1"),
+        {"username": TARGET},
+    ).scalar_one()
+
+
+def _page_cursor(db):
+    first = sessions_service.list_sessions(
+        db, TARGET, TARGET_WEEK, TARGET_WEEK + timedelta(days=6), limit=10
+    )[-1]
+    return first.start_at, first.id
+
+
+QUERIES = {
+    "stats.compute_day_totals": lambda db: stats_service.compute_day_totals(
+        db, TARGET, TARGET_DAY
+    ),
+    "stats.compute_session_day_totals": (
+        lambda db: stats_service.compute_session_day_totals(db, TARGET, TARGET_DAY)
+    ),
+    "stats.compute_week_totals": lambda db: stats_service.compute_week_totals(
+        db, TARGET, TARGET_WEEK
+    ),
+    "stats.load_cumulative_totals": lambda db: stats_service.load_cumulative_totals(
+        db, TARGET
+    ),
+    "sessions.get_active_session": lambda db: sessions_service.get_active_session(
+        db, TARGET
+    ),
+    "sessions.list_sessions": lambda db: sessions_service.list_sessions(
+        db, TARGET, TARGET_WEEK, TARGET_WEEK + timedelta(days=6)
+    ),
+    "sessions.list_sessions_for_timer": lambda db: sessions_service.list_sessions(
+        db,
+        TARGET,
+        TARGET_WEEK,
+        TARGET_WEEK + timedelta(days=6),
+        timer_id=_first_timer(db),
+    ),
+    "sessions.list_sessions_page": lambda db: sessions_service.list_sessions(
+        db,
+        TARGET,
+        TARGET_WEEK,
+        TARGET_WEEK + timedelta(days=6),
+        after=_page_cursor(db),
+        limit=10,
+    ),
+    "sessions.list_session_rows": lambda db: sessions_service.list_session_rows(
+        db, TARGET, TARGET_WEEK, TARGET_WEEK + timedelta(days=6)
+    ),
+    "sessions.iter_session_rows": lambda db: list(
+        sessions_service.iter_session_rows(db, TARGET, FIRST_DAY, LAST_DAY)
+    ),
+    "sessions.stop_active_session": lambda db: sessions_service.stop_active_session(
+        db, TARGET
+    ),
+}
+
+
+def _capture_selects(db, run) -> list[tuple[str, dict]]:
+    statements: list[tuple[str, dict]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    connection = db.connection()
+    event.listen(connection, "before_cursor_execute", record)
+    savepoint = db.begin_nested()
+    try:
+        cumulative_totals_cache.clear()
+        run(db)
+    finally:
+        event.remove(connection, "before_cursor_execute", record)
+        # Explain against the state the statements originally ran on.
+        savepoint.rollback()
+    return statements
+
+
+def _explain(db, statement: str, parameters) -> dict:
+    raw = db.connection().connection.driver_connection
+    with raw.cursor() as cursor:
+        cursor.execute(
+            "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters
+        )
+        return cursor.fetchone()[0][0]
+
+
+def _relation_pages(db, relations: list[str]) -> dict[str, int]:
+    rows = db.execute(
+        text("SELECT relname, relpages FROM pg_class WHERE relname = ANY(:names)"),
+        {"names": relations},
+    ).all()
+    return {row.relname: row.relpages for row in rows}
+
+
+def _index_names(db, index: str) -> set[str]:
+    partition_indexes = db.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = CAST(:index AS regclass)
+            """
+        ),
+        {"index": index},
+    ).scalars()
+    return {index, *partition_indexes}
+
+
+def _walk(node: dict):
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _walk(child)
+
+
+# Runs before the budget checks: the rolled-back writes of stop_active_session
+# clear visibility-map bits until the next vacuum.
+@pytest.mark.parametrize("name", sorted(INDEX_ONLY))
+def test_aggregates_are_index_only_scans(plan_db, name):
+    index_names = _index_names(plan_db, INDEX_ONLY[name])
+    statements = _capture_selects(plan_db, QUERIES[name])
+    try:
+        plans = [
+            list(_walk(_explain(plan_db, statement, parameters)["Plan"]))
+            for statement, parameters in statements
+        ]
+    finally:
+        plan_db.rollback()
+
+    scans = [
+        node
+        for nodes in plans
+        for node in nodes
+        if node.get("Index Name") in index_names
+    ]
+    assert scans, f"{name} does not use {INDEX_ONLY[name]}"
+    for node in scans:
+        assert node["Node Type"] == "Index Only Scan", node
+        assert node["Heap Fetches"] == 0, node
+
+
+@pytest.mark.parametrize("name", sorted(QUERIES))
+def test_query_plans_use_indexes_within_buffer_budget(plan_db, name):
+    statements = _capture_selects(plan_db, QUERIES[name])
+    assert statements, f"{name} issued no SELECT"
+    try:
+        for statement, parameters in statements:
+            plan = _explain(plan_db, statement, parameters)
+            nodes = list(_walk(plan["Plan"]))
+
+            scanned = [
+                node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"
+            ]
+            pages = _relation_pages(plan_db, scanned)
+            seq_scans = [
+                relation
+                for relation in scanned
+                if pages[relation] > SEQ_SCAN_MAX_PAGES
+            ]
+            assert not seq_scans, f"{name} seq scans {seq_scans}:\n{statement}"
+
+            buffers = (
+                plan["Plan"]["Shared Hit Blocks"] + plan["Plan"]["Shared Read Blocks"]
+            )
+            assert buffers <= BUFFER_BUDGETS[name], (
+                f"{name} touched {buffers} buffers "
+                f"(budget {BUFFER_BUDGETS[name]}):\n{statement}"
+            )
+    finally:
+        plan_db.rollback()
@@ -0,0 +1,82 @@
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import sessionmaker
+
+from app import reaper
+from app.models.active_session import ActiveSession
+from app.models.session import Session as SessionModel
+from app.models.timer import Timer
+from app.models.user import User
+
+# 02:00 on Jan 8 in Toronto (UTC-5); still Jan 7 in Honolulu (UTC-10).
+NOW = datetime(2026, 1, 8, 7, 0, tzinfo=timezone.utc)
+
+
+def _open_session(db_session, username: str, tz_name: str, start_at: datetime):
+    db_session.add(User(username=username))
+    db_session.commit()
+    timer = Timer(username=username, name="BIO130", color="#22C55E", icon="book")
+    db_session.add(timer)
+    db_session.commit()
+    day = start_at.astimezone(ZoneInfo(tz_name)).date()
+    session = SessionModel(
+        username=username,
+        timer_id=timer.id,
+        start_at=start_at,
+        client_tz=tz_name,
+        day_date=day,
+        day_of_week=day.weekday(),
+    )
+    db_session.add(session)
+    db_session.commit()
+    return session
+
+
+def test_reaper_closes_abandoned_sessions_only(engine, db_session):
+    past_day = _open_session(
+        db_session, "ana", "America/Toronto", NOW - timedelta(hours=6)
+    )
+    over_age = _open_session(
+        db_session, "ben", "Pacific/Honolulu", NOW - timedelta(hours=17)
+    )
+    recent = _open_session(
+        db_session, "cy", "America/Toronto", NOW - timedelta(hours=1)
+    )
+
+    factory = sessionmaker(bind=engine, autoflush=False)
+    assert reaper.reap_once(factory, now=NOW) == 2
+    assert reaper.reap_once(factory, now=NOW) == 0
+
+    db_session.expire_all()
+    local_midnight = datetime.combine(
+        date(2026, 1, 7), time(23, 59, 59, 999000), tzinfo=ZoneInfo("America/Toronto")
+    )
+    closed = db_session.get(SessionModel, (past_day.id, past_day.day_date))
+    assert closed.end_at == local_midnight
+    assert closed.duration_seconds == 4 * 3600 - 1
+    closed = db_session.get(SessionModel, (over_age.id, over_age.day_date))
+    assert (closed.end_at, closed.duration_seconds) == (NOW, 17 * 3600)
+    assert db_session.get(SessionModel, (recent.id, recent.day_date)).end_at is None
+    assert db_session.execute(select(ActiveSession.username)).scalars().all() == [
+        "cy"
+    ]
+
+
+def test_reaper_skips_run_while_another_worker_holds_the_lock(engine, db_session):
+    stale = _open_session(
+        db_session, "ana", "America/Toronto", NOW - timedelta(hours=20)
+    )
+
+    factory = sessionmaker(bind=engine, autoflush=False)
+    with engine.connect() as other:
+        other.execute(text("SELECT pg_advisory_lock(:key)"), {"key": reaper.LOCK_KEY})
+        assert reaper.reap_once(factory, now=NOW) == 0
+        other.execute(
+            text("SELECT pg_advisory_unlock(:key)"), {"key": reaper.LOCK_KEY}
+        )
+
+    db_session.expire_all()
+    assert db_session.get(SessionModel, (stale.id, stale.day_date)).end_at is None
+    assert reaper.reap_once(factory, now=NOW) == 1
@@ -0,0 +1,153 @@
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import db as db_module
+from app import replica
+from app.models.write_position import WritePosition
+
+HEADERS = {"X-Username": "jay"}
+READ_ONLY = {"options": "-c default_transaction_read_only=on"}
+READ_PATHS = [
+    ("/api/timers", {}),
+    ("/api/sessions", {"from": "2026-01-05", "to": "2026-01-11"}),
+    ("/api/schedule/day", {"day_date": "2026-01-06"}),
+    ("/api/schedule/week", {"week_start": "2026-01-05"}),
+    ("/api/stats/day", {"day_date": "2026-01-06"}),
+    ("/api/stats/week", {"week_start": "2026-01-05"}),
+    ("/api/stats/averages", {"days": 7, "end_date": "2026-01-11"}),
+]
+
+
+def _count_statements(engine) -> list[str]:
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    return statements
+
+
+@pytest.fixture
+def replica_statements(engine, monkeypatch):
+    # A read-only connection to the test database stands in for the replica.
+    replica_engine = create_engine(
+        engine.url, poolclass=NullPool, connect_args=READ_ONLY
+    )
+    monkeypatch.setattr(
+        db_module,
+        "ReplicaSessionLocal",
+        sessionmaker(bind=replica_engine, autoflush=False, info=replica.SESSION_INFO),
+    )
+    monkeypatch.setattr(
+        replica, "primary_sessions", sessionmaker(bind=engine, autoflush=False)
+    )
+    yield _count_statements(replica_engine)
+    replica_engine.dispose()
+
+
+def _set_position(db_session, username: str, lsn: int, in_flight: int = 0) -> None:
+    db_session.merge(
+        WritePosition(username=username, lsn=lsn, writes_in_flight=in_flight)
+    )
+    db_session.commit()
+
+
+def _read_paths_from_replica(client, replica_statements) -> None:
+    for path, params in READ_PATHS:
+        response = client.get(path, params=params, headers=HEADERS)
+        assert response.status_code == 200, path
+        assert replica_statements, path
+        replica_statements.clear()
+
+
+def test_writes_record_their_wal_position(client, db_session, replica_statements):
+    response = client.post(
+        "/api/timers", json={"name": "BIO130", "color": "#22C55E"}, headers=HEADERS
+    )
+    timer_id = response.json()["id"]
+
+    position = db_session.get(WritePosition, "jay")
+    assert position.writes_in_flight == 0
+    assert position.lsn > 0
+    current = db_session.execute(
+        text("SELECT (pg_current_wal_lsn() - '0/0'::pg_lsn)::bigint")
+    ).scalar_one()
+    assert position.lsn <= current
+
+    # The replica has replayed the write, so it serves the read.
+    response = client.get("/api/timers", headers=HEADERS)
+    assert [timer["id"] for timer in response.json()["timers"]] == [timer_id]
+    assert "pg_last_wal_replay_lsn" in replica_statements[0]
+    assert len(replica_statements) > 1
+    replica_statements.clear()
+    _read_paths_from_replica(client, replica_statements)
+
+
+def test_reads_use_primary_until_replica_replays_the_write(
+    client, db_session, replica_statements
+):
+    _set_position(db_session, "jay", lsn=2**62)
+    for path, params in READ_PATHS:
+        response = client.get(path, params=params, headers=HEADERS)
+        assert response.status_code == 200, path
+        # Only the replay check ran on the replica.
+        assert len(replica_statements) == 1, path
+        replica_statements.clear()
+
+    _set_position(db_session, "jay", lsn=0)
+    _read_paths_from_replica(client, replica_statements)
+
+
+def test_writes_in_flight_keep_reads_on_primary(
+    client, db_session, replica_statements
+):
+    _set_position(db_session, "jay", lsn=0, in_flight=1)
+    response = client.get("/api/timers", headers=HEADERS)
+    assert response.status_code == 200
+    assert replica_statements == []
+
+    # A marker left by a worker that died mid-request expires.
+    db_session.execute(
+        text("UPDATE write_positions SET updated_at = now() - interval '1 hour'")
+    )
+    db_session.commit()
+    response = client.get("/api/timers", headers=HEADERS)
+    assert response.status_code == 200
+    assert replica_statements
+
+    other = {"X-Username": "ana"}
+    _set_position(db_session, "ana", lsn=0, in_flight=1)
+    replica_statements.clear()
+    assert client.get("/api/timers", headers=HEADERS).status_code == 200
+    assert replica_statements
+    replica_statements.clear()
+    assert client.get("/api/timers", headers=other).status_code == 200
+    assert replica_statements == []
+
+
+def test_async_reads_use_replica(engine, db_session, async_client, monkeypatch):
+    replica_engine = create_async_engine(
+        engine.url, poolclass=NullPool, connect_args=READ_ONLY
+    )
+    monkeypatch.setattr(
+        db_module,
+        "AsyncReplicaSessionLocal",
+        async_sessionmaker(
+            bind=replica_engine, autoflush=False, info=replica.SESSION_INFO
+        ),
+    )
+    statements = _count_statements(replica_engine.sync_engine)
+    for path, params in READ_PATHS:
+        response = async_client.get(path, params=params, headers=HEADERS)
+        assert response.status_code == 200, path
+    assert statements
+
+    statements.clear()
+    _set_position(db_session, "jay", lsn=2**62)
+    response = async_client.get("/api/timers", headers=HEADERS)
+    assert response.status_code == 200
+    assert len(statements) == 1
@@ -0,0 +1,123 @@
+import json
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from app import memo
+from app.models.session import Session as SessionModel
+
+HEADERS = {"X-Username": "jay"}
+NDJSON_HEADERS = {**HEADERS, "Content-Type": "application/x-ndjson"}
+WEEK_START = date(2026, 1, 5)
+
+
+def _setup_finalized_week(client) -> str:
+    response = client.post(
+        "/api/timers", json={"name": "BIO130", "color": "#22C55E"}, headers=HEADERS
+    )
+    timer_id = response.json()["id"]
+    _import(client, timer_id, "2026-01-06T15:00:00Z", "2026-01-06T16:00:00Z")
+    response = client.post(
+        "/api/end-day",
+        json={"client_tz": "UTC", "day_date": "2026-01-11"},
+        headers=HEADERS,
+    )
+    assert response.status_code == 200
+    return timer_id
+
+
+def _import(client, timer_id: str, start_at: str, end_at: str) -> None:
+    row = {
+        "timer_id": timer_id,
+        "start_at": start_at,
+        "end_at": end_at,
+        "client_tz": "UTC",
+    }
+    response = client.post(
+        "/api/sessions/import", content=json.dumps(row), headers=NDJSON_HEADERS
+    )
+    assert response.json()["imported"] == 1
+
+
+def _get(client, statement_budget, path: str, params: dict, budget: int):
+    response = client.get(path, params=params, headers=HEADERS)
+    assert response.status_code == 200
+    return response, statement_budget(response, budget)
+
+
+def test_finalized_past_week_is_served_from_memo(client, statement_budget):
+    timer_id = _setup_finalized_week(client)
+
+    for path in ("/api/stats/week", "/api/schedule/week"):
+        params = {"week_start": WEEK_START.isoformat()}
+        first, statements = _get(client, statement_budget, path, params, 3)
+        assert statements == 3
+        second, statements = _get(client, statement_budget, path, params, 2)
+        assert statements == 2
+        assert second.content == first.content
+        assert second.headers["ETag"] == first.headers["ETag"]
+
+    _import(client, timer_id, "2026-01-07T09:00:00Z", "2026-01-07T09:30:00Z")
+
+    response, _ = _get(
+        client,
+        statement_budget,
+        "/api/stats/week",
+        {"week_start": WEEK_START.isoformat()},
+        3,
+    )
+    tuesday, wednesday = response.json()["daily"][1:3]
+    assert tuesday["totals"] == [{"timer_id": timer_id, "total_seconds": 3600}]
+    assert wednesday["totals"] == [{"timer_id": timer_id, "total_seconds": 1800}]
+
+
+def test_end_day_discards_only_the_days_it_rewrites(
+    client, db_session, statement_budget
+):
+    timer_id = _setup_finalized_week(client)
+    thursday = {"day_date": "2026-01-08"}
+    next_week = {"week_start": "2026-01-12"}
+    _get(client, statement_budget, "/api/stats/day", thursday, 3)
+    _get(client, statement_budget, "/api/schedule/week", next_week, 3)
+
+    start_at = datetime(2026, 1, 8, 10, tzinfo=timezone.utc)
+    db_session.add(
+        SessionModel(
+            id=uuid.uuid4(),
+            username="jay",
+            timer_id=uuid.UUID(timer_id),
+            start_at=start_at,
+            end_at=start_at + timedelta(minutes=20),
+            duration_seconds=1200,
+            client_tz="UTC",
+            day_date=date(2026, 1, 8),
+            day_of_week=3,
+        )
+    )
+    db_session.commit()
+    response = client.post(
+        "/api/end-day", json={"client_tz": "UTC", **thursday}, headers=HEADERS
+    )
+    assert response.status_code == 200
+
+    response, statements = _get(
+        client, statement_budget, "/api/stats/day", thursday, 3
+    )
+    assert statements == 3
+    assert response.json()["totals"] == [
+        {"timer_id": timer_id, "total_seconds": 1200}
+    ]
+    _, statements = _get(client, statement_budget, "/api/schedule/week", next_week, 2)
+    assert statements == 2
+
+
+def test_only_settled_finalized_periods_are_kept_indefinitely():
+    today = datetime.now(timezone.utc).date()
+    long_ago = today - timedelta(days=30)
+    recent = memo.settings.response_memo_recent_ttl_seconds
+    unfinished = long_ago - timedelta(days=1)
+    yesterday = today - timedelta(days=1)
+
+    assert memo.ttl_seconds(long_ago, finalized_through=today) is None
+    assert memo.ttl_seconds(long_ago, finalized_through=None) == recent
+    assert memo.ttl_seconds(long_ago, finalized_through=unfinished) == recent
+    assert memo.ttl_seconds(yesterday, finalized_through=today) == recent
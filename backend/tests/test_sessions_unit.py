@@ -1,10 +1,14 @@
+import uuid
 from datetime import date, datetime, time, timedelta, timezone
 from zoneinfo import ZoneInfo
 
+import pytest
+
 from app.models.session import Session as SessionModel
 from app.models.timer import Timer
 from app.models.user import User
 from app.services import sessions as sessions_service
+from app.services import stats as stats_service
 
 
 def _freeze_time(monkeypatch, frozen: datetime) -> None:
@@ -119,3 +123,65 @@ def test_cross_day_stop_ends_at_previous_day_end(db_session):
 
     assert stopped is not None
     assert stopped.end_at == expected_end
+
+
+def test_closing_sessions_maintains_day_rollup(db_session, monkeypatch):
+    user = _create_user(db_session)
+    timer_a = _create_timer(db_session, user.username, "BIO130")
+    timer_b = _create_timer(db_session, user.username, "CHEM200")
+
+    t1 = datetime(2026, 1, 1, 9, 0, tzinfo=timezone.utc)
+    _freeze_time(monkeypatch, t1)
+    sessions_service.start_timer(db_session, user.username, timer_a.id, "UTC")
+
+    _freeze_time(monkeypatch, t1 + timedelta(minutes=10))
+    sessions_service.start_timer(db_session, user.username, timer_b.id, "UTC")
+
+    _freeze_time(monkeypatch, t1 + timedelta(minutes=15))
+    sessions_service.start_timer(db_session, user.username, timer_a.id, "UTC")
+
+    _freeze_time(monkeypatch, t1 + timedelta(minutes=45))
+    sessions_service.stop_active_session(db_session, user.username)
+
+    day = date(2026, 1, 1)
+    rollup = dict(stats_service.compute_day_totals(db_session, user.username, day))
+    scanned = dict(
+        stats_service.compute_session_day_totals(db_session, user.username, day)
+    )
+
+    assert rollup == {timer_a.id: 2400, timer_b.id: 300}
+    assert rollup == scanned
+
+
+def test_switching_timers_updates_cycle_totals_in_one_transition(
+    db_session, monkeypatch
+):
+    user = _create_user(db_session)
+    timer_a = _create_timer(db_session, user.username, "BIO130")
+    timer_b = _create_timer(db_session, user.username, "CHEM200")
+
+    t1 = datetime(2026, 1, 1, 9, 0, tzinfo=timezone.utc)
+    _freeze_time(monkeypatch, t1)
+    _, first = sessions_service.start_timer(
+        db_session, user.username, timer_a.id, "UTC"
+    )
+
+    _freeze_time(monkeypatch, t1 + timedelta(minutes=5))
+    stopped, active = sessions_service.start_timer(
+        db_session, user.username, timer_a.id, "UTC"
+    )
+    assert stopped is None
+    assert active.id == first.id
+
+    _freeze_time(monkeypatch, t1 + timedelta(minutes=20))
+    stopped, active = sessions_service.start_timer(
+        db_session, user.username, timer_b.id, "UTC", stopped_adjustment_seconds=-60
+    )
+    assert stopped.id == first.id
+    assert stopped.duration_seconds == 1140
+    assert active.timer_id == timer_b.id
+    assert timer_a.cycle_total_seconds == 1140
+    assert timer_b.cycle_total_seconds == 0
+
+    with pytest.raises(LookupError, match="timer_not_found"):
+        sessions_service.start_timer(db_session, user.username, uuid.uuid4(), "UTC")
@@ -0,0 +1,89 @@
+import logging
+from datetime import date, timedelta
+
+import pytest
+
+from app import invalidation, query_stats
+
+HEADERS = {"X-Username": "jay"}
+TODAY = date.today()
+WEEK_START = TODAY - timedelta(days=TODAY.weekday())
+
+
+def _timer(client, name: str) -> str:
+    response = client.post(
+        "/api/timers", json={"name": name, "color": "#22C55E"}, headers=HEADERS
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+@pytest.fixture
+def timers(client):
+    timer_ids = [_timer(client, "BIO130"), _timer(client, "CHEM200")]
+    client.post(
+        f"/api/timers/{timer_ids[0]}/start",
+        json={"client_tz": "UTC"},
+        headers=HEADERS,
+    )
+    return timer_ids
+
+
+# Statements per request as issued today, counting the commit in get_db's
+# teardown; lower a budget when an endpoint gets cheaper, and only raise one
+# deliberately.
+ENDPOINTS = [
+    ("GET", "/api/me", None, 2),
+    ("GET", "/api/timers", None, 3),
+    ("GET", "/api/active-session", None, 2),
+    ("POST", "/api/timers/{timer_b}/start", {"client_tz": "UTC"}, 2),
+    ("POST", "/api/stop", {}, 2),
+    ("POST", "/api/end-day", {"client_tz": "UTC", "day_date": TODAY.isoformat()}, 7),
+    ("GET", f"/api/sessions?from={WEEK_START}&to={TODAY}", None, 3),
+    ("GET", f"/api/schedule/day?day_date={TODAY}", None, 3),
+    ("GET", f"/api/schedule/week?week_start={WEEK_START}", None, 3),
+    ("GET", f"/api/stats/day?day_date={TODAY}", None, 3),
+    ("GET", f"/api/stats/week?week_start={WEEK_START}", None, 3),
+    ("GET", f"/api/stats/averages?days=14&end_date={TODAY}", None, 4),
+    (
+        "GET",
+        f"/api/stats/averages/windows?days=7&days=30&end_date={TODAY}",
+        None,
+        4,
+    ),
+    ("GET", f"/api/dashboard?day_date={TODAY}&week_start={WEEK_START}", None, 10),
+]
+
+
+@pytest.mark.parametrize(
+    "method,path,body,budget", ENDPOINTS, ids=[f"{m} {p}" for m, p, _, _ in ENDPOINTS]
+)
+def test_endpoint_statement_budget(
+    client, statement_budget, timers, method, path, body, budget
+):
+    path = path.format(timer_b=timers[1])
+    response = client.request(method, path, json=body, headers=HEADERS)
+    assert response.status_code == 200, response.text
+    statement_budget(response, budget)
+
+
+def test_budget_counts_the_invalidation_notify(
+    client, statement_budget, timers, monkeypatch
+):
+    monkeypatch.setattr(invalidation.settings, "invalidation_bus", True)
+
+    response = client.post("/api/stop", json={}, headers=HEADERS)
+
+    assert statement_budget(response, 3) == 3
+
+
+def test_requests_over_budget_are_logged(client, monkeypatch, caplog):
+    monkeypatch.setattr(query_stats.settings, "query_budget_statements", 0)
+
+    with caplog.at_level(logging.WARNING, logger="app.query_stats"):
+        client.get("/api/timers", headers=HEADERS)
+
+    assert "GET /api/timers ran" in caplog.text
+    assert query_stats.STATEMENTS_HEADER not in client.get(
+        "/api/timers", headers=HEADERS
+    ).headers
@@ -0,0 +1,56 @@
+import uuid
+from datetime import date, timedelta
+
+from app.services.stats import CumulativeTotals
+
+
+def _totals() -> tuple[CumulativeTotals, uuid.UUID, uuid.UUID]:
+    timer_a = uuid.uuid4()
+    timer_b = uuid.uuid4()
+    rows = [
+        (timer_a, date(2026, 1, 1), 600),
+        (timer_a, date(2026, 1, 3), 1200),
+        (timer_a, date(2026, 1, 10), 3000),
+        (timer_b, date(2026, 1, 2), 900),
+    ]
+    return CumulativeTotals(7, [timer_a, timer_b], rows), timer_a, timer_b
+
+
+def test_window_total_uses_inclusive_bounds():
+    totals, timer_a, timer_b = _totals()
+
+    assert totals.window_total(timer_a, date(2026, 1, 1), date(2026, 1, 3)) == 1800
+    assert totals.window_total(timer_a, date(2026, 1, 2), date(2026, 1, 10)) == 4200
+    assert totals.window_total(timer_a, date(2026, 1, 4), date(2026, 1, 9)) == 0
+    assert totals.window_total(timer_b, date(2025, 12, 1), date(2026, 1, 1)) == 0
+
+
+def test_averages_match_a_direct_sum_for_every_window():
+    totals, timer_a, timer_b = _totals()
+    end_date = date(2026, 1, 10)
+
+    for days in (1, 3, 7, 8, 10, 30):
+        start_date = end_date - timedelta(days=days - 1)
+        expected = {
+            timer_a: sum(
+                seconds
+                for day, seconds in [
+                    (date(2026, 1, 1), 600),
+                    (date(2026, 1, 3), 1200),
+                    (date(2026, 1, 10), 3000),
+                ]
+                if start_date <= day <= end_date
+            )
+            // days,
+            timer_b: (900 if start_date <= date(2026, 1, 2) else 0) // days,
+        }
+        assert dict(totals.averages(end_date, days)) == expected
+
+
+def test_rows_for_unknown_timers_are_ignored():
+    timer_a = uuid.uuid4()
+    totals = CumulativeTotals(
+        1, [timer_a], [(uuid.uuid4(), date(2026, 1, 1), 500)]
+    )
+
+    assert totals.averages(date(2026, 1, 1), 1) == [(timer_a, 0)]
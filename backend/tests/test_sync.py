@@ -0,0 +1,149 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.api import sync as sync_api
+
+def _event(kind: str, at: datetime, **fields) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "type": kind,
+        "occurred_at_client": at.isoformat(),
+        **fields,
+    }
+
+
+def _sync(client, headers: dict, events: list[dict]):
+    response = client.post("/api/sync", json={"events": events}, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def _cycle_totals(client, headers: dict) -> dict[str, int]:
+    timers = client.get("/api/timers", headers=headers).json()["timers"]
+    return {timer["id"]: timer["cycle_total_seconds"] for timer in timers}
+
+
+def test_sync_applies_queued_events_at_client_times(
+    client, auth_headers, create_timer
+):
+    bio = create_timer(client, "BIO130")["id"]
+    chem = create_timer(client, "CHEM200")["id"]
+    start = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(hours=1)
+    first = _event("start", start, timer_id=bio, client_tz="UTC")
+    events = [
+        first,
+        _event(
+            "start",
+            start + timedelta(minutes=10),
+            timer_id=chem,
+            client_tz="UTC",
+            adjustment_seconds=30,
+        ),
+        _event("stop", start + timedelta(minutes=25)),
+        _event(
+            "adjust",
+            start + timedelta(minutes=26),
+            session_id=first["id"],
+            adjustment_seconds=60,
+        ),
+    ]
+
+    body = _sync(client, auth_headers, events)
+
+    assert [result["status"] for result in body["results"]] == ["applied"] * 4
+    assert body["active_session"] is None
+    day = start.date().isoformat()
+    sessions = client.get(
+        "/api/sessions", params={"from": day, "to": day}, headers=auth_headers
+    ).json()["sessions"]
+    assert [
+        (s["id"], datetime.fromisoformat(s["start_at"]), s["duration_seconds"])
+        for s in sessions
+    ] == [
+        (first["id"], start, 600 + 30 + 60),
+        (sessions[1]["id"], start + timedelta(minutes=10), 900),
+    ]
+    totals = {bio: 690, chem: 900}
+    assert _cycle_totals(client, auth_headers) == totals
+
+    assert _sync(client, auth_headers, events) == body
+    assert _cycle_totals(client, auth_headers) == totals
+
+
+def test_sync_conflict_rules(client, auth_headers, create_timer):
+    bio = create_timer(client, "BIO130")["id"]
+    chem = create_timer(client, "CHEM200")["id"]
+    response = client.post(
+        f"/api/timers/{bio}/start", json={"client_tz": "UTC"}, headers=auth_headers
+    )
+    running = response.json()["active_session"]
+    now = datetime.now(timezone.utc)
+    repeated = _event("stop", now + timedelta(hours=1))
+    events = [
+        _event("stop", now - timedelta(hours=1)),
+        _event("start", now, timer_id=bio, client_tz="UTC"),
+        _event("start", now, timer_id=str(uuid.uuid4()), client_tz="UTC"),
+        _event("start", now, timer_id=chem, client_tz="Mars/Olympus"),
+        _event("adjust", now, session_id=running["id"], adjustment_seconds=60),
+        repeated,
+        _event("stop", now + timedelta(hours=2)),
+        repeated,
+        _event("adjust", now, session_id=str(uuid.uuid4()), adjustment_seconds=60),
+    ]
+
+    body = _sync(client, auth_headers, events)
+
+    assert [(r["status"], r["detail"]) for r in body["results"]] == [
+        ("rejected", "stale_event"),
+        ("ignored", "already_running"),
+        ("rejected", "timer_not_found"),
+        ("rejected", "invalid_timezone"),
+        ("rejected", "session_active"),
+        ("applied", None),
+        ("ignored", "not_running"),
+        ("applied", None),
+        ("rejected", "session_not_found"),
+    ]
+    assert body["active_session"] is None
+    response = client.get("/api/me", headers=auth_headers)
+    assert response.json()["active_session"] is None
+    stopped = datetime.fromisoformat(
+        client.get(
+            "/api/sessions",
+            params={"from": running["day_date"], "to": running["day_date"]},
+            headers=auth_headers,
+        ).json()["sessions"][0]["end_at"]
+    )
+    assert stopped <= datetime.now(timezone.utc)
+
+
+def test_sync_validates_events(client, auth_headers, monkeypatch):
+    now = datetime.now(timezone.utc)
+    response = client.post(
+        "/api/sync",
+        json={"events": [_event("start", now, client_tz="UTC")]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 422
+
+    monkeypatch.setattr(sync_api.settings, "sync_max_events", 1)
+    response = client.post(
+        "/api/sync",
+        json={"events": [_event("stop", now), _event("stop", now)]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 413
+
+
+def test_async_sync_applies_events(async_client, auth_headers, create_timer):
+    bio = create_timer(async_client, "BIO130")["id"]
+    start = datetime.now(timezone.utc) - timedelta(minutes=5)
+    event = _event("start", start, timer_id=bio, client_tz="UTC")
+
+    response = async_client.post(
+        "/api/sync", json={"events": [event]}, headers=auth_headers
+    )
+
+    body = response.json()
+    assert body["results"] == [{"id": event["id"], "status": "applied", "detail": None}]
+    assert body["active_session"]["id"] == event["id"]
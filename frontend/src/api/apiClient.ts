@@ -11,12 +11,82 @@ export const setUsername = (username: string) => {
   localStorage.setItem(USERNAME_KEY, username);
 };
 
+// Thrown for HTTP error responses; network failures surface as fetch's own
+// TypeError.
+export class ApiError extends Error {
+  constructor(message: string, readonly status: number) {
+    super(message);
+    this.name = "ApiError";
+  }
+}
+
 type ApiFetchOptions = Omit<RequestInit, "body"> & { body?: unknown };
 
+type CachedResponse = { etag: string; data: unknown };
+
+const ETAG_CACHE_LIMIT = 200;
+const etagCache = new Map<string, CachedResponse>();
+
+const rememberResponse = (key: string, entry: CachedResponse) => {
+  etagCache.delete(key);
+  etagCache.set(key, entry);
+  if (etagCache.size > ETAG_CACHE_LIMIT) {
+    const oldestKey = etagCache.keys().next().value;
+    if (oldestKey !== undefined) {
+      etagCache.delete(oldestKey);
+    }
+  }
+};
+
+const PRIMED_RESPONSE_TTL_MS = 10000;
+const primedResponses = new Map<string, { data: unknown; expiresAt: number }>();
+let pendingPrimes: Promise<void> | null = null;
+
+export const primeResponses = (
+  entries: Promise<Array<[path: string, data: unknown]>>
+) => {
+  const username = getUsername();
+  const pending = entries
+    .then((items) => {
+      const expiresAt = Date.now() + PRIMED_RESPONSE_TTL_MS;
+      for (const [path, data] of items) {
+        primedResponses.set(`${username}|${path}`, { data, expiresAt });
+      }
+    })
+    .catch(() => undefined)
+    .finally(() => {
+      if (pendingPrimes === pending) {
+        pendingPrimes = null;
+      }
+    });
+  pendingPrimes = pending;
+};
+
+const getPrimedResponse = (key: string) => {
+  const primed = primedResponses.get(key);
+  if (!primed) {
+    return undefined;
+  }
+  if (primed.expiresAt <= Date.now()) {
+    primedResponses.delete(key);
+    return undefined;
+  }
+  return primed;
+};
+
 export const apiFetch = async <T>(
   path: string,
   options: ApiFetchOptions = {}
 ): Promise<T> => {
+  const method = (options.method ?? "GET").toUpperCase();
+  // Requests that start while a bootstrap response is in flight wait for it;
+  // the bootstrap request itself starts before pendingPrimes is set.
+  if (method === "GET" && pendingPrimes) {
+    await pendingPrimes;
+  } else if (method !== "GET") {
+    primedResponses.clear();
+  }
+
   const headers = new Headers(options.headers);
   const username = getUsername();
   if (username) {
@@ -26,15 +96,29 @@ export const apiFetch = async <T>(
     headers.set("Content-Type", "application/json");
   }
 
+  const cacheKey = method === "GET" ? `${username}|${path}` : null;
+  const primed = cacheKey ? getPrimedResponse(cacheKey) : undefined;
+  if (primed) {
+    return primed.data as T;
+  }
+  const cached = cacheKey ? etagCache.get(cacheKey) : undefined;
+  if (cached && !headers.has("If-None-Match")) {
+    headers.set("If-None-Match", cached.etag);
+  }
+
   const response = await fetch(`${API_BASE_URL}${path}`, {
     ...options,
     headers,
     body: options.body ? JSON.stringify(options.body) : undefined,
   });
 
+  if (response.status === 304 && cached) {
+    return cached.data as T;
+  }
+
   if (!response.ok) {
     const message = await response.text();
-    throw new Error(message || response.statusText);
+    throw new ApiError(message || response.statusText, response.status);
   }
 
   if (response.status === 204) {
@@ -43,7 +127,12 @@ export const apiFetch = async <T>(
 
   const contentType = response.headers.get("Content-Type") || "";
   if (contentType.includes("application/json")) {
-    return response.json() as Promise<T>;
+    const data = (await response.json()) as T;
+    const etag = response.headers.get("ETag");
+    if (cacheKey && etag) {
+      rememberResponse(cacheKey, { etag, data });
+    }
+    return data;
   }
 
   const text = await response.text();
@@ -57,3 +146,85 @@ export const apiFetch = async <T>(
     return text as unknown as T;
   }
 };
+
+type EventStreamHandlers = {
+  onMessage: (event: string, data: string) => void;
+  onOpen?: () => void;
+  onError?: () => void;
+};
+
+const STREAM_RETRY_MIN_MS = 1000;
+const STREAM_RETRY_MAX_MS = 30000;
+
+const dispatchEventBlock = (block: string, handlers: EventStreamHandlers) => {
+  let event = "message";
+  const data: string[] = [];
+  for (const line of block.split("\n")) {
+    if (line.startsWith("event:")) {
+      event = line.slice(6).trim();
+    } else if (line.startsWith("data:")) {
+      data.push(line.slice(5).trimStart());
+    }
+  }
+  if (data.length > 0) {
+    handlers.onMessage(event, data.join("\n"));
+  }
+};
+
+export const openEventStream = (
+  path: string,
+  handlers: EventStreamHandlers
+) => {
+  const controller = new AbortController();
+  let retryDelay = STREAM_RETRY_MIN_MS;
+
+  const connect = async () => {
+    while (!controller.signal.aborted) {
+      try {
+        const headers = new Headers({ Accept: "text/event-stream" });
+        const username = getUsername();
+        if (username) {
+          headers.set("X-Username", username);
+        }
+        const response = await fetch(`${API_BASE_URL}${path}`, {
+          headers,
+          cache: "no-store",
+          signal: controller.signal,
+        });
+        if (!response.ok || !response.body) {
+          throw new Error(response.statusText);
+        }
+        handlers.onOpen?.();
+        retryDelay = STREAM_RETRY_MIN_MS;
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = "";
+        while (true) {
+          const { value, done } = await reader.read();
+          if (done) {
+            break;
+          }
+          buffer += decoder.decode(value, { stream: true }).replace(/\r\n/g, "\n");
+          let boundary = buffer.indexOf("\n\n");
+          while (boundary !== -1) {
+            dispatchEventBlock(buffer.slice(0, boundary), handlers);
+            buffer = buffer.slice(boundary + 2);
+            boundary = buffer.indexOf("\n\n");
+          }
+        }
+      } catch {
+        // Reconnect below unless the stream was closed on purpose.
+      }
+      if (controller.signal.aborted) {
+        return;
+      }
+      handlers.onError?.();
+      await new Promise((resolve) => window.setTimeout(resolve, retryDelay));
+      retryDelay = Math.min(retryDelay * 2, STREAM_RETRY_MAX_MS);
+    }
+  };
+
+  void connect();
+  return () => controller.abort();
+};
@@ -0,0 +1,47 @@
+import { apiFetch, primeResponses } from "./apiClient";
+import {
+  ACTIVE_SESSION_PATH,
+  DEFAULT_AVERAGE_DAYS,
+  TIMERS_PATH,
+  averageWindowsFor,
+  averageWindowsPath,
+  dayStatsPath,
+  scheduleDayPath,
+  weekStatsPath,
+} from "./paths";
+import { DashboardResponse } from "./types";
+import {
+  getClientTimezone,
+  getLocalDateString,
+  getWeekStartDateString,
+} from "../utils/date";
+
+export const bootstrapDashboard = () => {
+  const clientTz = getClientTimezone();
+  const now = new Date();
+  const dayDate = getLocalDateString(now, clientTz);
+  const weekStart = getWeekStartDateString(now, clientTz);
+  const windows = averageWindowsFor(DEFAULT_AVERAGE_DAYS);
+
+  const params = new URLSearchParams({
+    day_date: dayDate,
+    week_start: weekStart,
+    end_date: dayDate,
+  });
+  for (const windowDays of windows) {
+    params.append("days", String(windowDays));
+  }
+
+  primeResponses(
+    apiFetch<DashboardResponse>(`/dashboard?${params.toString()}`).then(
+      (dashboard): Array<[string, unknown]> => [
+        [TIMERS_PATH, { timers: dashboard.timers }],
+        [ACTIVE_SESSION_PATH, { active_session: dashboard.active_session }],
+        [dayStatsPath(dayDate), dashboard.day_stats],
+        [weekStatsPath(weekStart), dashboard.week_stats],
+        [averageWindowsPath(dayDate, windows), dashboard.averages],
+        [scheduleDayPath(dayDate), dashboard.schedule_day],
+      ]
+    )
+  );
+};
@@ -0,0 +1,140 @@
+import { apiFetch, getUsername } from "./apiClient";
+import { ChangesResponse, Session } from "./types";
+
+type ChangeListener = (changes: ChangesResponse) => void;
+
+const REPLICA_CACHE_LIMIT = 20;
+
+let highWater: { username: string; next: number } | null = null;
+let pendingPull: Promise<ChangesResponse | null> | null = null;
+const listeners = new Set<ChangeListener>();
+const replicas = new Set<ChangeListener>();
+
+// Hooks take the mark before a full load, so anything written while the load
+// runs comes back in the next delta; replicas apply deltas idempotently.
+export const ensureHighWater = async () => {
+  const username = getUsername();
+  if (highWater?.username === username) {
+    return;
+  }
+  const response = await apiFetch<ChangesResponse>("/changes");
+  if (highWater?.username !== username) {
+    highWater = { username, next: response.next };
+  }
+};
+
+export const hasHighWater = () => highWater?.username === getUsername();
+
+export const pullChanges = (): Promise<ChangesResponse | null> => {
+  if (!pendingPull) {
+    pendingPull = (async () => {
+      const username = getUsername();
+      if (!highWater || highWater.username !== username) {
+        await ensureHighWater();
+        return null;
+      }
+      const changes = await apiFetch<ChangesResponse>(
+        `/changes?since=${highWater.next}`
+      );
+      if (highWater.username === username) {
+        highWater = { username, next: changes.next };
+      }
+      for (const replica of replicas) {
+        replica(changes);
+      }
+      for (const listener of listeners) {
+        listener(changes);
+      }
+      return changes;
+    })().finally(() => {
+      pendingPull = null;
+    });
+  }
+  return pendingPull;
+};
+
+const pullOnFocus = () => {
+  void pullChanges().catch(() => undefined);
+};
+
+export const subscribeChanges = (listener: ChangeListener) => {
+  if (listeners.size === 0 && typeof window !== "undefined") {
+    window.addEventListener("focus", pullOnFocus);
+  }
+  listeners.add(listener);
+  return () => {
+    listeners.delete(listener);
+    if (listeners.size === 0 && typeof window !== "undefined") {
+      window.removeEventListener("focus", pullOnFocus);
+    }
+  };
+};
+
+export const mergeSessions = (
+  current: Session[],
+  changed: Session[],
+  belongs: (session: Session) => boolean
+) => {
+  if (changed.length === 0) {
+    return current;
+  }
+  const byId = new Map(current.map((session) => [session.id, session]));
+  for (const session of changed) {
+    if (belongs(session)) {
+      byId.set(session.id, session);
+    } else {
+      byId.delete(session.id);
+    }
+  }
+  return [...byId.values()].sort(
+    (a, b) => a.start_at.localeCompare(b.start_at) || a.id.localeCompare(b.id)
+  );
+};
+
+// Replicas receive every delta, mounted or not, so they stay current.
+export const registerReplica = (apply: ChangeListener) => {
+  replicas.add(apply);
+};
+
+type SessionEntry = {
+  sessions: Session[];
+  belongs: (session: Session) => boolean;
+};
+
+// Small per-key cache of the sessions each hook last loaded, so remounting a
+// page shows the replica at once and only fetches the delta.
+export const createSessionReplica = () => {
+  const entries = new Map<string, SessionEntry>();
+  const scopedKey = (key: string) => `${getUsername()}|${key}`;
+  registerReplica((changes) => {
+    if (changes.reset) {
+      entries.clear();
+      return;
+    }
+    for (const entry of entries.values()) {
+      entry.sessions = mergeSessions(
+        entry.sessions,
+        changes.sessions,
+        entry.belongs
+      );
+    }
+  });
+  return {
+    get: (key: string) => entries.get(scopedKey(key))?.sessions,
+    set: (
+      key: string,
+      sessions: Session[],
+      belongs: (session: Session) => boolean
+    ) => {
+      const fullKey = scopedKey(key);
+      entries.delete(fullKey);
+      entries.set(fullKey, { sessions, belongs });
+      if (entries.size > REPLICA_CACHE_LIMIT) {
+        const oldestKey = entries.keys().next().value;
+        if (oldestKey !== undefined) {
+          entries.delete(oldestKey);
+        }
+      }
+    },
+  };
+};
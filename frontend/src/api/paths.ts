@@ -0,0 +1,26 @@
+export const PRESET_AVERAGE_WINDOWS = [7, 14, 30, 90];
+export const DEFAULT_AVERAGE_DAYS = 14;
+
+export const TIMERS_PATH = "/timers?include_archived=false";
+export const ACTIVE_SESSION_PATH = "/active-session";
+
+export const dayStatsPath = (dayDate: string) =>
+  `/stats/day?day_date=${dayDate}`;
+
+export const weekStatsPath = (weekStart: string) =>
+  `/stats/week?week_start=${weekStart}`;
+
+export const scheduleDayPath = (dayDate: string) =>
+  `/schedule/day?day_date=${dayDate}`;
+
+export const averageWindowsFor = (days: number) => [
+  ...new Set([days, ...PRESET_AVERAGE_WINDOWS]),
+];
+
+export const averageWindowsPath = (endDate: string, windows: number[]) => {
+  const params = new URLSearchParams({ end_date: endDate });
+  for (const windowDays of windows) {
+    params.append("days", String(windowDays));
+  }
+  return `/stats/averages/windows?${params.toString()}`;
+};
@@ -0,0 +1,126 @@
+import { ApiError, apiFetch, getUsername } from "./apiClient";
+import { SyncEvent, SyncEventResult, SyncResponse } from "./types";
+
+const SYNC_QUEUE_STORAGE_KEY = "coursetimers.syncQueue";
+const SYNC_BATCH_LIMIT = 500;
+
+export type SyncFlushResult = {
+  // Last server response; null when every batch was refused.
+  response: SyncResponse | null;
+  // Events the server rejected or refused outright; they are not retried.
+  rejected: SyncEventResult[];
+};
+
+let inFlight: Promise<SyncFlushResult | null> | null = null;
+
+const queueKey = () => `${SYNC_QUEUE_STORAGE_KEY}.${getUsername()}`;
+
+const readQueue = (): SyncEvent[] => {
+  if (typeof window === "undefined") {
+    return [];
+  }
+  try {
+    const raw = localStorage.getItem(queueKey());
+    const parsed = raw ? (JSON.parse(raw) as SyncEvent[]) : [];
+    return Array.isArray(parsed) ? parsed : [];
+  } catch {
+    return [];
+  }
+};
+
+const writeQueue = (events: SyncEvent[]) => {
+  try {
+    if (events.length > 0) {
+      localStorage.setItem(queueKey(), JSON.stringify(events));
+    } else {
+      localStorage.removeItem(queueKey());
+    }
+  } catch {
+    // Ignore storage errors; the queue lives on in memory until reload.
+  }
+};
+
+export const hasPendingSyncEvents = () => readQueue().length > 0;
+
+export const enqueueSyncEvent = (
+  event: Omit<SyncEvent, "id" | "occurred_at_client">
+): SyncEvent => {
+  const queued: SyncEvent = {
+    ...event,
+    id: crypto.randomUUID(),
+    occurred_at_client: new Date().toISOString(),
+  };
+  writeQueue([...readQueue(), queued]);
+  return queued;
+};
+
+// Network failures and 5xx responses are worth retrying; any other error
+// response would refuse the same batch again.
+const isRetryable = (error: unknown) =>
+  !(error instanceof ApiError) || error.status >= 500;
+
+const errorDetail = (error: ApiError) => {
+  try {
+    const parsed = JSON.parse(error.message) as { detail?: unknown };
+    if (typeof parsed.detail === "string") {
+      return parsed.detail;
+    }
+  } catch {
+    // Not a JSON error body; use the text as is.
+  }
+  return error.message;
+};
+
+const removeFromQueue = (batch: SyncEvent[]) => {
+  const sent = new Set(batch.map((event) => event.id));
+  writeQueue(readQueue().filter((event) => !sent.has(event.id)));
+};
+
+const sendBatch = async (): Promise<SyncFlushResult | null> => {
+  let batch = readQueue().slice(0, SYNC_BATCH_LIMIT);
+  if (batch.length === 0) {
+    return null;
+  }
+  const result: SyncFlushResult = { response: null, rejected: [] };
+  while (batch.length > 0) {
+    try {
+      const response = await apiFetch<SyncResponse>("/sync", {
+        method: "POST",
+        body: { events: batch },
+      });
+      result.response = response;
+      result.rejected.push(
+        ...response.results.filter((outcome) => outcome.status === "rejected")
+      );
+    } catch (error) {
+      if (isRetryable(error)) {
+        throw error;
+      }
+      // Drop the refused batch so it cannot block the queue forever.
+      const detail = errorDetail(error as ApiError);
+      result.rejected.push(
+        ...batch.map((event) => ({
+          id: event.id,
+          status: "rejected" as const,
+          detail,
+        }))
+      );
+    }
+    // Every event in the batch has an outcome now; the server remembers them,
+    // so a batch resent after a lost response is answered the same way.
+    removeFromQueue(batch);
+    batch = readQueue().slice(0, SYNC_BATCH_LIMIT);
+  }
+  return result;
+};
+
+// Resolves to the batches' outcome, or null when nothing was queued. Rejects
+// when offline or the server fails; queued events are kept for a retry.
+export const flushSyncQueue = (): Promise<SyncFlushResult | null> => {
+  if (!inFlight) {
+    inFlight = sendBatch().finally(() => {
+      inFlight = null;
+    });
+  }
+  return inFlight;
+};
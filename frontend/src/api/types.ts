@@ -20,6 +20,11 @@ export type Session = {
   day_of_week: number;
 };
 
+export type SessionPage = {
+  sessions: Session[];
+  next_cursor: string | null;
+};
+
 export type TimerTotal = {
   timer_id: string;
   total_seconds: number;
@@ -74,3 +79,51 @@ export type AveragesResponse = {
   days: number;
   averages: AverageEntry[];
 };
+
+export type AverageWindow = {
+  days: number;
+  averages: AverageEntry[];
+};
+
+export type AverageWindowsResponse = {
+  end_date: string;
+  windows: AverageWindow[];
+};
+
+export type DashboardResponse = {
+  timers: Timer[];
+  active_session: Session | null;
+  day_stats: DayStatsResponse;
+  week_stats: WeekStatsResponse;
+  averages: AverageWindowsResponse;
+  schedule_day: DayScheduleResponse;
+};
+
+export type SyncEvent = {
+  id: string;
+  type: "start" | "stop" | "adjust";
+  occurred_at_client: string;
+  timer_id?: string;
+  client_tz?: string;
+  session_id?: string;
+  adjustment_seconds?: number;
+};
+
+export type SyncEventResult = {
+  id: string;
+  status: "applied" | "ignored" | "rejected";
+  detail: string | null;
+};
+
+export type SyncResponse = {
+  results: SyncEventResult[];
+  active_session: Session | null;
+};
+
+export type ChangesResponse = {
+  since: number | null;
+  next: number;
+  reset: boolean;
+  timers: Timer[];
+  sessions: Session[];
+};
@@ -1,6 +1,7 @@
 import { useState } from "react";
 
 import { apiFetch } from "../api/apiClient";
+import { flushSyncQueue } from "../api/syncQueue";
 import { ResetTotalsResponse } from "../api/types";
 import { useTimerRuntime } from "../context/TimerRuntimeContext";
 
@@ -19,6 +20,8 @@ const EndDayButton = ({ disabled = false, onEnded }: EndDayButtonProps) => {
     setBusy(true);
     setError("");
     try {
+      // Queued starts and stops must land before the reset closes the cycle.
+      await flushSyncQueue();
       const response = await apiFetch<ResetTotalsResponse>("/totals/reset", {
         method: "POST",
         body: { adjustment_seconds: activeAdjustmentSeconds },
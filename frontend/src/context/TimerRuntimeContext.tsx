@@ -8,6 +8,7 @@ type TimerRuntimeContextValue = {
   elapsedSeconds: number;
   loading: boolean;
   busy: boolean;
+  syncError: string;
   refresh: ReturnType<typeof useActiveSession>["refresh"];
   startTimer: (timerId: string) => Promise<void>;
   stopTimer: () => Promise<void>;
@@ -86,8 +87,16 @@ export const TimerRuntimeProvider = ({
   children: React.ReactNode;
 }) => {
   const hasUsername = Boolean(getUsername());
-  const { activeSession, elapsedSeconds, loading, busy, refresh, startTimer, stopTimer } =
-    useActiveSession(hasUsername);
+  const {
+    activeSession,
+    elapsedSeconds,
+    loading,
+    busy,
+    syncError,
+    refresh,
+    startTimer,
+    stopTimer,
+  } = useActiveSession(hasUsername);
   const [elapsedByTimer, setElapsedByTimer] = useState<Record<string, number>>(
     () => readStoredElapsed()
   );
@@ -230,6 +239,7 @@ export const TimerRuntimeProvider = ({
       elapsedSeconds,
       loading,
       busy,
+      syncError,
       refresh,
       startTimer: startTimerWithAdjustments,
       stopTimer: stopTimerWithAdjustments,
@@ -244,6 +254,7 @@ export const TimerRuntimeProvider = ({
       elapsedSeconds,
       loading,
       busy,
+      syncError,
       refresh,
       startTimerWithAdjustments,
       stopTimerWithAdjustments,
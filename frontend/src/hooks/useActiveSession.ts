@@ -1,10 +1,17 @@
 import { useCallback, useEffect, useMemo, useState } from "react";
 
-import { apiFetch } from "../api/apiClient";
-import { Session } from "../api/types";
-import { getClientTimezone } from "../utils/date";
+import { apiFetch, openEventStream } from "../api/apiClient";
+import { ACTIVE_SESSION_PATH } from "../api/paths";
+import {
+  enqueueSyncEvent,
+  flushSyncQueue,
+  hasPendingSyncEvents,
+} from "../api/syncQueue";
+import { Session, SyncEventResult } from "../api/types";
+import { getClientTimezone, getLocalDateString } from "../utils/date";
 
 const ACTIVE_SESSION_STORAGE_KEY = "coursetimers.activeSession";
+const FALLBACK_POLL_INTERVAL_MS = 15000;
 
 const readStoredActiveSession = () => {
   if (typeof window === "undefined") {
@@ -31,6 +38,34 @@ const readStoredActiveSession = () => {
   }
 };
 
+const optimisticSession = (
+  id: string,
+  timerId: string,
+  startAt: string,
+  clientTz: string
+): Session => {
+  const dayDate = getLocalDateString(new Date(startAt), clientTz);
+  return {
+    id,
+    timer_id: timerId,
+    start_at: startAt,
+    end_at: null,
+    duration_seconds: null,
+    client_tz: clientTz,
+    day_date: dayDate,
+    day_of_week: (new Date(`${dayDate}T00:00:00Z`).getUTCDay() + 6) % 7,
+  };
+};
+
+const describeRejected = (rejected: SyncEventResult[]) => {
+  const details = Array.from(
+    new Set(rejected.map((outcome) => outcome.detail ?? "rejected"))
+  ).join(", ");
+  return rejected.length === 1
+    ? `A timer change was not saved (${details}).`
+    : `${rejected.length} timer changes were not saved (${details}).`;
+};
+
 export const useActiveSession = (enabled = true) => {
   const stored = enabled ? readStoredActiveSession() : null;
   const [activeSession, setActiveSession] = useState<Session | null>(
@@ -41,6 +76,7 @@ export const useActiveSession = (enabled = true) => {
   );
   const [loading, setLoading] = useState(true);
   const [busy, setBusy] = useState(false);
+  const [syncError, setSyncError] = useState("");
 
   const refresh = useCallback(
     async (initial = false) => {
@@ -55,9 +91,12 @@ export const useActiveSession = (enabled = true) => {
       }
       try {
         const response = await apiFetch<{ active_session: Session | null }>(
-          "/active-session"
+          ACTIVE_SESSION_PATH
         );
-        setActiveSession(response.active_session);
+        // Queued transitions are newer than the server state until they sync.
+        if (!hasPendingSyncEvents()) {
+          setActiveSession(response.active_session);
+        }
       } finally {
         if (initial) {
           setLoading(false);
@@ -75,10 +114,75 @@ export const useActiveSession = (enabled = true) => {
       return;
     }
     refresh(true);
-    const interval = window.setInterval(() => refresh(false), 15000);
-    return () => window.clearInterval(interval);
+
+    let pollInterval: number | null = null;
+    const startPolling = () => {
+      if (pollInterval === null) {
+        pollInterval = window.setInterval(
+          () => refresh(false),
+          FALLBACK_POLL_INTERVAL_MS
+        );
+      }
+    };
+    const stopPolling = () => {
+      if (pollInterval !== null) {
+        window.clearInterval(pollInterval);
+        pollInterval = null;
+      }
+    };
+
+    const closeStream = openEventStream("/active-session/stream", {
+      onOpen: stopPolling,
+      onError: startPolling,
+      onMessage: (event, data) => {
+        if (event !== "active_session") {
+          return;
+        }
+        try {
+          const payload = JSON.parse(data) as { active_session: Session | null };
+          if (!hasPendingSyncEvents()) {
+            setActiveSession(payload.active_session);
+          }
+        } catch {
+          // Ignore malformed events; the next one carries the full state.
+        }
+      },
+    });
+    return () => {
+      closeStream();
+      stopPolling();
+    };
   }, [enabled, refresh]);
 
+  const flush = useCallback(async () => {
+    try {
+      const result = await flushSyncQueue();
+      if (!result) {
+        return;
+      }
+      if (result.rejected.length > 0) {
+        // The optimistic state assumed the dropped events applied.
+        setSyncError(describeRejected(result.rejected));
+        await refresh(false);
+      } else if (result.response && !hasPendingSyncEvents()) {
+        setActiveSession(result.response.active_session);
+      }
+    } catch {
+      // Offline or the server failed; the queue is retried on the next
+      // transition or when the browser comes back online.
+    }
+  }, [refresh]);
+
+  useEffect(() => {
+    if (!enabled) {
+      return;
+    }
+    void flush();
+    const handleOnline = () => void flush();
+    window.addEventListener("online", handleOnline);
+    return () => window.removeEventListener("online", handleOnline);
+  }, [enabled, flush]);
+
   useEffect(() => {
     if (!enabled || !activeSession) {
       setElapsedSeconds(0);
@@ -120,24 +224,31 @@ export const useActiveSession = (enabled = true) => {
         return;
       }
       setBusy(true);
+      setSyncError("");
       try {
-        const response = await apiFetch<{
-          stopped_session: Session | null;
-          active_session: Session;
-        }>(`/timers/${timerId}/start`, {
-          method: "POST",
-          body: {
-            client_tz: getClientTimezone(),
-            started_at_client: new Date().toISOString(),
-            stopped_adjustment_seconds: stoppedAdjustmentSeconds,
-          },
+        const clientTz = getClientTimezone();
+        const event = enqueueSyncEvent({
+          type: "start",
+          timer_id: timerId,
+          client_tz: clientTz,
+          adjustment_seconds: stoppedAdjustmentSeconds,
         });
-        setActiveSession(response.active_session);
+        setActiveSession((current) =>
+          current?.timer_id === timerId
+            ? current
+            : optimisticSession(
+                event.id,
+                timerId,
+                event.occurred_at_client,
+                clientTz
+              )
+        );
+        await flush();
       } finally {
         setBusy(false);
       }
     },
-    [enabled]
+    [enabled, flush]
   );
 
   const stopTimer = useCallback(
@@ -146,20 +257,16 @@ export const useActiveSession = (enabled = true) => {
         return;
       }
       setBusy(true);
+      setSyncError("");
       try {
-        await apiFetch<{ stopped_session: Session | null }>("/stop", {
-          method: "POST",
-          body: {
-            stopped_at_client: new Date().toISOString(),
-            adjustment_seconds: adjustmentSeconds,
-          },
-        });
+        enqueueSyncEvent({ type: "stop", adjustment_seconds: adjustmentSeconds });
         setActiveSession(null);
+        await flush();
       } finally {
         setBusy(false);
       }
     },
-    [enabled]
+    [enabled, flush]
   );
 
   return useMemo(
@@ -168,10 +275,20 @@ export const useActiveSession = (enabled = true) => {
       elapsedSeconds,
       loading,
       busy,
+      syncError,
       refresh,
       startTimer,
       stopTimer,
     }),
-    [activeSession, elapsedSeconds, loading, busy, refresh, startTimer, stopTimer]
+    [
+      activeSession,
+      elapsedSeconds,
+      loading,
+      busy,
+      syncError,
+      refresh,
+      startTimer,
+      stopTimer,
+    ]
   );
 };
@@ -1,34 +1,62 @@
-import { useCallback, useEffect, useMemo, useState } from "react";
+import { useCallback, useEffect, useMemo, useRef, useState } from "react";
 
 import { apiFetch } from "../api/apiClient";
-import { AveragesResponse } from "../api/types";
+import { averageWindowsFor, averageWindowsPath } from "../api/paths";
+import { AveragesResponse, AverageWindowsResponse } from "../api/types";
+import { getLocalDateString } from "../utils/date";
+
+type WindowCache = {
+  endDate: string;
+  windows: Map<number, AveragesResponse>;
+};
 
 export const useAverages = (days: number) => {
   const [data, setData] = useState<AveragesResponse | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const cacheRef = useRef<WindowCache | null>(null);
 
-  const load = useCallback(async () => {
-    setLoading(true);
-    setError(null);
-    try {
-      const response = await apiFetch<AveragesResponse>(
-        `/stats/averages?days=${days}`
-      );
-      setData(response);
-    } catch (err) {
-      setError(err instanceof Error ? err.message : "Failed to load averages");
-    } finally {
-      setLoading(false);
-    }
-  }, [days]);
+  const load = useCallback(
+    async (force = false) => {
+      const endDate = getLocalDateString(new Date());
+      const cached = cacheRef.current;
+      if (!force && cached?.endDate === endDate && cached.windows.has(days)) {
+        setData(cached.windows.get(days) ?? null);
+        setLoading(false);
+        return;
+      }
+
+      setLoading(true);
+      setError(null);
+      try {
+        const response = await apiFetch<AverageWindowsResponse>(
+          averageWindowsPath(endDate, averageWindowsFor(days))
+        );
+        const windows = new Map(
+          response.windows.map((window) => [
+            window.days,
+            { days: window.days, averages: window.averages },
+          ])
+        );
+        cacheRef.current = { endDate: response.end_date, windows };
+        setData(windows.get(days) ?? null);
+      } catch (err) {
+        setError(err instanceof Error ? err.message : "Failed to load averages");
+      } finally {
+        setLoading(false);
+      }
+    },
+    [days]
+  );
 
   useEffect(() => {
     load();
   }, [load]);
 
+  const reload = useCallback(() => load(true), [load]);
+
   return useMemo(
-    () => ({ data, loading, error, reload: load }),
-    [data, loading, error, load]
+    () => ({ data, loading, error, reload }),
+    [data, loading, error, reload]
   );
 };
@@ -1,6 +1,7 @@
 import { useCallback, useEffect, useMemo, useState } from "react";
 
 import { apiFetch } from "../api/apiClient";
+import { dayStatsPath } from "../api/paths";
 import { DayStatsResponse, TimerTotal } from "../api/types";
 
 export const useDayStats = (dayDate: string, enabled = true) => {
@@ -17,9 +18,7 @@ export const useDayStats = (dayDate: string, enabled = true) => {
     setLoading(true);
     setError(null);
     try {
-      const response = await apiFetch<DayStatsResponse>(
-        `/stats/day?day_date=${dayDate}`
-      );
+      const response = await apiFetch<DayStatsResponse>(dayStatsPath(dayDate));
       setTotals(response.totals);
     } catch (err) {
       setError(err instanceof Error ? err.message : "Failed to load totals");
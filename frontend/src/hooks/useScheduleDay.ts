@@ -1,8 +1,22 @@
 import { useCallback, useEffect, useMemo, useState } from "react";
 
 import { apiFetch } from "../api/apiClient";
+import { scheduleDayPath } from "../api/paths";
+import {
+  createSessionReplica,
+  ensureHighWater,
+  hasHighWater,
+  mergeSessions,
+  pullChanges,
+  subscribeChanges,
+} from "../api/deltaSync";
 import { DayScheduleResponse, Session } from "../api/types";
 
+const dayReplica = createSessionReplica();
+
+const onDay = (dayDate: string) => (session: Session) =>
+  session.day_date === dayDate;
+
 export const useScheduleDay = (dayDate: string) => {
   const [sessions, setSessions] = useState<Session[]>([]);
   const [loading, setLoading] = useState(true);
@@ -12,9 +26,11 @@ export const useScheduleDay = (dayDate: string) => {
     setLoading(true);
     setError(null);
     try {
+      await ensureHighWater();
       const response = await apiFetch<DayScheduleResponse>(
-        `/schedule/day?day_date=${dayDate}`
+        scheduleDayPath(dayDate)
       );
+      dayReplica.set(dayDate, response.sessions, onDay(dayDate));
       setSessions(response.sessions);
     } catch (err) {
       setError(err instanceof Error ? err.message : "Failed to load schedule");
@@ -24,8 +40,25 @@ export const useScheduleDay = (dayDate: string) => {
   }, [dayDate]);
 
   useEffect(() => {
-    load();
-  }, [load]);
+    const belongs = onDay(dayDate);
+    const unsubscribe = subscribeChanges((changes) => {
+      if (changes.reset) {
+        load();
+        return;
+      }
+      setSessions((prev) => mergeSessions(prev, changes.sessions, belongs));
+    });
+    const cached = dayReplica.get(dayDate);
+    if (cached && hasHighWater()) {
+      setSessions(cached);
+      setLoading(false);
+      setError(null);
+      void pullChanges().catch(() => load());
+    } else {
+      load();
+    }
+    return unsubscribe;
+  }, [dayDate, load]);
 
   return useMemo(
     () => ({ sessions, loading, error, reload: load }),
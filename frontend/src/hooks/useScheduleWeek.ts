@@ -1,10 +1,32 @@
 import { useCallback, useEffect, useMemo, useState } from "react";
 
 import { apiFetch } from "../api/apiClient";
-import { WeekScheduleDay, WeekScheduleResponse } from "../api/types";
+import {
+  createSessionReplica,
+  ensureHighWater,
+  hasHighWater,
+  mergeSessions,
+  pullChanges,
+  subscribeChanges,
+} from "../api/deltaSync";
+import { Session, WeekScheduleDay, WeekScheduleResponse } from "../api/types";
+
+const weekReplica = createSessionReplica();
+
+const addDays = (dayDate: string, days: number) => {
+  const date = new Date(`${dayDate}T00:00:00Z`);
+  date.setUTCDate(date.getUTCDate() + days);
+  return date.toISOString().slice(0, 10);
+};
+
+const inWeek = (weekStart: string) => {
+  const weekEnd = addDays(weekStart, 6);
+  return (session: Session) =>
+    session.day_date >= weekStart && session.day_date <= weekEnd;
+};
 
 export const useScheduleWeek = (weekStart: string) => {
-  const [days, setDays] = useState<WeekScheduleDay[]>([]);
+  const [sessions, setSessions] = useState<Session[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
@@ -12,10 +34,13 @@ export const useScheduleWeek = (weekStart: string) => {
     setLoading(true);
     setError(null);
     try {
+      await ensureHighWater();
       const response = await apiFetch<WeekScheduleResponse>(
         `/schedule/week?week_start=${weekStart}`
       );
-      setDays(response.days);
+      const loaded = response.days.flatMap((day) => day.sessions);
+      weekReplica.set(weekStart, loaded, inWeek(weekStart));
+      setSessions(loaded);
     } catch (err) {
       setError(err instanceof Error ? err.message : "Failed to load week");
     } finally {
@@ -24,8 +49,37 @@ export const useScheduleWeek = (weekStart: string) => {
   }, [weekStart]);
 
   useEffect(() => {
-    load();
-  }, [load]);
+    const belongs = inWeek(weekStart);
+    const unsubscribe = subscribeChanges((changes) => {
+      if (changes.reset) {
+        load();
+        return;
+      }
+      setSessions((prev) => mergeSessions(prev, changes.sessions, belongs));
+    });
+    const cached = weekReplica.get(weekStart);
+    if (cached && hasHighWater()) {
+      setSessions(cached);
+      setLoading(false);
+      setError(null);
+      void pullChanges().catch(() => load());
+    } else {
+      load();
+    }
+    return unsubscribe;
+  }, [weekStart, load]);
+
+  const days = useMemo<WeekScheduleDay[]>(
+    () =>
+      Array.from({ length: 7 }, (_, offset) => {
+        const dayDate = addDays(weekStart, offset);
+        return {
+          day_date: dayDate,
+          sessions: sessions.filter((session) => session.day_date === dayDate),
+        };
+      }),
+    [sessions, weekStart]
+  );
 
   return useMemo(
     () => ({ days, loading, error, reload: load }),
@@ -1,7 +1,19 @@
-import { useCallback, useEffect, useMemo, useState } from "react";
+import { useCallback, useEffect, useMemo, useRef, useState } from "react";
 
 import { apiFetch } from "../api/apiClient";
-import { Session } from "../api/types";
+import {
+  createSessionReplica,
+  ensureHighWater,
+  hasHighWater,
+  mergeSessions,
+  pullChanges,
+  subscribeChanges,
+} from "../api/deltaSync";
+import { Session, SessionPage } from "../api/types";
+
+const SESSIONS_PAGE_SIZE = 500;
+
+const sessionsReplica = createSessionReplica();
 
 type UseSessionsResult = {
   sessions: Session[];
@@ -19,28 +31,79 @@ export const useSessions = (
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
+  const requestRef = useRef(0);
+  const replicaKey = `${fromDate}|${toDate}|${timerId ?? ""}`;
+  const belongs = useCallback(
+    (session: Session) =>
+      session.day_date >= fromDate &&
+      session.day_date <= toDate &&
+      (!timerId || session.timer_id === timerId),
+    [fromDate, toDate, timerId]
+  );
+
   const load = useCallback(async () => {
+    const requestId = requestRef.current + 1;
+    requestRef.current = requestId;
     setLoading(true);
     setError(null);
     try {
-      const params = new URLSearchParams({ from: fromDate, to: toDate });
+      await ensureHighWater();
+      const params = new URLSearchParams({
+        from: fromDate,
+        to: toDate,
+        limit: String(SESSIONS_PAGE_SIZE),
+      });
       if (timerId) {
         params.set("timer_id", timerId);
       }
-      const response = await apiFetch<{ sessions: Session[] }>(
-        `/sessions?${params.toString()}`
-      );
-      setSessions(response.sessions);
+      const loaded: Session[] = [];
+      let cursor: string | null = null;
+      do {
+        if (cursor) {
+          params.set("cursor", cursor);
+        }
+        const response: SessionPage = await apiFetch<SessionPage>(
+          `/sessions?${params.toString()}`
+        );
+        if (requestRef.current !== requestId) {
+          return;
+        }
+        loaded.push(...response.sessions);
+        cursor = response.next_cursor;
+      } while (cursor);
+      sessionsReplica.set(replicaKey, loaded, belongs);
+      setSessions(loaded);
     } catch (err) {
-      setError(err instanceof Error ? err.message : "Failed to load sessions");
+      if (requestRef.current === requestId) {
+        setError(err instanceof Error ? err.message : "Failed to load sessions");
+      }
     } finally {
-      setLoading(false);
+      if (requestRef.current === requestId) {
+        setLoading(false);
+      }
     }
-  }, [fromDate, toDate, timerId]);
+  }, [fromDate, toDate, timerId, replicaKey, belongs]);
 
   useEffect(() => {
-    load();
-  }, [load]);
+    const unsubscribe = subscribeChanges((changes) => {
+      if (changes.reset) {
+        load();
+        return;
+      }
+      setSessions((prev) => mergeSessions(prev, changes.sessions, belongs));
+    });
+    const cached = sessionsReplica.get(replicaKey);
+    if (cached && hasHighWater()) {
+      requestRef.current += 1;
+      setSessions(cached);
+      setLoading(false);
+      setError(null);
+      void pullChanges().catch(() => load());
+    } else {
+      load();
+    }
+    return unsubscribe;
+  }, [replicaKey, belongs, load]);
 
   return useMemo(
     () => ({ sessions, loading, error, reload: load }),
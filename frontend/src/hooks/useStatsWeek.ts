@@ -1,6 +1,7 @@
 import { useCallback, useEffect, useMemo, useState } from "react";
 
 import { apiFetch } from "../api/apiClient";
+import { weekStatsPath } from "../api/paths";
 import { WeekStatsResponse } from "../api/types";
 
 export const useStatsWeek = (weekStart: string) => {
@@ -13,7 +14,7 @@ export const useStatsWeek = (weekStart: string) => {
     setError(null);
     try {
       const response = await apiFetch<WeekStatsResponse>(
-        `/stats/week?week_start=${weekStart}`
+        weekStatsPath(weekStart)
       );
       setData(response);
     } catch (err) {
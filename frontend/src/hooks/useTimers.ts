@@ -1,6 +1,14 @@
 import { useCallback, useEffect, useMemo, useState } from "react";
 
-import { apiFetch } from "../api/apiClient";
+import { apiFetch, getUsername } from "../api/apiClient";
+import { TIMERS_PATH } from "../api/paths";
+import {
+  ensureHighWater,
+  hasHighWater,
+  pullChanges,
+  registerReplica,
+  subscribeChanges,
+} from "../api/deltaSync";
 import { Timer } from "../api/types";
 
 const sortTimers = (timers: Timer[]) =>
@@ -8,6 +16,34 @@ const sortTimers = (timers: Timer[]) =>
 
 const TIMERS_STORAGE_KEY = "coursetimers.timers";
 
+let timersReplica: { username: string; timers: Timer[] } | null = null;
+
+const mergeTimers = (current: Timer[], changed: Timer[]) => {
+  if (changed.length === 0) {
+    return current;
+  }
+  const byId = new Map(current.map((timer) => [timer.id, timer]));
+  for (const timer of changed) {
+    if (timer.is_archived) {
+      byId.delete(timer.id);
+    } else {
+      byId.set(timer.id, timer);
+    }
+  }
+  return sortTimers([...byId.values()]);
+};
+
+registerReplica((changes) => {
+  if (changes.reset) {
+    timersReplica = null;
+  } else if (timersReplica) {
+    timersReplica = {
+      ...timersReplica,
+      timers: mergeTimers(timersReplica.timers, changes.timers),
+    };
+  }
+});
+
 const readStoredTimers = () => {
   if (typeof window === "undefined") {
     return [];
@@ -48,9 +84,8 @@ export const useTimers = (enabled = true) => {
     setLoading(true);
     setError(null);
     try {
-      const response = await apiFetch<{ timers: Timer[] }>(
-        "/timers?include_archived=false"
-      );
+      await ensureHighWater();
+      const response = await apiFetch<{ timers: Timer[] }>(TIMERS_PATH);
       setTimers(sortTimers(response.timers));
     } catch (err) {
       setError(err instanceof Error ? err.message : "Failed to load timers");
@@ -60,8 +95,26 @@ export const useTimers = (enabled = true) => {
   }, [enabled]);
 
   useEffect(() => {
-    loadTimers();
-  }, [loadTimers]);
+    if (!enabled) {
+      loadTimers();
+      return;
+    }
+    const unsubscribe = subscribeChanges((changes) => {
+      if (changes.reset) {
+        loadTimers();
+        return;
+      }
+      setTimers((prev) => mergeTimers(prev, changes.timers));
+    });
+    if (timersReplica?.username === getUsername() && hasHighWater()) {
+      setTimers(timersReplica.timers);
+      setLoading(false);
+      void pullChanges().catch(() => loadTimers());
+    } else {
+      loadTimers();
+    }
+    return unsubscribe;
+  }, [enabled, loadTimers]);
 
   useEffect(() => {
     if (!enabled || !loading) {
@@ -80,6 +133,7 @@ export const useTimers = (enabled = true) => {
     if (!enabled || loading) {
       return;
     }
+    timersReplica = { username: getUsername(), timers };
     try {
       localStorage.setItem(TIMERS_STORAGE_KEY, JSON.stringify(timers));
     } catch {
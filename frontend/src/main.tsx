@@ -3,8 +3,14 @@ import ReactDOM from "react-dom/client";
 import { BrowserRouter } from "react-router-dom";
 
 import App from "./App";
+import { getUsername } from "./api/apiClient";
+import { bootstrapDashboard } from "./api/dashboard";
 import "./styles.css";
 
+if (getUsername()) {
+  bootstrapDashboard();
+}
+
 ReactDOM.createRoot(document.getElementById("root")!).render(
   <React.StrictMode>
     <BrowserRouter>
@@ -1,4 +1,4 @@
-import { CSSProperties, useMemo, useState } from "react";
+import { CSSProperties, useEffect, useMemo, useRef, useState } from "react";
 
 import { useSessions } from "../hooks/useSessions";
 import { useTimers } from "../hooks/useTimers";
@@ -11,6 +11,9 @@ import {
 } from "../utils/date";
 import { formatDuration } from "../utils/time";
 
+// Rows are added to the DOM in batches as the list scrolls.
+const HISTORY_ROW_BATCH = 200;
+
 const getDateOffset = (days: number) => {
   const date = new Date();
   date.setDate(date.getDate() + days);
@@ -29,14 +32,43 @@ const HistoryPage = () => {
 
   const timersState = useTimers();
   const sessionsState = useSessions(fromDate, toDate, selectedTimerId);
+  const [visibleCount, setVisibleCount] = useState(HISTORY_ROW_BATCH);
+  const moreRowsRef = useRef<HTMLDivElement | null>(null);
+
+  useEffect(() => {
+    setVisibleCount(HISTORY_ROW_BATCH);
+  }, [fromDate, toDate, selectedTimerId]);
 
   const timerMap = useMemo(() => {
     return new Map(timersState.timers.map((timer) => [timer.id, timer]));
   }, [timersState.timers]);
 
+  const sortedSessions = useMemo(
+    () =>
+      [...sessionsState.sessions].sort((a, b) =>
+        b.start_at.localeCompare(a.start_at)
+      ),
+    [sessionsState.sessions]
+  );
+  const hasMoreRows = visibleCount < sortedSessions.length;
+
+  useEffect(() => {
+    const sentinel = moreRowsRef.current;
+    if (!sentinel || !hasMoreRows) {
+      return;
+    }
+    const observer = new IntersectionObserver((entries) => {
+      if (entries.some((entry) => entry.isIntersecting)) {
+        setVisibleCount((count) => count + HISTORY_ROW_BATCH);
+      }
+    });
+    observer.observe(sentinel);
+    return () => observer.disconnect();
+  }, [hasMoreRows, visibleCount]);
+
   const rows = useMemo(() => {
-    return [...sessionsState.sessions]
-      .sort((a, b) => b.start_at.localeCompare(a.start_at))
+    return sortedSessions
+      .slice(0, visibleCount)
       .map((session) => {
         const timer = timerMap.get(session.timer_id);
         const start = new Date(session.start_at);
@@ -61,7 +93,7 @@ const HistoryPage = () => {
           durationLabel: formatDuration(durationSeconds),
         };
       });
-  }, [sessionsState.sessions, timerMap, clientTz]);
+  }, [sortedSessions, visibleCount, timerMap, clientTz]);
 
   const totalsByTimer = useMemo(() => {
     const totals = new Map<string, number>();
@@ -215,6 +247,7 @@ const HistoryPage = () => {
               </div>
             ))}
           </div>
+          {hasMoreRows ? <div ref={moreRowsRef} aria-hidden="true" /> : null}
         </div>
       </div>
     </div>
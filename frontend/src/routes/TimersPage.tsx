@@ -17,6 +17,7 @@ const TimersPage = () => {
     activeSession,
     elapsedSeconds,
     busy,
+    syncError,
     startTimer,
     stopTimer,
     offsets,
@@ -184,6 +185,7 @@ const TimersPage = () => {
           </div>
         ) : null}
         {actionError ? <div className="error">{actionError}</div> : null}
+        {syncError ? <div className="error">{syncError}</div> : null}
       </div>
       <TimerFormModal
         title="Edit timer"